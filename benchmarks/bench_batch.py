@@ -0,0 +1,129 @@
+"""Throughput of the batched AI-vs-AI engine in games per second.
+
+Each batch size plays --ticks ticks and the rate is extrapolated to full
+120-second matches. The scalar engine (one MatchState at a time) is
+measured the same way for comparison.
+
+Then checks that the two engines agree: --parity-games whole scalar
+matches and --parity-batch batch matches, compared on mean passes,
+steals, shots and points per team. Exits with status 1 if any mean is more
+than --max-se standard errors of the difference apart.
+
+    python benchmarks/bench_batch.py [--ticks N] [--sizes 1,10,100,1000,10000]
+                                     [--parity-games 400] [--parity-batch 10000] [--max-se 4]
+"""
+import argparse
+import math
+import time
+
+import common  # noqa: F401 (puts the game on sys.path)
+
+import numpy as np
+
+from pro_sound_basketball import simulation
+from pro_sound_basketball.batch_sim import BatchMatch
+from pro_sound_basketball.play_log import BoxScore
+
+PARITY_STATS = ("passes", "steals", "shots", "points")
+TEAMS = ((simulation.TEAM_HOME, "home"), (simulation.TEAM_AWAY, "away"))
+
+
+def scalar_rate(ticks):
+    state = simulation.MatchState(seed=0, ai_only=True)
+    inputs = simulation.Inputs()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        state, _ = simulation.step(state, inputs)
+    elapsed = time.perf_counter() - start
+    return ticks / (elapsed * simulation.MATCH_LENGTH * simulation.TICK_RATE)
+
+
+def batch_rate(n_games, ticks):
+    batch = BatchMatch(n_games, seed=0)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        batch.step()
+    elapsed = time.perf_counter() - start
+    return n_games * ticks / (elapsed * batch.total_ticks)
+
+
+def scalar_stats(n_games):
+    """{(stat, team): per-game values} over n_games scalar matches, from their play-by-play."""
+    stats = {(stat, team): [] for stat in PARITY_STATS for team, _ in TEAMS}
+    inputs = simulation.Inputs()
+    for seed in range(n_games):
+        state = simulation.MatchState(seed=seed, ai_only=True, record_plays=True)
+        box = BoxScore(state.team_size)
+        while not state.over:
+            state, _ = simulation.step(state, inputs)
+            box.extend(state.plays)
+            state.plays.clear()
+        for team, _ in TEAMS:
+            line = box.teams[team]
+            for stat, value in zip(PARITY_STATS, (line.passes, line.steals, line.fga, state.score[team])):
+                stats[stat, team].append(value)
+    return stats
+
+
+def batch_stats(n_games):
+    batch = BatchMatch(n_games, seed=1)
+    batch.run()
+    stats = {}
+    for team, _ in TEAMS:
+        for stat, values in zip(PARITY_STATS, (batch.passes[:, team], batch.steals[:, team],
+                                               batch.shots[:, team].sum(axis=1), batch.score[:, team])):
+            stats[stat, team] = values
+    return stats
+
+
+def mean_se(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values.mean(), values.std(ddof=1) / math.sqrt(len(values))
+
+
+def parity(scalar_games, batch_games, max_se):
+    """Prints each stat from both engines; False if any disagree by more than max_se."""
+    start = time.perf_counter()
+    scalar = scalar_stats(scalar_games)
+    batch = batch_stats(batch_games)
+    print(f"\nParity: {scalar_games} scalar vs {batch_games} batch matches "
+          f"({time.perf_counter() - start:.0f} s)")
+    print(f"{'stat':<14}{'scalar':>14}{'batch':>14}{'SE apart':>10}")
+    ok = True
+    for stat in PARITY_STATS:
+        for team, name in TEAMS:
+            s_mean, s_se = mean_se(scalar[stat, team])
+            b_mean, b_se = mean_se(batch[stat, team])
+            apart = abs(s_mean - b_mean) / max(math.hypot(s_se, b_se), 1e-9)
+            flag = "  FAIL" if apart > max_se else ""
+            ok = ok and apart <= max_se
+            print(f"{name + ' ' + stat:<14}{f'{s_mean:.2f}±{s_se:.2f}':>14}{f'{b_mean:.2f}±{b_se:.2f}':>14}"
+                  f"{apart:>10.1f}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=600, help="ticks to time per batch size")
+    parser.add_argument("--sizes", default="1,10,100,1000,10000")
+    parser.add_argument("--parity-games", type=int, default=400, help="scalar matches for the parity check (0 skips it)")
+    parser.add_argument("--parity-batch", type=int, default=10000, help="batch matches for the parity check")
+    parser.add_argument("--max-se", type=float, default=4.0,
+                        help="fail if a stat's means are more than this many standard errors apart")
+    args = parser.parse_args()
+
+    print(f"{'engine':<10}{'games':>8}{'games/s':>12}{'games/hour':>14}")
+    rate = scalar_rate(args.ticks)
+    print(f"{'scalar':<10}{1:>8}{rate:>12.1f}{rate * 3600:>14,.0f}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rate = batch_rate(size, args.ticks)
+        print(f"{'batch':<10}{size:>8}{rate:>12.1f}{rate * 3600:>14,.0f}")
+
+    if args.parity_games and not parity(args.parity_games, args.parity_batch, args.max_se):
+        print("FAIL: the batch engine disagrees with the scalar one")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""Input-to-audio latency with synthetic key presses.
+
+Runs the game under SDL's dummy drivers with a stub speaker in practice
+mode, where a feeder hands the ball straight back after every pass, injects
+Space and P (while the player has the ball), S and N
+presses at random moments from another thread, each stamped with the time
+it was posted, and prints the input tracer's report once per --polls
+setting. Exits with status 1 if a locator press went unheard (repeated
+speech may be merged, the locator sound never is) or if any first-heard
+p95 is above --max-p95.
+
+    python benchmarks/bench_input.py [--presses 60] [--polls 1,4] [--max-p95 MS]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from common import ROOT, StubSpeaker, load_game_module, use_dummy_drivers
+
+BALL_KEYS = ("shoot", "pass")
+OTHER_KEYS = ("score", "locator")
+ANSWERED = ("locator",) # Always heard, whatever the state of play
+
+
+def inject(pygame, game, presses, seed, done):
+    """Posts `presses` random key presses 0.1 to 0.3 s apart, then QUIT."""
+    codes = {"shoot": pygame.K_SPACE, "pass": pygame.K_p, "score": pygame.K_s, "locator": pygame.K_n}
+    rng = random.Random(seed)
+    time.sleep(0.5) # Let the match settle
+    for _ in range(presses):
+        time.sleep(rng.uniform(0.1, 0.3))
+        match = game.match
+        # Read across threads, so now and then a press lands just after the ball has gone
+        with_ball = match is not None and match.human.has_ball
+        key = codes[rng.choice(BALL_KEYS + OTHER_KEYS if with_ball else OTHER_KEYS)]
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, injected_at=time.perf_counter()))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+    time.sleep(0.3)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    done.set()
+
+
+def measure(game_module, polls, presses, seed):
+    game = game_module.Game(speaker=StubSpeaker(), seed=seed, trace_input=True, input_polls=polls)
+    game.sounds.wait_all()
+    game.variants.wait(30)
+    game.set_mode_and_advance("PRACTICE")
+    game.set_gym_and_start(0)
+    tracer = game.tracer
+
+    # Feeder: whoever has the ball passes it straight back, on the game thread
+    advance = game.advance
+
+    def feed_and_advance(frame_seconds):
+        match = game.match
+        if match is not None and match.ball.owner is not None and not match.human.has_ball:
+            match.ball.owner.has_ball = False
+            match.ball.owner = match.human
+            match.human.has_ball = True
+        advance(frame_seconds)
+    game.advance = feed_and_advance
+    tracer.traces.clear() # Only the injected presses
+    done = threading.Event()
+    threading.Thread(target=inject, args=(game_module.pygame, game, presses, seed, done), daemon=True).start()
+    game.run()
+    done.wait()
+    return tracer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--presses", type=int, default=60, help="key presses per run")
+    parser.add_argument("--polls", default="1,4", help="input polls per frame to compare")
+    parser.add_argument("--max-p95", type=float, metavar="MS", help="fail if any first-heard p95 is above this")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    use_dummy_drivers()
+    workdir = tempfile.mkdtemp(prefix="psb-input-")
+    sounds = os.path.join(ROOT, "sounds")
+    if os.path.isdir(sounds):
+        os.symlink(sounds, os.path.join(workdir, "sounds"))
+    os.chdir(workdir)
+    game_module = load_game_module()
+
+    ok = True
+    try:
+        for polls in (int(p) for p in args.polls.split(",")):
+            print(f"\n=== {polls} input poll{'s' if polls > 1 else ''} per frame ===")
+            tracer = measure(game_module, polls, args.presses, args.seed) # The game prints the report
+            for action, entry in tracer.stats().items():
+                heard = entry["heard"]["count"]
+                if action in ANSWERED and heard < entry["count"]:
+                    print(f"FAIL: {entry['count'] - heard} {action} presses were never answered")
+                    ok = False
+                p95 = entry["heard"]["p95"] # To the first sound or speech, whichever came first
+                if args.max_p95 is not None and p95 > args.max_p95:
+                    print(f"FAIL: {action} p95 {p95:.1f} ms is above {args.max_p95:.1f} ms")
+                    ok = False
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+"""Simulation tick time against roster size.
+
+Plays --ticks ticks of an AI-vs-AI match for every team size and prints the
+mean tick time, the time per player and the share of it spent querying the
+court index. Per-player time should stay flat as rosters grow.
+
+    python benchmarks/bench_roster.py [--ticks N] [--sizes 2,3,5,8,12,16]
+"""
+import argparse
+import time
+
+import common  # noqa: F401 (puts the game on sys.path)
+
+from pro_sound_basketball import simulation
+from pro_sound_basketball.court_index import CourtIndex
+
+
+class TimedIndex(CourtIndex):
+    """A CourtIndex that adds up the time spent in its queries."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.elapsed = 0.0
+
+    def _timed(name):
+        def method(self, *args, **kwargs):
+            start = time.perf_counter()
+            result = getattr(CourtIndex, name)(self, *args, **kwargs)
+            self.elapsed += time.perf_counter() - start
+            return result
+        return method
+
+    rebuild = _timed("rebuild")
+    within = _timed("within")
+    nearest = _timed("nearest")
+
+
+def tick_time(team_size, ticks, timed=False):
+    state = simulation.MatchState(seed=0, ai_only=True, team_size=team_size)
+    if timed:
+        state.index = TimedIndex(simulation.COURT_WIDTH, simulation.COURT_HEIGHT)
+    inputs = simulation.Inputs()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        state, _ = simulation.step(state, inputs)
+    elapsed = time.perf_counter() - start
+    return elapsed / ticks, state.index.elapsed / elapsed if timed else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=3000, help="ticks to time per team size")
+    parser.add_argument("--sizes", default="2,3,5,8,12,16")
+    args = parser.parse_args()
+
+    print(f"{'team':>6}{'players':>9}{'tick us':>10}{'us/player':>11}{'index':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        seconds, _ = tick_time(size, args.ticks)
+        _, share = tick_time(size, args.ticks, timed=True)
+        players = 2 * size
+        print(f"{f'{size}v{size}':>6}{players:>9}{seconds * 1e6:>10.1f}{seconds * 1e6 / players:>11.2f}{share:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Start-up time, subsystem by subsystem, in fresh processes.
+
+Each run is a new interpreter under SDL's dummy drivers that times, in
+order: importing the package, the game rules (simulation), pygame and the
+pygame frontend; starting the mixer (Game creation) and the rest of Game
+creation; the menu title reaching the speaker; opening the window; the
+screen reader starting on the speech thread (only with --screen-reader,
+otherwise a stub speaks); and every sound being ready. Prints the median
+and worst of --runs runs and the time to the menu.
+
+    python benchmarks/bench_startup.py [--runs 5] [--screen-reader]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, StubSpeaker, use_dummy_drivers
+
+STEPS = ("import package", "import rules", "import pygame", "import game", "mixer", "create game",
+         "menu speech", "display", "speech backend", "sounds ready")
+
+
+def child(screen_reader):
+    """Starts the game in the current directory and prints each step's ms as JSON."""
+    use_dummy_drivers()
+    steps = {}
+    last = start = time.perf_counter()
+
+    def lap(name):
+        nonlocal last
+        now = time.perf_counter()
+        steps[name] = (now - last) * 1000
+        last = now
+
+    import pro_sound_basketball # noqa: F401
+    lap("import package")
+    from pro_sound_basketball import simulation # noqa: F401
+    lap("import rules")
+    import pygame
+    lap("import pygame")
+    from pro_sound_basketball import game as game_module, startup
+    lap("import game")
+
+    speaker = None if screen_reader else StubSpeaker()
+    game = game_module.Game(speaker=speaker)
+    steps["mixer"] = startup.TIMES["mixer"] * 1000
+    lap("create game")
+    steps["create game"] -= steps["mixer"]
+    game.current_menu.speak_title()
+    game.speaker.flush()
+    lap("menu speech")
+    menu = last
+    startup.open_window()
+    lap("display")
+    if "speech" in startup.TIMES:
+        steps["speech backend"] = startup.TIMES["speech"] * 1000 # Overlaps the steps above
+    game.sounds.wait_all()
+    game.sounds.shutdown(wait=True)
+    lap("sounds ready")
+    game.variants.wait() # Its report must come before ours
+    game.speaker.close()
+    pygame.quit()
+    print(json.dumps({"steps": steps, "menu_ms": (menu - start) * 1000}))
+
+
+def run_child(workdir, screen_reader):
+    command = [sys.executable, os.path.abspath(__file__), "--child"] + (["--screen-reader"] if screen_reader else [])
+    result = subprocess.run(command, cwd=workdir, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--screen-reader", action="store_true",
+                        help="speak through accessible_output2 instead of a stub")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.screen_reader)
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix="psb-startup-")
+    try:
+        shutil.copytree(os.path.join(ROOT, "sounds"), os.path.join(workdir, "sounds"))
+        run_child(workdir, args.screen_reader) # Fills the sound cache: warm starts from here on
+        runs = [run_child(workdir, args.screen_reader) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'step':<18}{'median ms':>12}{'max ms':>10}")
+    for step in STEPS:
+        values = [run["steps"][step] for run in runs if step in run["steps"]]
+        if values:
+            print(f"{step:<18}{statistics.median(values):>12.1f}{max(values):>10.1f}")
+    menu = [run["menu_ms"] for run in runs]
+    print(f"{'time to menu':<18}{statistics.median(menu):>12.1f}{max(menu):>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
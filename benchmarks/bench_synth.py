@@ -0,0 +1,44 @@
+"""Per-sound generation time: pure-Python loops vs the NumPy backend.
+
+"before" is the per-sample loop plus the wave/BytesIO round-trip into
+pygame; "after" is the vectorized routine handing an int16 buffer straight
+to pygame.mixer.Sound.
+
+    python benchmarks/bench_synth.py [--repeat N]
+"""
+import argparse
+
+from common import best_of, load_game_module, use_dummy_drivers
+
+from pro_sound_basketball import synth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    use_dummy_drivers()
+    game = load_game_module()
+    pygame = game.pygame
+    pygame.mixer.init(frequency=synth.SAMPLE_RATE, size=-16, channels=2, buffer=512)
+    create = game.AudioGenerator._create_sound
+
+    if synth.np is None:
+        print("NumPy is not installed; only the pure-Python backend can be measured.")
+
+    print(f"{'sound':<12}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    total_before = total_after = 0.0
+    for name in synth.RECIPES:
+        before = best_of(lambda: create(synth.render(name, backend=synth.BACKEND_PYTHON)), args.repeat)
+        after = best_of(lambda: create(synth.render(name)), args.repeat)
+        total_before += before
+        total_after += after
+        print(f"{name:<12}{before * 1000:>12.2f}{after * 1000:>12.2f}{before / after:>9.1f}x")
+    print(f"{'total':<12}{total_before * 1000:>12.2f}{total_after * 1000:>12.2f}{total_before / total_after:>9.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Shared helpers for the benchmark scripts."""
+import importlib
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def use_dummy_drivers():
+    """Runs SDL without a window or audio device."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def load_game_module():
+    """Imports the pygame frontend, pro_sound_basketball.game."""
+    return importlib.import_module("pro_sound_basketball.game")
+
+
+class StubSpeaker:
+    """Stands in for accessible_output2's Auto and remembers when it was first used."""
+
+    def __init__(self):
+        self.spoken = []
+        self.first_speech = None
+
+    def speak(self, text, interrupt=True):
+        if self.first_speech is None:
+            self.first_speech = time.perf_counter()
+        self.spoken.append(text)
+
+
+def best_of(func, repeat=5):
+    """Best wall time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
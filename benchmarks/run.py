@@ -0,0 +1,256 @@
+"""Benchmark suite with stored baselines and regression thresholds.
+
+Measures, under SDL's dummy video and audio drivers with a stub speaker:
+  - cold, warm and sound-pack startup to importing the rules and to the
+    first menu speech (fresh processes)
+  - every AudioGenerator recipe
+  - one positional play_sound_panned call
+  - one simulation tick with 4 and with 10 players
+  - one block of streamed gym ambience, per gym
+  - full headless matches
+
+Results are written as JSON. When a baseline exists, any metric slower than
+baseline * (1 + tolerance) is reported and the run exits with status 1.
+
+    python benchmarks/run.py [--tolerance 0.25] [--output results.json]
+    python benchmarks/run.py --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, StubSpeaker, best_of, load_game_module, use_dummy_drivers
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+STARTUP_RUNS = 3
+
+
+# ==================================================================================
+# STARTUP (runs in a child process)
+# ==================================================================================
+def startup_child():
+    """Starts the game in the current directory and prints its timings as JSON."""
+    start = time.perf_counter()
+    use_dummy_drivers()
+    import pro_sound_basketball.simulation # noqa: F401 (the rules alone)
+    rules = time.perf_counter()
+    game_module = load_game_module()
+    speaker = StubSpeaker()
+    game = game_module.Game(speaker=speaker)
+    game.current_menu.speak_title()
+    game.speaker.flush()
+    game.sounds.wait_all()
+    game.sounds.shutdown(wait=True)
+    ready = time.perf_counter()
+    game.variants.wait() # Its report must come before ours
+    game.speaker.close()
+    game_module.pygame.quit()
+    print(json.dumps({
+        "import_rules_ms": (rules - start) * 1000,
+        "first_speech_ms": (speaker.first_speech - start) * 1000,
+        "sounds_ready_ms": (ready - start) * 1000,
+    }))
+
+
+def run_startup(workdir):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--startup-child"],
+        cwd=workdir, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_startup():
+    """Median cold (no sound cache), warm (cache filled) and pack (sounds.pack
+    built) startup timings."""
+    cold, warm, pack = [], [], []
+    for _ in range(STARTUP_RUNS):
+        workdir = tempfile.mkdtemp(prefix="psb-bench-")
+        try:
+            shutil.copytree(os.path.join(ROOT, "sounds"), os.path.join(workdir, "sounds"))
+            cold.append(run_startup(workdir))
+            warm.append(run_startup(workdir))
+            subprocess.run([sys.executable, "-m", "pro_sound_basketball.sound_pack"],
+                           cwd=workdir, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, check=True)
+            pack.append(run_startup(workdir))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    metrics = {}
+    for label, runs in (("cold", cold), ("warm", warm), ("pack", pack)):
+        for key in ("import_rules_ms", "first_speech_ms", "sounds_ready_ms"):
+            metrics[f"startup_{label}_{key}"] = statistics.median(r[key] for r in runs)
+    return metrics
+
+
+# ==================================================================================
+# IN-PROCESS METRICS
+# ==================================================================================
+def measure_synthesis(game_module):
+    from pro_sound_basketball import synth
+    return {f"synth_{name}_ms": best_of(lambda: game_module.AudioGenerator.generate(name)) * 1000
+            for name in synth.RECIPES}
+
+
+def measure_panned_play(game_module, calls=2000):
+    pygame = game_module.pygame
+    game = game_module.Game(speaker=StubSpeaker())
+    game.sounds.wait_all()
+    game.sounds.shutdown(wait=True)
+    game.variants.wait()
+    game.spatial.table.build()
+
+    total = 0.0
+    for i in range(calls):
+        pygame.mixer.stop()
+        start = time.perf_counter()
+        game.play_sound_panned('dribble', (i % 21 - 10) * 100, 0)
+        total += time.perf_counter() - start
+    pygame.mixer.stop()
+    game.speaker.close()
+    return {"play_sound_panned_us": total / calls * 1e6}
+
+
+def measure_simulation():
+    from pro_sound_basketball import simulation
+
+    inputs = simulation.Inputs()
+    state = simulation.MatchState(seed=1, ai_only=True)
+    ticks = 3000
+    start = time.perf_counter()
+    for _ in range(ticks):
+        state, _ = simulation.step(state, inputs)
+    tick_us = (time.perf_counter() - start) / ticks * 1e6
+
+    def five_on_five(ticks=1000):
+        match = simulation.MatchState(seed=1, ai_only=True, team_size=5)
+        for _ in range(ticks):
+            match, _ = simulation.step(match, inputs)
+
+    tick_5v5_us = best_of(five_on_five, repeat=3) / 1000 * 1e6
+
+    def full_match():
+        for seed in range(3):
+            match = simulation.MatchState(seed=seed, ai_only=True)
+            while not match.over:
+                match, _ = simulation.step(match, inputs)
+
+    return {
+        "tick_4_players_us": tick_us,
+        "tick_10_players_us": tick_5v5_us,
+        "headless_match_ms": best_of(full_match, repeat=3) / 3 * 1000,
+    }
+
+
+def measure_ambience():
+    from pro_sound_basketball import ambience
+    if ambience.np is None:
+        return {}
+    metrics = {}
+    for i, gym in enumerate(ambience.GYMS):
+        synth = ambience.AmbienceSynth(gym, seed=i)
+        synth.follow({0: 0, 1: 0}, 60)
+        metrics[f"ambience_block_{i}_ms"] = best_of(synth.block, repeat=20) * 1000
+    return metrics
+
+
+def collect():
+    use_dummy_drivers()
+    metrics = measure_startup()
+
+    game_module = load_game_module()
+    pygame = game_module.pygame
+    game_module.startup.start_mixer()
+
+    workdir = tempfile.mkdtemp(prefix="psb-bench-")
+    cwd = os.getcwd()
+    try:
+        os.symlink(os.path.join(ROOT, "sounds"), os.path.join(workdir, "sounds"))
+        os.chdir(workdir)
+        metrics.update(measure_synthesis(game_module))
+        metrics.update(measure_panned_play(game_module))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    pygame.quit()
+
+    metrics.update(measure_simulation())
+    metrics.update(measure_ambience())
+    return metrics
+
+
+# ==================================================================================
+# REPORTING
+# ==================================================================================
+def compare(metrics, baseline, tolerance):
+    """Prints every metric against its baseline; returns the regressed names."""
+    regressions = []
+    print(f"{'metric':<36}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<36}{'-':>12}{value:>12.3f}{'new':>9}")
+            continue
+        change = (value - base) / base if base else 0.0
+        flag = ""
+        if value > base * (1 + tolerance):
+            regressions.append(name)
+            flag = "  REGRESSED"
+        print(f"{name:<36}{base:>12.3f}{value:>12.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--startup-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_child:
+        startup_child()
+        return 0
+
+    metrics = collect()
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["metrics"]
+    regressions = compare(metrics, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""Pro Sound Basketball, an audio-only basketball game.
+
+Importing the package, or any of the game rules in it (simulation, replay,
+tournament, batch_sim, netplay), loads no pygame, opens no window and
+starts no speech engine. pygame comes in with the game module, and the
+mixer, display and screen reader start when the game first needs them
+(see startup.py). Game and main are looked up from the game module on
+first access.
+"""
+__version__ = "1.0.0"
+
+
+def __getattr__(name):
+    if name in ("Game", "main"):
+        from . import game
+        return getattr(game, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,3 @@
+from .game import main
+
+main()
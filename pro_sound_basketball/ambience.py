@@ -0,0 +1,270 @@
+"""Procedural gym ambience, streamed in small blocks.
+
+Each gym has a bed of layers (industrial hum, rooftop wind, arcade buzz,
+hangar room tone) and, in Play mode, a crowd whose level follows the game:
+it grows as the score gets close and the clock runs down, and swells when
+someone scores.
+
+AmbienceSynth renders BLOCK_FRAMES stereo frames at a time with NumPy and
+keeps every oscillator phase and filter history between blocks, so the
+stream is continuous. AmbienceStream keeps one block playing and one queued
+on a dedicated mixer channel (Channel.queue), generating the next block
+whenever the queue slot frees up; the ambience never exists as one long
+Sound. It records the CPU time of every block and counts underruns, frames
+on which the channel had run dry.
+
+Requires NumPy; without it the game simply has no ambience.
+"""
+import math
+import time
+from array import array
+
+from .profiler import percentile
+from .simulation import MATCH_LENGTH, TEAM_AWAY, TEAM_HOME
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+SAMPLE_RATE = 44100
+BLOCK_FRAMES = 4096 # About 93 ms at 44.1 kHz
+LEVEL = 0.2 # Overall ambience level, as a fraction of full scale
+CPU_SAMPLES = 1024
+
+
+# ==================================================================================
+# LAYERS
+# ==================================================================================
+class _Noise:
+    """Stereo white noise smoothed by box filters; history carries across blocks.
+
+    next(n) returns one (n, 2) array per requested width. A narrow box minus a
+    wide one makes a band-pass; a wide box alone is a rumble.
+    """
+
+    def __init__(self, rng, widths):
+        self.rng = rng
+        self.widths = widths
+        self.history = np.zeros((max(widths), 2))
+
+    def next(self, n):
+        span = len(self.history)
+        samples = np.concatenate([self.history, self.rng.standard_normal((n, 2))])
+        self.history = samples[-span:]
+        total = np.cumsum(samples, axis=0)
+        return [(total[span:] - total[span - w:span - w + n]) / math.sqrt(w) for w in self.widths]
+
+
+class _Drift:
+    """A slow random level between 0 and 1 built from a few incommensurate sines."""
+
+    def __init__(self, rng, rates):
+        self.rates = rates
+        self.phases = rng.uniform(0, 2 * math.pi, len(rates))
+
+    def at(self, t):
+        value = sum(np.sin(2 * math.pi * rate * t + phase) for rate, phase in zip(self.rates, self.phases))
+        return 0.5 + 0.5 * value / len(self.rates)
+
+
+class _Layer:
+    """One part of a gym's bed; this base one is silent."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def render(self, t, n):
+        """(n, 2) float samples for times t (seconds since the stream began)."""
+        return np.zeros((n, 2))
+
+
+class IndustrialHum(_Layer):
+    """Mains hum with harmonics over a low grinding rumble."""
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.noise = _Noise(rng, (64,))
+        self.drift = _Drift(rng, (0.07, 0.13))
+
+    def render(self, t, n):
+        hum = (np.sin(2 * math.pi * 50 * t) + 0.5 * np.sin(2 * math.pi * 100 * t)
+               + 0.25 * np.sin(2 * math.pi * 150 * t)) / 1.75
+        hum *= 0.6 + 0.4 * self.drift.at(t)
+        rumble, = self.noise.next(n)
+        return 0.5 * hum[:, None] + 0.35 * rumble
+
+
+class RooftopWind(_Layer):
+    """Gusting wind: low-passed noise whose level and brightness drift."""
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.noise = _Noise(rng, (12, 48))
+        self.gust = _Drift(rng, (0.05, 0.11, 0.23))
+
+    def render(self, t, n):
+        bright, dark = self.noise.next(n)
+        gust = self.gust.at(t)[:, None]
+        return (0.25 + 0.75 * gust) * (0.7 * dark + 0.3 * gust * bright)
+
+
+class ArcadeBuzz(_Layer):
+    """Neon transformer buzz with occasional arcade-cabinet blips."""
+
+    BLIP_NOTES = (523.3, 587.3, 659.3, 784.0, 880.0, 1046.5)
+    BLIP_SECONDS = 0.06
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.noise = _Noise(rng, (4,))
+        self.drift = _Drift(rng, (0.3, 0.7))
+
+    def render(self, t, n):
+        buzz = sum(np.sin(2 * math.pi * 120 * k * t) / k for k in range(1, 6)) / 2.3
+        fizz, = self.noise.next(n)
+        out = (0.4 * buzz * (0.7 + 0.3 * self.drift.at(t)))[:, None] + 0.08 * fizz
+
+        if self.rng.random() < 0.25:
+            length = int(self.BLIP_SECONDS * SAMPLE_RATE)
+            start = int(self.rng.integers(0, max(1, n - length)))
+            note = self.BLIP_NOTES[self.rng.integers(len(self.BLIP_NOTES))]
+            span = t[start:start + length]
+            blip = np.sign(np.sin(2 * math.pi * note * span)) * np.linspace(1.0, 0.0, len(span))
+            pan = self.rng.uniform(0.2, 0.8)
+            out[start:start + len(span)] += 0.25 * blip[:, None] * np.array([1 - pan, pan])
+        return out
+
+
+class HangarRoomTone(_Layer):
+    """A vast, dark room: deep rumble, a faint 30 Hz drone and slow swells."""
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.noise = _Noise(rng, (160, 24))
+        self.swell = _Drift(rng, (0.03, 0.08))
+
+    def render(self, t, n):
+        deep, air = self.noise.next(n)
+        drone = 0.3 * np.sin(2 * math.pi * 30 * t)
+        return (0.5 + 0.5 * self.swell.at(t))[:, None] * (0.6 * deep + 0.1 * air) + drone[:, None]
+
+
+class Crowd(_Layer):
+    """Band-passed murmur whose level follows `excitement`, plus score swells."""
+
+    CHEER_DECAY = 1.5 # Seconds for a cheer to fade to about a third
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.noise = _Noise(rng, (3, 30))
+        self.murmur = _Drift(rng, (0.4, 0.9, 1.7))
+        self.excitement = 0.0 # Target, 0 to 1
+        self.cheer = 0.0      # Current swell, decays every block
+        self._level = 0.0     # Level at the end of the last block
+
+    def render(self, t, n):
+        seconds = n / SAMPLE_RATE
+        start_cheer = self.cheer
+        self.cheer *= math.exp(-seconds / self.CHEER_DECAY)
+        target = min(1.0, 0.15 + 0.5 * self.excitement + self.cheer)
+        level = np.linspace(self._level, target, n) # Ramped, so changes never click
+        self._level = target
+
+        narrow, wide = self.noise.next(n)
+        voices = narrow - 0.8 * wide
+        swell = np.linspace(start_cheer, self.cheer, n)
+        return (level * (0.7 + 0.3 * self.murmur.at(t)))[:, None] * voices * (0.5 + 0.3 * swell[:, None])
+
+
+# Gym name (as in Game.gyms) -> layer classes
+GYMS = {
+    "The Iron Cage": (IndustrialHum,),
+    "Skyline Heights": (RooftopWind,),
+    "Neon Alley": (ArcadeBuzz,),
+    "The Hangar": (HangarRoomTone,),
+}
+
+
+# ==================================================================================
+# SYNTHESIS
+# ==================================================================================
+class AmbienceSynth:
+    def __init__(self, gym, crowd=True, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.layers = [layer(self.rng) for layer in GYMS[gym]]
+        self.crowd = Crowd(self.rng) if crowd else None
+        if self.crowd is not None:
+            self.layers.append(self.crowd)
+        self.frames = 0 # Frames rendered so far
+
+        self._score = None
+
+    def follow(self, score, time_remaining):
+        """Sets the crowd's excitement from the match; a change in score sets off a cheer."""
+        if self.crowd is None:
+            return
+        if self._score is not None:
+            home = score[TEAM_HOME] - self._score[0]
+            away = score[TEAM_AWAY] - self._score[1]
+            if home > 0:
+                self.crowd.cheer = min(1.0, self.crowd.cheer + 0.6)
+            elif away > 0:
+                self.crowd.cheer = min(1.0, self.crowd.cheer + 0.3)
+        self._score = (score[TEAM_HOME], score[TEAM_AWAY])
+
+        closeness = max(0.0, 1.0 - abs(score[TEAM_HOME] - score[TEAM_AWAY]) / 10)
+        late = 1.0 - max(0, time_remaining) / MATCH_LENGTH
+        self.crowd.excitement = closeness * (0.3 + 0.7 * late)
+
+    def block(self, n=BLOCK_FRAMES):
+        """The next n frames as an (n, 2) int16 array."""
+        t = (self.frames + np.arange(n)) / SAMPLE_RATE
+        self.frames += n
+        mix = sum(layer.render(t, n) for layer in self.layers)
+        return (np.clip(mix * LEVEL, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+# ==================================================================================
+# STREAMING
+# ==================================================================================
+class AmbienceStream:
+    """Feeds an AmbienceSynth to one mixer channel, a block at a time.
+
+    `make_sound` turns an (n, 2) int16 array into something the channel can
+    play (a pygame Sound). Call pump() once per frame.
+    """
+
+    def __init__(self, synth, channel, make_sound):
+        self.synth = synth
+        self.channel = channel
+        self.make_sound = make_sound
+        self.blocks = 0
+        self.underruns = 0
+        self._cpu = array("d", bytes(8 * CPU_SAMPLES))
+
+    def _next_sound(self):
+        start = time.perf_counter()
+        sound = self.make_sound(self.synth.block())
+        self._cpu[self.blocks % CPU_SAMPLES] = time.perf_counter() - start
+        self.blocks += 1
+        return sound
+
+    def pump(self):
+        if not self.channel.get_busy():
+            if self.blocks:
+                self.underruns += 1
+            self.channel.play(self._next_sound())
+        if self.channel.get_queue() is None:
+            self.channel.queue(self._next_sound())
+
+    def stop(self):
+        self.channel.stop()
+
+    def report(self):
+        cpu = sorted(self._cpu[:min(self.blocks, CPU_SAMPLES)])
+        block_ms = BLOCK_FRAMES / SAMPLE_RATE * 1000
+        p50 = percentile(cpu, 0.50) * 1000
+        p99 = percentile(cpu, 0.99) * 1000
+        return (f"Ambience: {self.blocks} blocks of {block_ms:.0f} ms, CPU p50 {p50:.2f} ms, "
+                f"p99 {p99:.2f} ms ({p99 / block_ms:.1%} of real time), {self.underruns} underruns")
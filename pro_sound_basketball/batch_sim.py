@@ -0,0 +1,248 @@
+"""Struct-of-arrays engine that plays many AI-vs-AI matches at once.
+
+BatchMatch keeps positions, ball ownership, shots in flight, cooldowns and
+scores for N independent 2-on-2 matches in NumPy arrays and advances all
+of them with one vectorized tick. The rules are the ones simulation.step
+applies to an ai_only MatchState in PLAY mode: shots arrive when their
+shot_physics arc ends and misses fly a rebound arc to the second home
+player, then each player slot in order goes through Player.ai_update
+(chase, drive, shoot, pass, steal) and the shot/steal/pass handling. Only the random stream differs,
+so results agree with the scalar engine statistically, not game by game.
+
+Besides the score, every match counts possessions, shots and makes by type
+(dunk, two, three), steals and passes per team for tournament statistics.
+
+Requires NumPy.
+"""
+import math
+
+import numpy as np
+
+from .shot_physics import (
+    GRAVITY, LAUNCH_ANGLE, MIN_HANG, REBOUND_DISTANCE, REBOUND_HANG, REBOUND_SPREAD, RELEASE_HEIGHT,
+    RIM_HEIGHT, arrival_ticks,
+)
+from .simulation import (
+    DEFAULT_RULES, DUNK_RANGE, HOOP_LEFT_POS, HOOP_RIGHT_POS, MATCH_LENGTH, NEAR_THREE_BAND,
+    PLAYER_SPEED, THREE_POINT_RADIUS, TEAM_AWAY, TEAM_HOME, TICK_RATE,
+)
+
+# Player slots match MatchState.players: two home players, then two away
+SLOT_TEAM = np.array([TEAM_HOME, TEAM_HOME, TEAM_AWAY, TEAM_AWAY])
+SLOT_TEAMMATE = (1, 0, 3, 2)
+START_X = np.array([-200.0, -200.0, 200.0, 200.0])
+START_Y = np.array([0.0, 100.0, 0.0, 100.0])
+HOOP_X = {TEAM_HOME: float(HOOP_RIGHT_POS[0]), TEAM_AWAY: float(HOOP_LEFT_POS[0])}
+HOOP_Y = {TEAM_HOME: float(HOOP_RIGHT_POS[1]), TEAM_AWAY: float(HOOP_LEFT_POS[1])}
+
+NO_OWNER = -1
+SHOT_DUNK, SHOT_TWO, SHOT_THREE = 0, 1, 2
+SHOT_TYPES = ("dunk", "two", "three")
+AI_SPEED = PLAYER_SPEED * 0.8
+STEAL_RADIUS = 30
+REBOUND_TICKS = arrival_ticks(REBOUND_HANG, TICK_RATE)
+# Distances below this count as zero (the scalar engine's `dist > 0` check
+# without dividing by denormals)
+MIN_DISTANCE = 1e-9
+
+
+class BatchMatch:
+    """N simultaneous matches. All of them start, tick and end together."""
+
+    def __init__(self, n_games, seed=None, rules=DEFAULT_RULES):
+        self.n = n_games
+        self.rules = rules
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+        self.total_ticks = MATCH_LENGTH * TICK_RATE
+
+        # Positions are (slot, game) so each slot's row is contiguous
+        self.px = np.repeat(START_X[:, None], n_games, axis=1)
+        self.py = np.repeat(START_Y[:, None], n_games, axis=1)
+        self.owner = np.zeros(n_games, dtype=np.int8) # Slot holding the ball
+
+        self.bx = np.zeros(n_games)
+        self.by = np.zeros(n_games)
+        self.in_air = np.zeros(n_games, dtype=bool)
+        self.rebounding = np.zeros(n_games, dtype=bool) # In the air off the rim
+        # Current flight, as a straight line over the floor: from, to, when
+        self.from_x = np.zeros(n_games)
+        self.from_y = np.zeros(n_games)
+        self.to_x = np.zeros(n_games)
+        self.to_y = np.zeros(n_games)
+        self.flight_start = np.zeros(n_games, dtype=np.int64)
+        self.flight_ticks = np.ones(n_games) # Hang time in ticks, not rounded
+        self.arrival_tick = np.zeros(n_games, dtype=np.int64)
+        self.shot_team = np.zeros(n_games, dtype=np.int8)
+        self.shot_points = np.zeros(n_games, dtype=np.int8)
+        self.shot_type = np.zeros(n_games, dtype=np.int8)
+
+        self.steal_cooldown = np.zeros(n_games, dtype=np.int32)
+        self.score = np.zeros((n_games, 2), dtype=np.int32)
+
+        # Per-team counters, (game, team) or (game, team, shot type)
+        self.possessions = np.zeros((n_games, 2), dtype=np.int32)
+        self.possessions[:, TEAM_HOME] = 1 # Home starts with the ball
+        self.shots = np.zeros((n_games, 2, 3), dtype=np.int32)
+        self.makes = np.zeros((n_games, 2, 3), dtype=np.int32)
+        self.steals = np.zeros((n_games, 2), dtype=np.int32)
+        self.passes = np.zeros((n_games, 2), dtype=np.int32)
+
+    @property
+    def over(self):
+        return self.tick >= self.total_ticks
+
+    def run(self):
+        """Plays every match to the final buzzer and returns the (N, 2) scores."""
+        while not self.over:
+            self.step()
+        return self.score
+
+    # ------------------------------------------------------------------ tick
+    def step(self):
+        if self.over:
+            return
+        np.subtract(self.steal_cooldown, 1, out=self.steal_cooldown, where=self.steal_cooldown > 0)
+
+        self.tick += 1
+        if self.tick >= self.total_ticks:
+            return # Final buzzer: nothing else happens this tick
+
+        self._update_ball()
+        for slot in range(len(SLOT_TEAM)):
+            self._update_slot(slot)
+
+    def _update_ball(self):
+        # Landings first: a gathered rebound or an inbound after a basket is
+        # held from this tick on, so the chasers run at its holder, not the rim
+        arrived = (self.owner == NO_OWNER) & self.in_air & (self.arrival_tick <= self.tick)
+        if arrived.any():
+            self._land(arrived)
+
+        held = self.owner != NO_OWNER
+        rows = np.flatnonzero(held)
+        self.bx[rows] = self.px[self.owner[rows], rows]
+        self.by[rows] = self.py[self.owner[rows], rows]
+
+        rows = np.flatnonzero(~held & self.in_air)
+        if rows.size:
+            done = np.minimum((self.tick - self.flight_start[rows]) / self.flight_ticks[rows], 1.0)
+            self.bx[rows] = self.from_x[rows] + (self.to_x[rows] - self.from_x[rows]) * done
+            self.by[rows] = self.from_y[rows] + (self.to_y[rows] - self.from_y[rows]) * done
+
+    def _land(self, arrived):
+        # Rebounds reach the second home player
+        gathered = arrived & self.rebounding
+        at_rim = arrived & ~self.rebounding
+        self.in_air[gathered] = False
+        self.rebounding[gathered] = False
+        self.owner[gathered] = 1
+
+        made = at_rim & (self.rng.random(self.n) > 1 - self.rules.shot_accuracy)
+        missed = at_rim & ~made
+        self.in_air[made] = False
+
+        # Made basket: score, reset positions, other team inbounds
+        rows = np.flatnonzero(made)
+        team = self.shot_team[rows]
+        self.score[rows, team] += self.shot_points[rows]
+        self.makes[rows, team, self.shot_type[rows]] += 1
+        self.possessions[rows, 1 - team] += 1
+        self.px[:, rows] = START_X[:, None]
+        self.py[:, rows] = START_Y[:, None]
+        self.owner[rows] = np.where(team == TEAM_HOME, 2, 0)
+
+        # Miss: off the rim back towards the shooter's side; the second home
+        # player always takes the rebound
+        self.possessions[missed & (self.shot_team == TEAM_AWAY), TEAM_HOME] += 1
+        rows = np.flatnonzero(missed)
+        if rows.size:
+            hoop_x, hoop_y = self.to_x[rows], self.to_y[rows]
+            back = (np.arctan2(self.from_y[rows] - hoop_y, self.from_x[rows] - hoop_x)
+                    + self.rng.uniform(-REBOUND_SPREAD, REBOUND_SPREAD, rows.size))
+            self.from_x[rows], self.from_y[rows] = hoop_x, hoop_y
+            self.to_x[rows] = hoop_x + REBOUND_DISTANCE * np.cos(back)
+            self.to_y[rows] = hoop_y + REBOUND_DISTANCE * np.sin(back)
+            self._start_flight(rows, np.full(rows.size, REBOUND_HANG))
+            self.rebounding[rows] = True
+
+    def _update_slot(self, slot):
+        team = SLOT_TEAM[slot]
+        mate = SLOT_TEAMMATE[slot]
+        hoop_x, hoop_y = HOOP_X[team], HOOP_Y[team]
+        x = self.px[slot]
+        y = self.py[slot]
+        rolls = self.rng.random((3, self.n))
+
+        has_ball = self.owner == slot
+        chasing = ~has_ball
+
+        # Ball handler drives at the hoop; everyone else chases the ball
+        tx = np.where(has_ball, hoop_x, self.bx)
+        ty = np.where(has_ball, hoop_y, self.by)
+        dx = tx - x
+        dy = ty - y
+        dist = np.sqrt(dx * dx + dy * dy)
+        scale = np.divide(AI_SPEED, dist, out=np.zeros(self.n), where=dist > MIN_DISTANCE)
+        x += dx * scale
+        y += dy * scale
+
+        shoot = has_ball & (
+            ((dist < DUNK_RANGE) & (rolls[0] < self.rules.dunk_chance))
+            | ((dist >= DUNK_RANGE) & (dist < THREE_POINT_RADIUS + NEAR_THREE_BAND)
+               & (rolls[0] < self.rules.mid_range_chance))
+        )
+        mate_dx = hoop_x - self.px[mate]
+        mate_dy = hoop_y - self.py[mate]
+        mate_dist = np.sqrt(mate_dx * mate_dx + mate_dy * mate_dy)
+        pass_ball = has_ball & ~shoot & (rolls[1] < self.rules.pass_chance) & (mate_dist < dist)
+
+        # Slots 0-1 are home and 2-3 away, so the owner's team is a comparison
+        if team == TEAM_HOME:
+            opponent_has_ball = self.owner >= 2
+        else:
+            opponent_has_ball = (self.owner >= 0) & (self.owner < 2)
+        steal = (chasing & (dist < STEAL_RADIUS) & opponent_has_ball
+                 & (rolls[2] < self.rules.steal_chance) & (self.steal_cooldown <= 0))
+
+        if shoot.any():
+            self._release_shot(np.flatnonzero(shoot), slot, team)
+        if steal.any():
+            self.owner[steal] = slot
+            self.steal_cooldown[steal] = self.rules.steal_cooldown
+            self.steals[steal, team] += 1
+            self.possessions[steal, team] += 1
+        if pass_ball.any():
+            self.owner[pass_ball] = mate
+            self.passes[pass_ball, team] += 1
+
+    def _release_shot(self, rows, slot, team):
+        hoop_x, hoop_y = HOOP_X[team], HOOP_Y[team]
+        dx = hoop_x - self.px[slot, rows]
+        dy = hoop_y - self.py[slot, rows]
+        dist = np.hypot(dx, dy)
+
+        self.owner[rows] = NO_OWNER
+        self.in_air[rows] = True
+        self.from_x[rows] = self.px[slot, rows]
+        self.from_y[rows] = self.py[slot, rows]
+        self.to_x[rows] = hoop_x
+        self.to_y[rows] = hoop_y
+        self.shot_team[rows] = team
+        self.shot_points[rows] = np.where(dist > THREE_POINT_RADIUS, 3, 2)
+        self.shot_type[rows] = np.where(dist < DUNK_RANGE, SHOT_DUNK,
+                                        np.where(dist > THREE_POINT_RADIUS, SHOT_THREE, SHOT_TWO))
+        self.shots[rows, team, self.shot_type[rows]] += 1
+
+        # shot_physics.hang_time, vectorized
+        drop = dist * math.tan(LAUNCH_ANGLE) - (RIM_HEIGHT - RELEASE_HEIGHT)
+        hang = np.maximum(MIN_HANG, np.sqrt(2 * np.maximum(drop, 0.0) / GRAVITY))
+        self._start_flight(rows, hang)
+
+    def _start_flight(self, rows, hang):
+        """Starts flights of `hang` seconds now; like shot_physics.arrival_ticks they
+        land on the first whole tick after."""
+        ticks = hang * TICK_RATE
+        self.flight_start[rows] = self.tick
+        self.flight_ticks[rows] = ticks
+        self.arrival_tick[rows] = self.tick + np.maximum(1, np.ceil(ticks - 1e-9)).astype(np.int64)
@@ -0,0 +1,133 @@
+"""Uniform-grid spatial index over the court.
+
+The court is cut into CELL-sized squares; rebuild() drops every player into
+the square under it (anyone off the court goes into the nearest edge
+square), keeping only occupied squares in one dict per team, so a query
+for one team never looks at the other. Queries look at the few
+squares a radius can reach instead of comparing every pair of players, so
+their cost depends on how crowded a neighbourhood is, not on the roster:
+
+  - within(x, y, radius): players closer than radius, e.g. steal range
+  - nearest(x, y, team, k): the k closest players of a team, searching
+    outward ring by ring until nothing nearer can remain
+  - open_teammate(player, opponent): the teammate whose nearest defender
+    is farthest away
+
+Positions are a snapshot: call rebuild() after players move.
+"""
+import math
+
+CELL = 200 # Court units per grid square
+
+
+def _distance(pair):
+    return pair[0]
+
+
+class CourtIndex:
+    """Grid over a width x height court centred on (0, 0)."""
+
+    def __init__(self, width, height, cell=CELL):
+        self.cell = cell
+        self.left = -width / 2
+        self.top = -height / 2
+        self.cols = int(math.ceil(width / cell))
+        self.rows = int(math.ceil(height / cell))
+        self.cells = {} # team -> {col * rows + row: players in that square}
+
+    def _col(self, x):
+        col = int((x - self.left) // self.cell)
+        return 0 if col < 0 else self.cols - 1 if col >= self.cols else col
+
+    def _row(self, y):
+        row = int((y - self.top) // self.cell)
+        return 0 if row < 0 else self.rows - 1 if row >= self.rows else row
+
+    def rebuild(self, players):
+        cells = {}
+        rows = self.rows
+        for player in players:
+            key = self._col(player.x) * rows + self._row(player.y)
+            team = cells.get(player.team)
+            if team is None:
+                team = cells[player.team] = {}
+            bucket = team.get(key)
+            if bucket is None:
+                team[key] = [player]
+            else:
+                bucket.append(player)
+        self.cells = cells
+
+    def _grids(self, team):
+        if team is None:
+            return list(self.cells.values())
+        grid = self.cells.get(team)
+        return [grid] if grid else []
+
+    def within(self, x, y, radius, team=None):
+        """Players (of `team`, if given) strictly closer than `radius` to (x, y)."""
+        found = []
+        rows = self.rows
+        for cells in self._grids(team):
+            for col in range(self._col(x - radius), self._col(x + radius) + 1):
+                for row in range(self._row(y - radius), self._row(y + radius) + 1):
+                    for player in cells.get(col * rows + row, ()):
+                        if math.hypot(player.x - x, player.y - y) < radius:
+                            found.append(player)
+        return found
+
+    def nearest(self, x, y, team=None, k=1, exclude=None):
+        """Up to k players (of `team`, if given), closest first; never `exclude`."""
+        grids = self._grids(team)
+        rows, cols, cell = self.rows, self.cols, self.cell
+        col0 = self._col(x)
+        row0 = self._row(y)
+        # Squares `ring` away are at least this margin (the distance to the
+        # edge of (x, y)'s own square) plus ring - 1 squares' width off
+        left = self.left + col0 * cell
+        top = self.top + row0 * cell
+        margin = max(0.0, min(x - left, left + cell - x, y - top, top + cell - y))
+
+        best = [] # (distance, player), closest first
+        for ring in range(max(cols, rows)):
+            if len(best) == k and best[-1][0] <= margin + (ring - 1) * cell:
+                break
+            first_col, last_col = max(col0 - ring, 0), min(col0 + ring, cols - 1)
+            first_row, last_row = max(row0 - ring, 0), min(row0 + ring, rows - 1)
+            for col in range(first_col, last_col + 1):
+                if col == col0 - ring or col == col0 + ring:
+                    ring_rows = range(first_row, last_row + 1)
+                else:
+                    ring_rows = (row0 - ring, row0 + ring) # Only the top and bottom of the ring
+                for row in ring_rows:
+                    if row < first_row or row > last_row:
+                        continue
+                    key = col * rows + row
+                    for cells in grids:
+                        for player in cells.get(key, ()):
+                            if player is exclude:
+                                continue
+                            dist = math.hypot(player.x - x, player.y - y)
+                            if len(best) < k:
+                                best.append((dist, player))
+                            elif dist < best[-1][0]:
+                                best[-1] = (dist, player)
+                            else:
+                                continue
+                            best.sort(key=_distance)
+            if first_col == 0 and last_col == cols - 1 and first_row == 0 and last_row == rows - 1:
+                break # The whole court has been searched
+        return [player for _, player in best]
+
+    def open_teammate(self, player, opponent, candidates=None):
+        """The teammate (from `candidates`, default all of them) with the most
+        space to the nearest player of team `opponent`, or None."""
+        best = None
+        best_space = -1.0
+        for mate in player.teammates if candidates is None else candidates:
+            marker = self.nearest(mate.x, mate.y, opponent)
+            space = math.hypot(marker[0].x - mate.x, marker[0].y - mate.y) if marker else math.inf
+            if space > best_space:
+                best = mate
+                best_space = space
+        return best
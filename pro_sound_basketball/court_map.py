@@ -0,0 +1,268 @@
+"""Precomputed field maps over the court, one per hoop.
+
+A CourtLayout is rasterized once into a HoopField for each hoop. Every
+`cell`-sized square of the court gets three values:
+
+  - the distance from its centre to the hoop
+  - its shot zone: DUNK inside dunk_range, THREE beyond the three-point
+    radius, TWO in between, with NEAR_THREE added for the band just
+    behind the line (the AI's shooting range ends there)
+  - the expected points of a shot from there, make_chance times 2 or 3
+
+Queries are a bounds check and an array lookup. Zones are exact, never
+rounded to the grid: a square that the dunk circle, the three-point line
+or the edge of the band runs through is marked MIXED, and its queries
+fall back to the exact distance, as do positions off the court. Distances
+and expected points are those of the square's centre, so they can be up to
+cell / sqrt(2) off.
+
+Maps can be saved and loaded, so other court layouts ship as a file:
+
+    python -m pro_sound_basketball.court_map [--output court.map] [--three-point-radius 250] ...
+    python -m pro_sound_basketball.court_map --info court.map
+
+Layout (little-endian):
+    header  "PSBCOURT", u16 MAP_VERSION, u16 hoop count
+    layout  f32 width, height, three-point radius, dunk range, near-three
+            band, make chance, cell
+    hoops   f32 x, y, then per square (column-major): f32 distances,
+            u8 zone codes, f32 expected points
+"""
+import argparse
+import math
+import struct
+import time
+import zlib
+from array import array
+from collections import namedtuple
+
+MAGIC = b"PSBCOURT"
+MAP_VERSION = 1
+DEFAULT_CELL = 20 # Court units per square
+
+_HEADER = struct.Struct("<8sHH")
+_LAYOUT = struct.Struct("<7f")
+_HOOP = struct.Struct("<2f")
+
+# Zone codes; NEAR_THREE is added to THREE
+DUNK = 1
+TWO = 2
+THREE = 4
+NEAR_THREE = 8
+MIXED = 0 # The square straddles a boundary: ask the exact distance
+ZONE_NAMES = {DUNK: "dunk range", TWO: "two-point range", THREE: "three-point range",
+              THREE | NEAR_THREE: "just behind the three-point line"}
+
+_EDGE = 1e-6 # Squares this close to a boundary count as straddling it
+
+CourtLayout = namedtuple("CourtLayout", [
+    "width", "height",      # Court centred on (0, 0)
+    "hoops",                # (x, y) of each hoop
+    "three_point_radius",   # Shots from farther than this are worth 3
+    "dunk_range",           # Shots from closer than this are dunks
+    "near_three_band",      # Depth of the NEAR_THREE band behind the line
+    "make_chance",          # Chance a shot goes in, for expected points
+    "cell",                 # Square size
+])
+
+
+def zone_at(distance, layout):
+    """Exact zone code for a shot from `distance` to the hoop."""
+    if distance < layout.dunk_range:
+        return DUNK
+    if distance > layout.three_point_radius:
+        if distance < layout.three_point_radius + layout.near_three_band:
+            return THREE | NEAR_THREE
+        return THREE
+    return TWO
+
+
+def points(zone):
+    """Points a made shot from `zone` is worth."""
+    return 3 if zone & THREE else 2
+
+
+class HoopField:
+    """The grids for one hoop. Built from the layout unless given."""
+
+    __slots__ = ("layout", "hoop", "cell", "left", "top", "cols", "rows", "distances", "zones", "values")
+
+    def __init__(self, layout, hoop, distances=None, zones=None, values=None):
+        self.layout = layout
+        self.hoop = hoop
+        self.cell = layout.cell
+        self.left = -layout.width / 2
+        self.top = -layout.height / 2
+        self.cols = int(math.ceil(layout.width / layout.cell))
+        self.rows = int(math.ceil(layout.height / layout.cell))
+        if distances is None:
+            distances, zones, values = self._rasterize()
+        self.distances = distances
+        self.zones = zones
+        self.values = values
+
+    def _rasterize(self):
+        layout, cell = self.layout, self.cell
+        hx, hy = self.hoop
+        distances = array("f")
+        zones = bytearray()
+        values = array("f")
+        for col in range(self.cols):
+            x0 = self.left + col * cell
+            x1 = x0 + cell
+            near_x = min(max(hx, x0), x1) - hx
+            far_x = max(abs(x0 - hx), abs(x1 - hx))
+            for row in range(self.rows):
+                y0 = self.top + row * cell
+                y1 = y0 + cell
+                near = math.hypot(near_x, min(max(hy, y0), y1) - hy)
+                far = math.hypot(far_x, max(abs(y0 - hy), abs(y1 - hy)))
+                centre = math.hypot(x0 + cell / 2 - hx, y0 + cell / 2 - hy)
+                first = zone_at(max(near - _EDGE, 0.0), layout)
+                distances.append(centre)
+                zones.append(first if first == zone_at(far + _EDGE, layout) else MIXED)
+                values.append(points(zone_at(centre, layout)) * layout.make_chance)
+        return distances, bytes(zones), values
+
+    def _square(self, x, y):
+        """Index of the square under (x, y), or -1 off the court."""
+        col = int((x - self.left) // self.cell)
+        row = int((y - self.top) // self.cell)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return col * self.rows + row
+        return -1
+
+    def zone(self, x, y):
+        """Zone code of a shot from (x, y)."""
+        # _square() inlined: this runs for every player with the ball, every tick
+        col = int((x - self.left) // self.cell)
+        row = int((y - self.top) // self.cell)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            zone = self.zones[col * self.rows + row]
+            if zone != MIXED:
+                return zone
+        return zone_at(math.hypot(x - self.hoop[0], y - self.hoop[1]), self.layout)
+
+    def distance(self, x, y):
+        """Distance to the hoop, to within half a square's diagonal."""
+        square = self._square(x, y)
+        if square >= 0:
+            return self.distances[square]
+        return math.hypot(x - self.hoop[0], y - self.hoop[1])
+
+    def expected_points(self, x, y):
+        """Points a shot from (x, y) scores on average."""
+        square = self._square(x, y)
+        if square >= 0:
+            return self.values[square]
+        return points(self.zone(x, y)) * self.layout.make_chance
+
+    def mixed_share(self):
+        return self.zones.count(MIXED) / len(self.zones)
+
+
+class CourtMap:
+    """A HoopField per hoop of `layout`, in the layout's order."""
+
+    def __init__(self, layout, fields=None):
+        self.layout = layout
+        self.build_time = 0.0
+        if fields is None:
+            start = time.perf_counter()
+            fields = tuple(HoopField(layout, tuple(hoop)) for hoop in layout.hoops)
+            self.build_time = time.perf_counter() - start
+        self.fields = fields
+
+    def to_bytes(self):
+        layout = self.layout
+        parts = [_HEADER.pack(MAGIC, MAP_VERSION, len(self.fields)),
+                 _LAYOUT.pack(layout.width, layout.height, layout.three_point_radius, layout.dunk_range,
+                              layout.near_three_band, layout.make_chance, layout.cell)]
+        for field in self.fields:
+            parts += [_HOOP.pack(*field.hoop), field.distances.tobytes(), field.zones, field.values.tobytes()]
+        return b"".join(parts)
+
+    def checksum(self):
+        """CRC-32 of the saved map, to tell maps apart."""
+        return zlib.crc32(self.to_bytes())
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data):
+        try:
+            magic, version, count = _HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != MAP_VERSION:
+                raise ValueError(f"not a version {MAP_VERSION} court map")
+            width, height, three, dunk, band, make, cell = _LAYOUT.unpack_from(data, _HEADER.size)
+            offset = _HEADER.size + _LAYOUT.size
+            squares = int(math.ceil(width / cell)) * int(math.ceil(height / cell))
+            hoops, grids = [], []
+            for _ in range(count):
+                hoops.append(_HOOP.unpack_from(data, offset))
+                offset += _HOOP.size
+                distances, values = array("f"), array("f")
+                distances.frombytes(data[offset:offset + 4 * squares])
+                offset += 4 * squares
+                zones = bytes(data[offset:offset + squares])
+                offset += squares
+                values.frombytes(data[offset:offset + 4 * squares])
+                offset += 4 * squares
+                grids.append((distances, zones, values))
+            if offset != len(data) or any(len(grid[1]) != squares for grid in grids):
+                raise ValueError("wrong size for its layout")
+        except struct.error as e:
+            raise ValueError(f"truncated court map: {e}") from None
+        layout = CourtLayout(width, height, tuple(hoops), three, dunk, band, make, cell)
+        return cls(layout, tuple(HoopField(layout, hoop, *grid) for hoop, grid in zip(hoops, grids)))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            return cls.from_bytes(data)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+
+    def describe(self):
+        layout = self.layout
+        field = self.fields[0]
+        return (f"{layout.width:g} x {layout.height:g} court, {len(self.fields)} hoops, "
+                f"three-point radius {layout.three_point_radius:g}, dunk range {layout.dunk_range:g}, "
+                f"band {layout.near_three_band:g}, make chance {layout.make_chance:g}; "
+                f"{field.cols} x {field.rows} squares of {layout.cell:g}, "
+                f"{field.mixed_share():.1%} on a boundary")
+
+
+def main(argv=None):
+    from .simulation import DEFAULT_LAYOUT
+
+    parser = argparse.ArgumentParser(description="Build or inspect a court map")
+    parser.add_argument("--output", default="court.map", help="map to write (default court.map)")
+    parser.add_argument("--info", metavar="PATH", help="describe an existing map instead")
+    for name in ("width", "height", "three_point_radius", "dunk_range", "near_three_band", "make_chance", "cell"):
+        parser.add_argument("--" + name.replace("_", "-"), type=float, default=getattr(DEFAULT_LAYOUT, name),
+                            help=f"default {getattr(DEFAULT_LAYOUT, name):g}")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        try:
+            print(CourtMap.load(args.info).describe())
+        except (OSError, ValueError) as e:
+            print(e)
+            return 1
+        return 0
+    layout = DEFAULT_LAYOUT._replace(**{name: getattr(args, name) for name in DEFAULT_LAYOUT._fields
+                                        if name != "hoops"})
+    court = CourtMap(layout)
+    court.save(args.output)
+    print(f"Built in {court.build_time * 1000:.1f} ms: {court.describe()}")
+    print(f"Wrote {args.output} ({len(court.to_bytes()) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,818 @@
+import pygame
+import time
+import threading
+import io
+import wave
+import os
+from . import synth
+from .sound_cache import SoundCache
+from .sound_pack import SoundPack
+from .sound_registry import SoundRegistry
+from . import simulation
+from .simulation import TEAM_HOME, TICK_RATE, Inputs, MatchState, other_team
+from .court_map import ZONE_NAMES, CourtMap
+from . import netplay
+from .replay import ReplayRecorder
+from .play_log import MAX_TEAM_SIZE, BoxScore, PlayLogWriter
+from . import profiler
+from .profiler import FrameProfiler
+from .input_trace import InputTracer
+from . import speech
+from .speech import SpeechQueue
+from .spatial import SpatialAudio
+from . import voices
+from .voices import VoiceManager
+from . import ambience
+from .ambience import AmbienceStream, AmbienceSynth
+from .reverb import ReverbBank
+from .variants import VARIED_SOUNDS, VariantBank
+from .sound_watch import SoundWatcher
+from . import startup
+
+# ==================================================================================
+# CONFIGURATION & CONSTANTS
+# ==================================================================================
+FPS = 60
+# Most simulation ticks to run in one frame when catching up after a stall
+MAX_CATCHUP_TICKS = 4
+
+# ==================================================================================
+# AUDIO GENERATOR
+# ==================================================================================
+class AudioGenerator:
+    """Generates game sounds procedurally to avoid external assets."""
+    
+    @staticmethod
+    def load_sound(name, generator_func=None, cache=None):
+        """Loads a sound from 'sounds/{name}.ogg' or generates it if missing.
+
+        Without a generator_func the built-in recipe is used, read from `cache`
+        (a SoundCache) when one is given so a warm start skips synthesis.
+        """
+        path = os.path.join("sounds", f"{name}.ogg")
+        if os.path.exists(path):
+            try:
+                print(f"Loading custom sound: {path}")
+                return pygame.mixer.Sound(path)
+            except Exception as e:
+                print(f"Failed to load {path}, generating instead. Error: {e}")
+        
+        if generator_func:
+            return generator_func()
+        if cache:
+            return AudioGenerator._create_sound(cache.load(name))
+        return AudioGenerator.generate(name)
+
+    @staticmethod
+    def _create_sound(data, framerate=synth.SAMPLE_RATE):
+        """Wraps mono int16 PCM in a pygame Sound.
+
+        NumPy arrays are expanded to the mixer's channel count and handed over
+        as a raw buffer; byte strings from the pure-Python path go through an
+        in-memory WAV so pygame can convert them.
+        """
+        mixer_format = pygame.mixer.get_init()
+        if synth.np is not None and isinstance(data, synth.np.ndarray) and mixer_format \
+                and mixer_format[0] == framerate and mixer_format[1] == -16:
+            channels = mixer_format[2]
+            if channels > 1:
+                data = synth.np.repeat(data[:, None], channels, axis=1)
+            return pygame.mixer.Sound(buffer=synth.np.ascontiguousarray(data))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(framerate)
+            wav_file.writeframes(bytes(data))
+        
+        buffer.seek(0)
+        return pygame.mixer.Sound(buffer)
+
+    @staticmethod
+    def generate(name):
+        """Synthesizes the built-in fallback registered under `name` in synth.RECIPES."""
+        return AudioGenerator._create_sound(synth.render(name))
+
+    @staticmethod
+    def generate_tone(frequency, duration, volume=0.5):
+        return AudioGenerator._create_sound(synth.tone(frequency, duration, volume))
+
+    @staticmethod
+    def generate_noise(duration, volume=0.5, decay=False, pitch_shift=1.0):
+        return AudioGenerator._create_sound(synth.noise(duration, volume, decay, pitch_shift))
+
+    @staticmethod
+    def generate_dribble():
+        # Short, low thud
+        return AudioGenerator.generate('dribble')
+
+    @staticmethod
+    def generate_shoot():
+        # Whoosh sound
+        return AudioGenerator.generate('shoot')
+
+    @staticmethod
+    def generate_net_swish():
+        # Soft, longer noise (NBA style)
+        return AudioGenerator.generate('net_nba')
+
+    @staticmethod
+    def generate_net_chain():
+        # Metallic rattle - higher pitch noise bursts
+        return AudioGenerator.generate('net_chain')
+
+    @staticmethod
+    def generate_rim_clank():
+        # Sharp metallic hit
+        return AudioGenerator.generate('rim')
+
+    @staticmethod
+    def generate_buzzer():
+        # Loud square-ish wave
+        return AudioGenerator.generate('buzzer')
+
+    @staticmethod
+    def generate_beep():
+        # High pitch beep for 3pt line
+        return AudioGenerator.generate('beep')
+
+    @staticmethod
+    def generate_dunk():
+        # Loud heavy impact
+        return AudioGenerator.generate('dunk')
+
+    @staticmethod
+    def generate_menu_click():
+        # Short, crisp click (high frequency burst)
+        return AudioGenerator.generate('menuclick')
+
+    @staticmethod
+    def generate_menu_enter():
+        # Positive confirmation (ascending tones)
+        return AudioGenerator.generate('menuenter')
+
+# ==================================================================================
+# MENU SYSTEM
+# ==================================================================================
+class Menu:
+    def __init__(self, title, options, speaker, play_sound, on_select=None):
+        self.title = title
+        self.options = options # List of (label, callback)
+        self.speaker = speaker
+        self.play_sound = play_sound
+        self.current_index = 0
+        self.on_select_callback = on_select
+
+    def navigate(self, direction):
+        # direction: -1 for up, 1 for down
+        self.current_index = (self.current_index + direction) % len(self.options)
+        self.play_sound('menuclick')
+        self.speak_current()
+
+    def select(self):
+        label, callback = self.options[self.current_index]
+        self.play_sound('menuenter')
+        if callback:
+            callback()
+
+    def speak_current(self):
+        label, _ = self.options[self.current_index]
+        self.speaker.speak(label, interrupt=True)
+
+    def speak_title(self):
+        self.speaker.speak(f"{self.title}. Use Up and Down arrows to navigate, Enter to select.", interrupt=True)
+
+
+class Game:
+    def __init__(self, seed=None, record_path=None, speaker=None, profile_path=None,
+                 team_size=simulation.DEFAULT_TEAM_SIZE, server=None, trace_path=None, trace_input=False,
+                 input_polls=1, play_log_path=None, watch_sounds=False, court=None):
+        # Only the mixer starts here, for the sounds; the window opens in run()
+        startup.start_mixer()
+
+        # Speech is spoken on its own thread; the screen reader is created there too
+        self.speaker = SpeechQueue(speaker) if speaker else SpeechQueue(factory=startup.screen_reader)
+        self.voices = VoiceManager.for_mixer(pygame.mixer)
+        self.clock = pygame.time.Clock()
+
+        # Frame profiler, only when asked for; None keeps the loop free of it
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler(FPS) if profile_path else None
+
+        # Input latency tracing, likewise only when asked for; input_polls > 1
+        # handles key presses that many times a frame
+        self.trace_path = trace_path
+        self.tracer = InputTracer() if trace_path or trace_input else None
+        self.input_polls = max(1, input_polls)
+        self.running = False
+        self.frame_start = 0.0
+        
+        # Sounds load in the background; menu sounds first
+        self.startup_time = time.perf_counter()
+        # A fresh sound pack replaces both sounds/ and the synth cache
+        self.sound_pack = SoundPack.open_verified(pygame.mixer.get_init())
+        self.sound_cache = SoundCache() if self.sound_pack is None else None
+        self.sounds = SoundRegistry(
+            synth.RECIPES,
+            self.load_sound,
+            on_complete=self.on_sounds_loaded
+        )
+
+        self.state = "MENU"
+        self.mode = "PLAY" # PLAY or PRACTICE
+        self.match = None # simulation.MatchState while a game is running
+        self.team_size = team_size # Players a side
+        self.inputs = Inputs() # Human input waiting for the next tick
+        self.tick_accumulator = 0.0
+        self.spatial = SpatialAudio() # Listener follows the human player
+        self.ambience = None # AmbienceStream while a match is running
+        self.gym = None # Name of the gym being played in
+        self.court = court # court_map.CourtMap for local matches; None for the default court
+
+        # Network play: (host, port) of a netplay server; matches are played there
+        self.server = server
+        self.net = None # netplay.ClientThread while connected
+
+        # Variant pools for repeated effects, rendered once every sound has loaded
+        self.variants = VariantBank(
+            lambda name: self.sounds[name].get(),
+            self.load_sound_file,
+            pygame.sndarray.array,
+            lambda pcm: pygame.mixer.Sound(buffer=pcm),
+            exists=self.sound_file_exists
+        )
+
+        # Gym acoustics: the in-game sounds convolved per gym, in the background
+        self.reverb = ReverbBank(
+            synth.RECIPES,
+            lambda name: [pygame.sndarray.array(sound) for sound in self.variants.pool(name)],
+            lambda pcm: pygame.mixer.Sound(buffer=pcm)
+        )
+
+        # Hot reloading of sounds/, only when asked for; starts once the variants are built
+        self.sound_watcher = SoundWatcher("sounds", synth.RECIPES, self.decode_reload,
+                                          varied=VARIED_SOUNDS) if watch_sounds else None
+
+        # Replays
+        self.seed = seed
+        self.record_path = record_path
+        self.recorder = None
+        self.replays_saved = 0
+
+        # Play-by-play: a live box score for every local match, written out when asked for
+        self.play_log_path = play_log_path
+        self.play_log = None # play_log.PlayLogWriter for the current match
+        self.play_logs_saved = 0
+        self.box_score = None # play_log.BoxScore for the current match
+
+        # Gyms
+        self.gyms = [
+            ("The Iron Cage", "An underground industrial court with metal grating floors and dim lighting."),
+            ("Skyline Heights", "A rooftop court on a skyscraper, windy with a view of the neon city below."),
+            ("Neon Alley", "A narrow court tucked between two cyberpunk arcades, buzzing with electronic noise."),
+            ("The Hangar", "A massive abandoned aircraft hangar, echoing and vast.")
+        ]
+
+        # Menus
+        self.main_menu = Menu("Main Menu", [
+            ("Play Game", lambda: self.set_mode_and_advance("PLAY")),
+            ("Practice Mode", lambda: self.set_mode_and_advance("PRACTICE")),
+            ("Exit", lambda: self.quit_game())
+        ], self, self.play_sound)
+
+        self.gym_menu = Menu("Select Gym", [
+            (f"{gym[0]}: {gym[1]}", lambda i=i: self.set_gym_and_start(i)) for i, gym in enumerate(self.gyms)
+        ], self, self.play_sound)
+        
+        self.current_menu = self.main_menu
+
+    def load_sound(self, name):
+        """Runs on a loader thread: the sound from the pack, else from sounds/ or the synth."""
+        if self.sound_pack is not None:
+            pcm = self.sound_pack.load(name)
+            if pcm is not None:
+                return pygame.mixer.Sound(buffer=pcm)
+        return AudioGenerator.load_sound(name, cache=self.sound_cache)
+
+    def load_sound_file(self, path):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if self.sound_pack is not None:
+            pcm = self.sound_pack.load(name)
+            if pcm is not None:
+                return pygame.mixer.Sound(buffer=pcm)
+        return pygame.mixer.Sound(path)
+
+    def sound_file_exists(self, path):
+        if self.sound_pack is not None and self.sound_pack.has_file(os.path.splitext(os.path.basename(path))[0]):
+            return True
+        return os.path.exists(path)
+
+    def on_sounds_loaded(self, registry):
+        # Runs on a loader thread once every sound is ready
+        print("Sounds ready.")
+        if self.sound_cache is not None:
+            self.sound_cache.close()
+            self.sound_cache.report()
+        registry.report()
+        # On its own thread: the last sound's handle only resolves once this returns
+        threading.Thread(target=self.build_variants, name="variants", daemon=True).start()
+
+    def build_variants(self):
+        self.variants.build()
+        self.variants.report()
+        if self.sound_pack is not None:
+            # Every Sound has been copied out of the pack by now
+            self.sound_pack.report()
+            self.sound_pack.close()
+            self.sound_pack = None # Custom files come from sounds/ from here on
+        if self.sound_watcher is not None:
+            self.sound_watcher.start()
+
+    def decode_reload(self, name):
+        """Runs on the watcher thread: a changed sound and its variant pool, ready to swap in."""
+        path = os.path.join("sounds", f"{name}.ogg")
+        # A file that will not decode raises, keeping the old sound; a removed one is generated again
+        base = pygame.mixer.Sound(path) if os.path.exists(path) else AudioGenerator.generate(name)
+        pool = self.variants.rebuild(name, base) if name in self.variants.sizes else None
+        return base, pool
+
+    def apply_sound_reloads(self):
+        """Swaps in the sounds the watcher has finished reloading; never waits for one."""
+        for reload in self.sound_watcher.take():
+            if reload.error is None:
+                base, pool = reload.result
+                self.sounds.replace(reload.name, base)
+                if pool is not None:
+                    self.variants.swap(reload.name, *pool)
+                self.reverb.refresh(reload.name)
+            self.sound_watcher.swapped(reload)
+
+    def set_mode_and_advance(self, mode):
+        self.mode = mode
+        self.state = "GYM_SELECT"
+        self.current_menu = self.gym_menu
+        self.current_menu.speak_title()
+
+    def set_gym_and_start(self, gym_index):
+        gym_name, gym_desc = self.gyms[gym_index]
+        self.state = "GAME"
+        if self.server and self.mode == "PLAY":
+            # The server runs the match; it starts once the welcome arrives
+            self.speak(f"Selected {gym_name}. {gym_desc} Connecting to {self.server[0]}.")
+            self.net = netplay.ClientThread(*self.server)
+            self.match = None
+        else:
+            self.speak(f"Selected {gym_name}. {gym_desc} Starting game.")
+            self.match = MatchState(self.mode, seed=self.seed, team_size=self.team_size, court=self.court,
+                                    record_plays=True)
+            self.box_score = BoxScore(self.team_size)
+            if self.play_log_path:
+                self.play_log = PlayLogWriter(self.numbered(self.play_log_path, self.play_logs_saved),
+                                              self.match.seed, self.mode, self.team_size,
+                                              court=self.court.checksum() if self.court else 0)
+        self.spatial.table.build()
+        self.gym = gym_name
+        # This gym's acoustics first, then the rest so later switches are instant
+        for name, _ in [self.gyms[gym_index]] + self.gyms:
+            self.reverb.prepare(name)
+        self.start_ambience(gym_name)
+        self.inputs = Inputs()
+        self.tick_accumulator = 0.0
+        if self.record_path and self.net is None:
+            self.recorder = ReplayRecorder(self.match)
+
+    def start_ambience(self, gym_name):
+        self.stop_ambience()
+        if ambience.np is None:
+            return # Streaming ambience needs NumPy
+        synth = AmbienceSynth(gym_name, crowd=self.mode == "PLAY")
+        channel = self.voices.claim(voices.AMBIENCE)
+        self.ambience = AmbienceStream(synth, channel, lambda pcm: pygame.mixer.Sound(buffer=pcm))
+
+    def stop_ambience(self):
+        if self.ambience is None:
+            return
+        self.ambience.stop()
+        self.voices.release(self.ambience.channel)
+        print(self.ambience.report())
+        self.ambience = None
+
+    def update_ambience(self):
+        """Lets the crowd follow the match and keeps the next block queued."""
+        if self.ambience is None or self.match is None:
+            return
+        start = time.perf_counter() if self.profiler is not None else 0.0
+        self.ambience.synth.follow(self.match.score, self.match.time_remaining)
+        self.ambience.pump()
+        if self.profiler is not None:
+            self.profiler.add(profiler.MIXER, time.perf_counter() - start)
+
+    def quit_game(self):
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+    def speak(self, text, interrupt=True, priority=speech.NORMAL):
+        on_spoken = self.tracer.on_spoken(text) if self.tracer is not None else None
+        if self.profiler is not None:
+            start = time.perf_counter()
+            self.speaker.speak(text, interrupt=interrupt, priority=priority, on_spoken=on_spoken)
+            self.profiler.add(profiler.SPEECH, time.perf_counter() - start)
+        else:
+            self.speaker.speak(text, interrupt=interrupt, priority=priority, on_spoken=on_spoken)
+
+    def sound(self, sound_name):
+        """The Sound to play for `sound_name`: the next variant, with the gym's
+        acoustics once they are ready."""
+        index = self.variants.pick(sound_name)
+        if self.gym is not None:
+            bank = self.reverb.get(self.gym)
+            if bank is not None and sound_name in bank:
+                return bank[sound_name][index]
+        return self.variants.get(sound_name, index)
+
+    def play_sound(self, sound_name):
+        """Plays a sound unpanned, at full volume."""
+        if self.profiler is not None:
+            start = time.perf_counter()
+            channel = self.voices.play(sound_name, self.sound(sound_name))
+            self.profiler.add(profiler.MIXER, time.perf_counter() - start)
+        else:
+            channel = self.voices.play(sound_name, self.sound(sound_name))
+        if channel is not None and self.tracer is not None:
+            self.tracer.played(sound_name)
+
+    def speak_profile(self):
+        if self.profiler is None:
+            self.speak("Profiler is off. Start the game with --profile to enable it.")
+        else:
+            self.speak(self.profiler.summary())
+
+    def play_sound_panned(self, sound_name, x, y, source=None):
+        """Plays a sound from court position (x, y); with a source it follows it."""
+        if self.profiler is not None:
+            start = time.perf_counter()
+            self._play_sound_panned(sound_name, x, y, source)
+            self.profiler.add(profiler.MIXER, time.perf_counter() - start)
+        else:
+            self._play_sound_panned(sound_name, x, y, source)
+
+    def _play_sound_panned(self, sound_name, x, y, source):
+        sound = self.sound(sound_name)
+        left, right = self.spatial.gains(x, y, getattr(source, "z", None))
+        channel = self.voices.play(sound_name, sound, left, right, source)
+        if channel is not None and self.tracer is not None:
+            self.tracer.played(sound_name)
+        if channel is not None and source is not None:
+            self.spatial.track(channel, sound, source)
+
+    @staticmethod
+    def numbered(path, saved):
+        """`path` for the first file saved, then path-2, path-3 and so on."""
+        if not saved:
+            return path
+        root, ext = os.path.splitext(path)
+        return f"{root}-{saved + 1}{ext}"
+
+    def save_replay(self):
+        if not self.recorder:
+            return
+        path = self.numbered(self.record_path, self.replays_saved)
+        self.recorder.save(path, self.match)
+        self.recorder = None
+        self.replays_saved += 1
+        print(f"Replay saved to {path} (seed {self.match.seed})")
+
+    def close_play_log(self):
+        self.box_score = None
+        if self.play_log is None:
+            return
+        self.play_log.close()
+        print(self.play_log.report())
+        self.play_log = None
+        self.play_logs_saved += 1
+
+    def take_plays(self):
+        """Folds this tick's plays into the box score and hands them to the writer."""
+        plays = self.match.plays
+        if not plays:
+            return
+        self.box_score.extend(plays)
+        if self.play_log is not None:
+            self.play_log.write(plays)
+        plays.clear()
+
+    def advance(self, frame_seconds):
+        """Runs as many fixed simulation ticks as the elapsed frame time calls for."""
+        if self.net is not None:
+            self.advance_remote(frame_seconds)
+            return
+        tick = 1.0 / TICK_RATE
+        self.tick_accumulator = min(self.tick_accumulator + frame_seconds, MAX_CATCHUP_TICKS * tick)
+        while self.tick_accumulator >= tick and self.state == "GAME":
+            self.tick_accumulator -= tick
+            self.run_tick()
+        # Keep moving sources panned as they and the listener move
+        if self.match is not None:
+            self.spatial.listener.move(self.match.human.x, self.match.human.y)
+            self.spatial.update()
+
+    def run_tick(self):
+        if self.tracer is not None:
+            self.tracer.tick()
+        self.match, events = simulation.step(self.match, self.inputs, self.profiler)
+        if self.recorder:
+            self.recorder.record(self.inputs, self.match, events)
+        self.take_plays()
+        # Key presses count once; held movement carries over
+        self.inputs.shoot = False
+        self.inputs.pass_ball = False
+        self.dispatch(events)
+        if self.tracer is not None:
+            self.tracer.done()
+        if self.profiler is not None:
+            self.profiler.lap(profiler.OTHER)
+
+    def tick_early(self):
+        """With sub-frame input sampling, runs the tick a shoot or pass press
+        is waiting for straight away, borrowing at most one tick of time that
+        the next frames pay back."""
+        if self.input_polls == 1 or self.net is not None or self.match is None:
+            return
+        if self.tick_accumulator < 0:
+            return # Already a tick ahead
+        self.tick_accumulator -= 1.0 / TICK_RATE
+        self.run_tick()
+
+    def advance_remote(self, frame_seconds):
+        """Sends an input for every tick the frame covers and plays what the server sent back."""
+        net = self.net
+        if self.match is None:
+            if net.welcome is None:
+                if net.timed_out():
+                    self.speak(f"Could not reach the server at {self.server[0]}.")
+                    self.end_match()
+                return
+            self.match = netplay.RemoteMatch(net.welcome)
+            side = "home" if self.match.human.team == TEAM_HOME else "away"
+            print(f"Connected as player {net.welcome.number + 1} of {net.welcome.humans} ({side})")
+
+        tick = 1.0 / TICK_RATE
+        self.tick_accumulator = min(self.tick_accumulator + frame_seconds, MAX_CATCHUP_TICKS * tick)
+        while self.tick_accumulator >= tick:
+            self.tick_accumulator -= tick
+            net.send_input(self.inputs.to_mask())
+            self.inputs.shoot = False
+            self.inputs.pass_ball = False
+        self.dispatch(net.poll(self.match))
+        if self.match is not None:
+            self.spatial.listener.move(self.match.human.x, self.match.human.y)
+            self.spatial.update()
+
+    def leave_server(self):
+        if self.net is not None:
+            self.net.close()
+            self.net = None
+
+    def end_match(self):
+        """Back to the main menu."""
+        self.save_replay()
+        self.close_play_log()
+        self.leave_server()
+        self.state = "MENU"
+        self.match = None
+        self.gym = None
+        self.spatial.clear()
+        self.stop_ambience()
+        self.current_menu = self.main_menu
+        self.current_menu.speak_title()
+
+    def dispatch(self, events):
+        """Plays the sounds and speech produced by a simulation step, skipping
+        those meant for other players."""
+        human = self.match.human
+        self.spatial.listener.move(human.x, human.y)
+        for event in events:
+            if event.audience is not None and human not in event.audience:
+                continue
+            if event.kind == simulation.SOUND:
+                if event.x is None:
+                    self.play_sound(event.value)
+                else:
+                    self.play_sound_panned(event.value, event.x, event.y, event.source)
+            elif event.kind == simulation.SPEECH:
+                self.speak(event.value, priority=event.priority)
+            elif event.kind == simulation.GAME_OVER:
+                self.end_match()
+                return
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+
+        if event.type == pygame.KEYDOWN:
+            tracer = self.tracer
+            if tracer is not None:
+                action = self.key_action(event.key)
+                if action is not None:
+                    tracer.handled(action, event, deferred=action in ("shoot", "pass"))
+
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.key == pygame.K_f:
+                self.speak_profile()
+
+            if self.state in ["MENU", "GYM_SELECT"]:
+                if event.key == pygame.K_UP:
+                    self.current_menu.navigate(-1)
+                elif event.key == pygame.K_DOWN:
+                    self.current_menu.navigate(1)
+                elif event.key == pygame.K_RETURN:
+                    self.current_menu.select()
+
+            elif self.state == "GAME" and self.match is not None:
+                human = self.match.human
+                if event.key == pygame.K_s:
+                    score = self.match.score
+                    self.speak(f"Score: You {score[human.team]}, Opponent {score[other_team(human.team)]}")
+                elif event.key == pygame.K_t:
+                    if self.mode == "PLAY":
+                        mins = int(self.match.time_remaining // 60)
+                        secs = int(self.match.time_remaining % 60)
+                        self.speak(f"Time remaining: {mins} minutes {secs} seconds")
+                    else:
+                        self.speak("Unlimited time.")
+                elif event.key == pygame.K_n:
+                    # Hoop locator: distance and shot zone from the court map
+                    field = self.match.fields[human.team]
+                    zone = ZONE_NAMES[field.zone(human.x, human.y)]
+                    self.speak(f"Hoop distance {int(field.distance(human.x, human.y))}, {zone}")
+                    self.play_sound_panned('locator', *field.hoop)
+                elif event.key == pygame.K_b:
+                    if self.box_score is None:
+                        self.speak("No box score in network play.")
+                    else:
+                        self.speak(self.box_score.speech(human.number))
+                elif event.key == pygame.K_SPACE:
+                    self.inputs.shoot = True
+                    self.tick_early()
+                elif event.key == pygame.K_p:
+                    self.inputs.pass_ball = True
+                    self.tick_early()
+
+            if tracer is not None:
+                tracer.done()
+
+    def key_action(self, key):
+        """The traced action a key press stands for in the current state, or None."""
+        if key == pygame.K_f:
+            return "profile"
+        if self.state in ("MENU", "GYM_SELECT"):
+            return {pygame.K_UP: "menu", pygame.K_DOWN: "menu", pygame.K_RETURN: "select"}.get(key)
+        if self.state == "GAME":
+            return {pygame.K_s: "score", pygame.K_t: "time", pygame.K_n: "locator", pygame.K_b: "box",
+                    pygame.K_SPACE: "shoot", pygame.K_p: "pass"}.get(key)
+        return None
+
+    def poll_events(self):
+        events = pygame.event.get()
+        if self.tracer is not None:
+            self.tracer.polled()
+        for event in events:
+            self.handle_event(event)
+
+    def sample_input(self):
+        """Waits out the frame like clock.tick(FPS), handling input at
+        input_polls evenly spaced points in it. Returns the frame time in ms."""
+        period = 1.0 / FPS
+        for i in range(1, self.input_polls):
+            delay = self.frame_start + i * period / self.input_polls - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.poll_events()
+        delay = self.frame_start + period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.perf_counter()
+        dt = now - self.frame_start
+        self.frame_start = now
+        return dt * 1000
+
+    def run(self):
+        self.current_menu.speak_title()
+        startup.open_window()
+        print(f"Time to first speech: {(time.perf_counter() - self.startup_time) * 1000:.1f} ms")
+        
+        self.running = True
+        self.frame_start = time.perf_counter()
+        
+        while self.running:
+            dt = self.clock.tick(FPS) if self.input_polls == 1 else self.sample_input()
+            if self.profiler is not None:
+                self.profiler.begin_frame()
+            # Between frames, so no frame plays half an old sound set and half a new one
+            if self.sound_watcher is not None:
+                self.apply_sound_reloads()
+            
+            # Event Handling
+            self.poll_events()
+            if self.profiler is not None:
+                self.profiler.lap(profiler.EVENTS)
+
+            # Game Logic
+            if self.state == "GAME":
+                keys = pygame.key.get_pressed()
+                self.inputs.move_x = 0
+                self.inputs.move_y = 0
+                if keys[pygame.K_LEFT]: self.inputs.move_x = -1
+                if keys[pygame.K_RIGHT]: self.inputs.move_x = 1
+                if keys[pygame.K_UP]: self.inputs.move_y = -1
+                if keys[pygame.K_DOWN]: self.inputs.move_y = 1
+
+                self.advance(dt / 1000.0)
+                self.update_ambience()
+
+            if self.profiler is not None:
+                self.profiler.end_frame()
+
+        if self.match:
+            self.save_replay()
+        self.close_play_log()
+        self.leave_server()
+        if self.profiler is not None:
+            self.profiler.dump(self.profile_path)
+            print(f"Frame profile saved to {self.profile_path}: {self.profiler.summary()}")
+        if self.tracer is not None:
+            print(self.tracer.report())
+            if self.trace_path:
+                self.tracer.dump(self.trace_path)
+                print(f"Input trace saved to {self.trace_path}")
+        self.stop_ambience()
+        self.speaker.close()
+        print(startup.report())
+        print(self.speaker.report())
+        self.voices.report()
+        if self.sound_watcher is not None:
+            self.sound_watcher.stop()
+            self.sound_watcher.report()
+        self.reverb.shutdown()
+        self.sounds.shutdown()
+        pygame.quit()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="pro-sound-basketball", description="Pro Sound Basketball")
+    parser.add_argument("--seed", type=int,
+                        help=f"seed every match with this value, 0 to {simulation.SEED_LIMIT - 1}")
+    parser.add_argument("--record", metavar="PATH", help="save each match as a replay file")
+    parser.add_argument("--profile", metavar="PATH", nargs="?", const="profile.json",
+                        help="time every frame; F speaks a summary, the full trace is saved on exit")
+    parser.add_argument("--team-size", type=int, default=simulation.DEFAULT_TEAM_SIZE, metavar="N",
+                        help=f"players a side, 2 to {MAX_TEAM_SIZE} (default 2, for 2-on-2)")
+    parser.add_argument("--trace-input", metavar="PATH", nargs="?", const="input_trace.json",
+                        help="time each key press to the sound and speech it causes; report and trace on exit")
+    parser.add_argument("--input-polls", type=int, default=1, metavar="N",
+                        help="handle key presses N times a frame; shoot and pass then act at once")
+    parser.add_argument("--play-log", metavar="PATH",
+                        help="write each local match's play-by-play to PATH (PATH-2 and so on after the first)")
+    parser.add_argument("--watch-sounds", action="store_true",
+                        help="reload sounds/ files as they are saved, added or removed")
+    parser.add_argument("--court", metavar="PATH",
+                        help="play local matches on a court map built with python -m pro_sound_basketball.court_map")
+    parser.add_argument("--connect", metavar="HOST[:PORT]",
+                        help=f"play matches on a netplay server (default port {netplay.DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+    if not 2 <= args.team_size <= MAX_TEAM_SIZE:
+        parser.error(f"--team-size must be from 2 to {MAX_TEAM_SIZE}")
+    if args.seed is not None and not 0 <= args.seed < simulation.SEED_LIMIT:
+        parser.error(f"--seed must be from 0 to {simulation.SEED_LIMIT - 1}")
+    server = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":") if ":" in args.connect else (args.connect, "", "")
+        server = (host, int(port) if port else netplay.DEFAULT_PORT)
+    court = None
+    if args.court:
+        if server:
+            parser.error("--court is for local matches; netplay servers play the default court")
+        try:
+            court = CourtMap.load(args.court)
+        except (OSError, ValueError) as e:
+            parser.error(f"--court: {e}")
+        if len(court.fields) != 2:
+            parser.error(f"--court: {args.court} has {len(court.fields)} hoops, not 2")
+
+    try:
+        game = Game(seed=args.seed, record_path=args.record, profile_path=args.profile,
+                    team_size=args.team_size, server=server, trace_path=args.trace_input,
+                    input_polls=args.input_polls, play_log_path=args.play_log,
+                    watch_sounds=args.watch_sounds, court=court)
+        game.run()
+    except Exception as e:
+        with open("error.txt", "w") as f:
+            import traceback
+            traceback.print_exc(file=f)
+
+
+if __name__ == "__main__":
+    main()
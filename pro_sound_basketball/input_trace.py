@@ -0,0 +1,172 @@
+"""Input-to-audio latency tracing.
+
+Every traced key press becomes a KeyTrace stamped (perf_counter seconds) at
+each stage it reaches:
+
+  delivered  when the key event entered SDL's queue: the `injected_at`
+             attribute of a synthetic event, otherwise the previous event
+             poll (the earliest it can have arrived, so the estimate errs
+             long; pygame 2 does not expose SDL's own event timestamp)
+  handled    when the game acted on it
+  played     when the mixer play() for the sound it causes was issued
+  spoken     when the speech backend was called with what it causes
+
+Menu keys and hotkeys are answered while the key is handled. Shoot and pass
+only set the next tick's inputs, so their traces wait for that tick and
+only its matching outputs (ACTION_SOUNDS, ACTION_SPEECH) count. A press
+whose sound was never played (no ball, say) keeps just the stages it
+reached.
+
+report() gives latency percentiles from delivery to each later stage and
+a histogram of the time to the first thing heard, per action.
+"""
+import json
+import time
+from collections import deque
+
+from .profiler import percentile
+
+# Sounds and speech a deferred action causes on its tick; None accepts anything
+ACTION_SOUNDS = {"shoot": ("shoot",), "pass": ("shoot",)}
+ACTION_SPEECH = {"shoot": (), "pass": ("Pass to teammate",)}
+
+STAGES = ("handled", "played", "spoken")
+HISTOGRAM_MS = (1, 2, 4, 8, 16, 24, 33, 50, 100) # Bucket upper edges; one more bucket above
+DEFAULT_CAPACITY = 4096
+
+
+class KeyTrace:
+    __slots__ = ("action", "delivered", "estimated", "handled", "played", "spoken")
+
+    def __init__(self, action, delivered, estimated, handled):
+        self.action = action
+        self.delivered = delivered
+        self.estimated = estimated # Delivery time is the previous poll, not a real stamp
+        self.handled = handled
+        self.played = None
+        self.spoken = None
+
+    def heard(self):
+        """Time of the first output, or None."""
+        stamps = [t for t in (self.played, self.spoken) if t is not None]
+        return min(stamps) if stamps else None
+
+    def to_json(self):
+        def ms(stamp):
+            return None if stamp is None else round((stamp - self.delivered) * 1000, 3)
+        return {"action": self.action, "estimated": self.estimated,
+                "handled_ms": ms(self.handled), "played_ms": ms(self.played), "spoken_ms": ms(self.spoken)}
+
+
+class InputTracer:
+    def __init__(self, clock=time.perf_counter, capacity=DEFAULT_CAPACITY):
+        self.clock = clock
+        self.traces = deque(maxlen=capacity)
+        self.current = ()    # Traces that outputs produced right now belong to
+        self.waiting = []    # Shoot and pass presses for the next tick
+        self._last_poll = None
+        self._poll = None
+
+    # ------------------------------------------------------------------ stamping
+    def polled(self):
+        """Call right after each pygame.event.get()."""
+        self._last_poll = self._poll
+        self._poll = self.clock()
+
+    def _delivered(self, event):
+        injected = getattr(event, "injected_at", None)
+        if injected is not None:
+            return injected, False
+        earliest = self._last_poll if self._last_poll is not None else self._poll
+        return (earliest if earliest is not None else self.clock()), True
+
+    def handled(self, action, event, deferred=False):
+        """Starts the trace of a key press the game is acting on now. Outputs
+        until done() are its own; a deferred one waits for tick()."""
+        delivered, estimated = self._delivered(event)
+        trace = KeyTrace(action, delivered, estimated, self.clock())
+        self.traces.append(trace)
+        if deferred:
+            self.waiting.append(trace)
+        else:
+            self.current = (trace,)
+        return trace
+
+    def tick(self):
+        """A simulation tick is about to run: the waiting presses get its outputs until done()."""
+        self.current = tuple(self.waiting)
+        self.waiting = []
+
+    def done(self):
+        self.current = ()
+
+    def played(self, name):
+        if not self.current:
+            return
+        now = self.clock()
+        for trace in self.current:
+            sounds = ACTION_SOUNDS.get(trace.action)
+            if trace.played is None and (sounds is None or name in sounds):
+                trace.played = now
+
+    def on_spoken(self, text):
+        """A callback for SpeechQueue.speak that stamps the matching traces, or None."""
+        traces = []
+        for trace in self.current:
+            lines = ACTION_SPEECH.get(trace.action)
+            if trace.spoken is None and (lines is None or text in lines):
+                traces.append(trace)
+        if not traces:
+            return None
+
+        def spoken(when):
+            for trace in traces:
+                if trace.spoken is None:
+                    trace.spoken = when
+        return spoken
+
+    # ------------------------------------------------------------------ reporting
+    def stats(self):
+        """Per action: count, estimated deliveries, stage percentiles in ms and
+        the percentiles and histogram of time to first output ("heard")."""
+        result = {}
+        for action in sorted({t.action for t in self.traces}):
+            traces = [t for t in self.traces if t.action == action]
+            entry = {"count": len(traces), "estimated": sum(t.estimated for t in traces)}
+            for stage in STAGES:
+                values = sorted((getattr(t, stage) - t.delivered) * 1000 for t in traces
+                                if getattr(t, stage) is not None)
+                entry[stage] = {"count": len(values), "p50": percentile(values, 0.50),
+                                "p95": percentile(values, 0.95), "max": values[-1] if values else 0.0}
+            heard = sorted((t.heard() - t.delivered) * 1000 for t in traces if t.heard() is not None)
+            entry["heard"] = {"count": len(heard), "p50": percentile(heard, 0.50),
+                              "p95": percentile(heard, 0.95), "max": heard[-1] if heard else 0.0}
+            histogram = [0] * (len(HISTOGRAM_MS) + 1)
+            for ms in heard:
+                bucket = next((i for i, edge in enumerate(HISTOGRAM_MS) if ms <= edge), len(HISTOGRAM_MS))
+                histogram[bucket] += 1
+            entry["heard_histogram"] = histogram
+            result[action] = entry
+        return result
+
+    def report(self):
+        lines = ["Input latency (ms from key delivery):"]
+        labels = [f"<={edge}" for edge in HISTOGRAM_MS] + [f">{HISTOGRAM_MS[-1]}"]
+        for action, entry in self.stats().items():
+            stages = "; ".join(f"{stage} p50 {entry[stage]['p50']:.1f} p95 {entry[stage]['p95']:.1f} "
+                               f"max {entry[stage]['max']:.1f} ({entry[stage]['count']})"
+                               for stage in STAGES if entry[stage]["count"])
+            estimated = f", {entry['estimated']} delivery estimated" if entry["estimated"] else ""
+            lines.append(f"  {action}: {entry['count']} presses{estimated}; {stages}")
+            histogram = "  ".join(f"{label}:{n}" for label, n in zip(labels, entry["heard_histogram"]) if n)
+            if histogram:
+                lines.append(f"    first heard  {histogram}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "histogram_edges_ms": list(HISTOGRAM_MS),
+                "stats_ms": self.stats(),
+                "traces": [t.to_json() for t in self.traces],
+            }, f)
@@ -0,0 +1,865 @@
+"""Networked matches: an authoritative asyncio server and its clients.
+
+One process runs the match (serve) and every player runs the game with
+--connect. Everything travels over UDP:
+
+  - a client sends its input bitmask (simulation.Inputs.to_mask) once per
+    tick and repeats the last INPUT_REDUNDANCY of them in every packet, so
+    a lost packet costs nothing; the server applies every key press it has
+    not seen yet and the latest movement
+  - the server steps the match at TICK_RATE and sends each client a
+    snapshot per tick: the state as integer fields, delta-compressed
+    against the last snapshot that client acknowledged (a bitmask of the
+    changed fields, then a zigzag varint per change), so a lost snapshot is
+    simply superseded by the next one
+  - sounds and speech ride along as numbered events. Each client only gets
+    the events its player should hear, and they are repeated until
+    acknowledged; the client hands them over once each, in order, and
+    skips a sound that arrives more than STALE_SOUND seconds after it
+    happened rather than play it out of step with the game.
+
+Event positions are court positions: every client pans them around its own
+player. Both ends count what they send and receive, the server times its
+ticks and the client times each input until the snapshot that includes it
+comes back.
+
+    python -m pro_sound_basketball.netplay serve [--humans 2] [--port 47800] [--team-size 2]
+    python -m pro_sound_basketball.netplay loopback [--clients 4] [--latency 40] [--jitter 10] [--loss 0.05]
+
+loopback plays a short match between a server and headless bot clients on
+localhost, delaying and dropping packets both ways, and checks that every
+client ended with the server's state and got each of its events once.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+from . import simulation
+from .simulation import GAME_OVER, SOUND, SPEECH, TEAM_AWAY, TEAM_HOME, TICK_RATE, Event, Inputs, MatchState
+
+MAGIC = b"PSBN"
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 47800
+
+# Packet types
+HELLO = 1     # client -> server: join
+WELCOME = 2   # server -> client: your player
+INPUT = 3     # client -> server: inputs and acknowledgements
+SNAPSHOT = 4  # server -> client: state and events
+BYE = 5       # client -> server: leaving
+
+INPUT_REDUNDANCY = 8  # Input masks repeated in every input packet
+HISTORY = 64          # Snapshots kept as delta baselines
+MAX_EVENTS = 24       # Unacknowledged events per snapshot, oldest first
+STALE_SOUND = 0.25    # Seconds late after which a sound is skipped
+CLIENT_TIMEOUT = 5.0  # Seconds of silence before a client is dropped
+CONNECT_TIMEOUT = 5.0 # Seconds a client waits for its welcome
+LOBBY_RATE = 10       # Snapshots per second while waiting for players
+HELLO_INTERVAL = 0.25
+FINAL_LINGER = 1.0    # Seconds the server keeps sending once the match is over
+MAX_BEHIND = 0.25     # Seconds behind schedule after which the server stops catching up
+NO_BASELINE = 0xFFFFFFFF
+
+MOVE_BITS = simulation.INPUT_LEFT | simulation.INPUT_RIGHT | simulation.INPUT_UP | simulation.INPUT_DOWN
+PRESS_BITS = simulation.INPUT_SHOOT | simulation.INPUT_PASS
+
+MODES = (simulation.MODE_PLAY, simulation.MODE_PRACTICE)
+KINDS = (SOUND, SPEECH, GAME_OVER)
+POSITIONED = 0x80 # Kind flag: the event has x and y
+SOURCE_NONE = 0
+SOURCE_BALL = 1   # Players are 2 + their index in state.players
+
+_PACKET = struct.Struct("<4sB")        # magic, type
+_HELLO = struct.Struct("<B")           # protocol version
+_WELCOME = struct.Struct("<BBBBB")     # human number, player index, humans, team size, mode
+_INPUT = struct.Struct("<IIIB")        # acked snapshot, acked event, newest input seq, mask count
+_SNAPSHOT = struct.Struct("<IIIB")     # tick, baseline tick, newest input seq applied, event count
+_SEQ = struct.Struct("<I")             # event sequence number, per client
+_EVENT = struct.Struct("<IBBBhhH")     # tick, kind, priority, source, x, y, value length; then the value
+
+# Snapshot flags field
+FLAG_OVER = 1
+FLAG_DEAD_BALL = 2
+FLAG_IN_AIR = 4
+# Fields before the players' (x, y) pairs
+HOME_SCORE, AWAY_SCORE, TIME_REMAINING, FLAGS, OWNER, BALL_X, BALL_Y, BALL_Z = range(8)
+HEADER_FIELDS = 8
+
+# Network conditions the loopback harness simulates; latency and jitter in seconds, one way
+Impairment = namedtuple("Impairment", ["latency", "jitter", "loss", "seed"])
+Impairment.__new__.__defaults__ = (0.0, 0.0, 0.0, None)
+
+Welcome = namedtuple("Welcome", ["number", "player", "humans", "team_size", "mode"])
+
+
+# ==================================================================================
+# ENCODING
+# ==================================================================================
+def _put_varint(out, value):
+    value = (value << 1) ^ (value >> 31) # Zigzag: small magnitudes either way take one byte
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (value >> 1) ^ -(value & 1), offset
+        shift += 7
+
+
+def snapshot_fields(state):
+    """The match as a list of ints: HEADER_FIELDS, then x and y per player."""
+    ball = state.ball
+    flags = (FLAG_OVER if state.over else 0) | (FLAG_DEAD_BALL if state.dead_ball else 0) \
+        | (FLAG_IN_AIR if ball.in_air else 0)
+    owner = state.players.index(ball.owner) + 1 if ball.owner is not None else 0
+    fields = [state.score[TEAM_HOME], state.score[TEAM_AWAY], int(state.time_remaining), flags, owner,
+              round(ball.x), round(ball.y), round(ball.z)]
+    for p in state.players:
+        fields.append(round(p.x))
+        fields.append(round(p.y))
+    return fields
+
+
+def encode_delta(fields, baseline):
+    """Bitmask of the fields that differ from `baseline` (None: all of them),
+    then each difference as a zigzag varint."""
+    if baseline is None:
+        baseline = [0] * len(fields)
+    mask = bytearray((len(fields) + 7) // 8)
+    values = bytearray()
+    for i, (value, base) in enumerate(zip(fields, baseline)):
+        if value != base:
+            mask[i >> 3] |= 1 << (i & 7)
+            _put_varint(values, value - base)
+    return bytes(mask) + bytes(values)
+
+
+def decode_delta(data, offset, baseline, count):
+    """Inverse of encode_delta; returns (fields, offset past them)."""
+    fields = list(baseline) if baseline is not None else [0] * count
+    mask_end = offset + (count + 7) // 8
+    mask = data[offset:mask_end]
+    offset = mask_end
+    for i in range(count):
+        if mask[i >> 3] & (1 << (i & 7)):
+            delta, offset = _get_varint(data, offset)
+            fields[i] += delta
+    return fields, offset
+
+
+def source_id(state, source):
+    if source is None:
+        return SOURCE_NONE
+    if source is state.ball:
+        return SOURCE_BALL
+    return 2 + state.players.index(source)
+
+
+def _clamp16(value):
+    # Practice has no clock, so a player can walk as far as they like
+    return -32768 if value < -32768 else 32767 if value > 32767 else round(value)
+
+
+def encode_event(state, tick, event):
+    """An event without its sequence number, which differs per client.
+    Positions are clamped to 16 bits; that far out, every pan is the same."""
+    kind = KINDS.index(event.kind)
+    x = y = 0
+    if event.x is not None:
+        kind |= POSITIONED
+        x, y = _clamp16(event.x), _clamp16(event.y)
+    value = (event.value or "").encode("utf-8")[:0xFFFF]
+    return _EVENT.pack(tick, kind, event.priority, source_id(state, event.source), x, y, len(value)) + value
+
+
+def decode_event(data, offset):
+    """(seq, tick, Event with an integer source id, offset past it)."""
+    seq, = _SEQ.unpack_from(data, offset)
+    tick, kind, priority, source, x, y, length = _EVENT.unpack_from(data, offset + _SEQ.size)
+    offset += _SEQ.size + _EVENT.size
+    value = bytes(data[offset:offset + length]).decode("utf-8") or None
+    offset += length
+    if not kind & POSITIONED:
+        x = y = None
+    return seq, tick, Event(KINDS[kind & ~POSITIONED], value, x, y, source, priority), offset
+
+
+def _packet(kind, body):
+    return _PACKET.pack(MAGIC, kind) + body
+
+
+def _parse(data):
+    if len(data) < _PACKET.size:
+        return None, None
+    magic, kind = _PACKET.unpack_from(data)
+    if magic != MAGIC:
+        return None, None
+    return kind, _PACKET.size
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# ==================================================================================
+# SIMULATED NETWORK
+# ==================================================================================
+class LossyLink:
+    """Wraps a datagram transport, delaying (with jitter, so packets reorder)
+    and dropping what is sent through it."""
+
+    def __init__(self, transport, impairment):
+        self.transport = transport
+        self.latency = impairment.latency
+        self.jitter = impairment.jitter
+        self.loss = impairment.loss
+        self.rng = random.Random(impairment.seed)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+
+    def sendto(self, data, address=None):
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        self.loop.call_later(delay, self._send, data, address)
+
+    def _send(self, data, address):
+        if not self.transport.is_closing():
+            self.transport.sendto(data, address)
+
+
+def _link(transport, impairment):
+    return transport if impairment is None else LossyLink(transport, impairment)
+
+
+# ==================================================================================
+# SERVER
+# ==================================================================================
+class ClientSlot:
+    """The server's view of one client."""
+
+    def __init__(self, address, number, player, now):
+        self.address = address
+        self.number = number # Index into state.humans
+        self.player = player
+        self.movement = 0    # Latest movement bits
+        self.presses = 0     # Key presses not yet applied
+        self.input_seq = 0   # Newest input received
+        self.acked_tick = NO_BASELINE
+        self.events = deque() # [seq, body, times sent], oldest first
+        self.event_seq = 0
+        self.last_heard = now
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.snapshots = 0
+        self.resent = 0
+
+    def queue(self, body):
+        self.event_seq += 1
+        self.events.append([self.event_seq, body, 0])
+
+    def acknowledge(self, tick, event_seq):
+        if tick != NO_BASELINE and (self.acked_tick == NO_BASELINE or tick > self.acked_tick):
+            self.acked_tick = tick
+        while self.events and self.events[0][0] <= event_seq:
+            self.events.popleft()
+
+
+class MatchServer(asyncio.DatagramProtocol):
+    """Runs one match for `humans` clients; run() returns when it is over.
+
+    The match starts as soon as everyone has joined. `match_length`
+    overrides simulation.MATCH_LENGTH (in seconds); `impairment` delays and
+    drops everything the server sends.
+    """
+
+    def __init__(self, humans=2, mode=simulation.MODE_PLAY, seed=None, team_size=simulation.DEFAULT_TEAM_SIZE,
+                 match_length=None, impairment=None):
+        self.state = MatchState(mode, seed=seed, team_size=team_size, humans=humans)
+        if match_length is not None:
+            self.state.time_remaining = match_length
+        self.humans = humans
+        self.impairment = impairment
+        self.transport = None
+        self.link = None
+        self.clients = {}   # address -> ClientSlot
+        self.started = False
+        self.finished = False
+        self.tick = 0       # Snapshot number; state.tick stops during dead balls
+        self.history = {}   # tick -> fields
+        self.fields = snapshot_fields(self.state)
+        self.history[0] = self.fields
+
+        self.tick_times = [] # Seconds spent in each tick
+        self.lateness = []   # Seconds each tick started behind schedule
+        self.departed = []   # Slots of clients that left, for the report
+
+    # ------------------------------------------------------------------ transport
+    def connection_made(self, transport):
+        self.transport = transport
+        self.link = _link(transport, self.impairment)
+
+    def datagram_received(self, data, address):
+        kind, offset = _parse(data)
+        if kind is None:
+            return
+        slot = self.clients.get(address)
+        now = time.perf_counter()
+        if slot is not None:
+            slot.bytes_in += len(data)
+            slot.last_heard = now
+
+        if kind == HELLO:
+            if len(data) < offset + _HELLO.size or _HELLO.unpack_from(data, offset)[0] != PROTOCOL_VERSION:
+                return
+            if slot is None:
+                if self.started or len(self.clients) >= self.humans:
+                    return
+                slot = self.join(address, now)
+            self.send_welcome(slot)
+        elif kind == INPUT and slot is not None:
+            self.receive_input(slot, data, offset)
+        elif kind == BYE and slot is not None:
+            self.leave(slot, "left")
+
+    def join(self, address, now):
+        taken = {slot.number for slot in self.clients.values()}
+        number = min(n for n in range(self.humans) if n not in taken)
+        player = self.state.humans[number]
+        slot = ClientSlot(address, number, player, now)
+        self.clients[address] = slot
+        side = "home" if player.team == TEAM_HOME else "away"
+        waiting = self.humans - len(self.clients)
+        print(f"Player {number + 1} joined from {address[0]}:{address[1]} ({side})")
+        self.queue_speech(f"You are on the {side} team." + (f" Waiting for {waiting} more." if waiting else ""), slot)
+        return slot
+
+    def leave(self, slot, why):
+        print(f"Player {slot.number + 1} {why}")
+        del self.clients[slot.address]
+        self.departed.append(slot)
+
+    def send_welcome(self, slot):
+        state = self.state
+        body = _WELCOME.pack(slot.number, state.players.index(slot.player), self.humans, state.team_size,
+                             MODES.index(state.mode))
+        self.send(slot, _packet(WELCOME, body))
+
+    def receive_input(self, slot, data, offset):
+        if len(data) < offset + _INPUT.size:
+            return
+        acked_tick, acked_event, newest, count = _INPUT.unpack_from(data, offset)
+        masks = data[offset + _INPUT.size:offset + _INPUT.size + count]
+        slot.acknowledge(acked_tick, acked_event)
+        if newest <= slot.input_seq:
+            return # Nothing new: a late or duplicated packet
+        first = newest - len(masks) + 1
+        for seq, mask in enumerate(masks, first):
+            if seq > slot.input_seq:
+                slot.presses |= mask & PRESS_BITS
+        slot.movement = masks[-1] & MOVE_BITS if masks else 0
+        slot.input_seq = newest
+
+    def send(self, slot, packet):
+        slot.bytes_out += len(packet)
+        self.link.sendto(packet, slot.address)
+
+    # ------------------------------------------------------------------ match
+    def queue_speech(self, text, slot=None):
+        body = encode_event(self.state, self.tick, Event(SPEECH, text))
+        for s in self.clients.values() if slot is None else (slot,):
+            s.queue(body)
+
+    def step(self):
+        """Runs one tick with everyone's latest inputs and queues its events."""
+        by_number = {slot.number: slot for slot in self.clients.values()}
+        controls = []
+        for number in range(self.humans):
+            slot = by_number.get(number)
+            if slot is None:
+                controls.append(Inputs()) # Gone: the player stands still
+                continue
+            controls.append(Inputs.from_mask(slot.movement | slot.presses))
+            slot.presses = 0
+
+        state, events = simulation.step(self.state, controls)
+        self.tick += 1
+        for event in events:
+            body = encode_event(state, self.tick, event)
+            for slot in self.clients.values():
+                if event.audience is None or slot.player in event.audience:
+                    slot.queue(body)
+            if event.kind == GAME_OVER:
+                self.finished = True
+
+        self.fields = snapshot_fields(state)
+        self.history[self.tick] = self.fields
+        self.history.pop(self.tick - HISTORY, None)
+
+    def broadcast(self):
+        for slot in self.clients.values():
+            baseline = self.history.get(slot.acked_tick)
+            pending = list(itertools.islice(slot.events, MAX_EVENTS))
+            parts = [_SNAPSHOT.pack(self.tick, slot.acked_tick if baseline is not None else NO_BASELINE,
+                                    slot.input_seq, len(pending)),
+                     encode_delta(self.fields, baseline)]
+            for entry in pending:
+                seq, body, sent = entry
+                parts.append(_SEQ.pack(seq) + body)
+                if sent:
+                    slot.resent += 1
+                entry[2] = sent + 1
+            self.send(slot, _packet(SNAPSHOT, b"".join(parts)))
+            slot.snapshots += 1
+
+    def drop_silent(self):
+        now = time.perf_counter()
+        for slot in list(self.clients.values()):
+            if now - slot.last_heard > CLIENT_TIMEOUT:
+                self.leave(slot, "timed out")
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        print(f"Waiting for {self.humans} players...")
+        while len(self.clients) < self.humans:
+            self.broadcast()
+            await asyncio.sleep(1 / LOBBY_RATE)
+            self.drop_silent()
+        self.started = True
+        for slot in self.clients.values():
+            slot.presses = 0 # Nothing pressed in the lobby carries into the match
+        self.queue_speech("All players in. Tip off!")
+        print("Match started.")
+
+        period = 1 / TICK_RATE
+        next_tick = loop.time()
+        while not self.finished and self.clients:
+            next_tick += period
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -MAX_BEHIND:
+                next_tick = loop.time() # Stalled; do not try to catch up all at once
+            self.lateness.append(max(0.0, loop.time() - next_tick))
+            start = time.perf_counter()
+            self.step()
+            self.broadcast()
+            self.tick_times.append(time.perf_counter() - start)
+            if self.tick % TICK_RATE == 0:
+                self.drop_silent()
+
+        # Keep the final state and the last events coming until they are acknowledged
+        linger_until = loop.time() + FINAL_LINGER
+        while loop.time() < linger_until and any(s.events or s.acked_tick != self.tick for s in self.clients.values()):
+            await asyncio.sleep(period)
+            self.broadcast()
+        print(self.report())
+
+    def report(self):
+        seconds = max(self.tick, 1) / TICK_RATE
+        lines = [f"Server: {self.tick} ticks; tick time p50 {percentile(self.tick_times, 0.5) * 1e6:.0f} us, "
+                 f"p99 {percentile(self.tick_times, 0.99) * 1e6:.0f} us; "
+                 f"started late p99 {percentile(self.lateness, 0.99) * 1000:.1f} ms"]
+        for slot in sorted(list(self.clients.values()) + self.departed, key=lambda s: s.number):
+            lines.append(f"  player {slot.number + 1}: down {slot.bytes_out * 8 / seconds / 1000:.1f} kbit/s "
+                         f"({slot.bytes_out / max(slot.snapshots, 1):.0f} bytes a snapshot), "
+                         f"up {slot.bytes_in * 8 / seconds / 1000:.1f} kbit/s, {slot.resent} events resent")
+        if isinstance(self.link, LossyLink):
+            lines.append(f"  simulated loss dropped {self.link.dropped} server packets")
+        return "\n".join(lines)
+
+
+# ==================================================================================
+# CLIENT
+# ==================================================================================
+class MatchClient(asyncio.DatagramProtocol):
+    """One player's connection. Sends inputs, rebuilds the match from
+    snapshots and queues events for take(), each once and in order.
+
+    Runs on an event loop; send_input() and take() may be called from
+    another thread through ClientThread.
+    """
+
+    def __init__(self, impairment=None):
+        self.impairment = impairment
+        self.transport = None
+        self.link = None
+        self.welcome = None       # Welcome once the server has answered
+        self.connected = asyncio.Event()
+        self.lock = threading.Lock()
+
+        self.snapshots = {}       # tick -> fields, the delta baselines
+        self.tick = NO_BASELINE   # Newest snapshot
+        self.fields = None
+        self.next_event = 1       # Sequence number of the next event to hand over
+        self.held = {}            # seq -> (tick, Event) that arrived early
+        self.ready = []           # Events for take()
+
+        self.input_seq = 0
+        self.recent = deque(maxlen=INPUT_REDUNDANCY)
+        self.sent_at = {}         # input seq -> perf_counter when sent
+        self.latencies = []       # Seconds from sending an input to its snapshot
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.first_heard = None   # perf_counter of the first and the latest packet
+        self.last_heard = None
+        self.received = 0
+        self.out_of_order = 0     # Snapshots older than one already applied
+        self.duplicates = 0       # Events received again after being handed over
+        self.stale = 0            # Sounds skipped for arriving too late
+        self.delivered = 0
+        self._hello_task = None
+
+    # ------------------------------------------------------------------ transport
+    def connection_made(self, transport):
+        self.transport = transport
+        self.link = _link(transport, self.impairment)
+        self._hello_task = asyncio.ensure_future(self._hello())
+
+    async def _hello(self):
+        packet = _packet(HELLO, _HELLO.pack(PROTOCOL_VERSION))
+        while self.welcome is None:
+            self._send(packet)
+            await asyncio.sleep(HELLO_INTERVAL)
+
+    def _send(self, packet):
+        self.bytes_out += len(packet)
+        self.link.sendto(packet)
+
+    def datagram_received(self, data, address):
+        kind, offset = _parse(data)
+        if kind is None:
+            return
+        self.bytes_in += len(data)
+        self.last_heard = time.perf_counter()
+        if self.first_heard is None:
+            self.first_heard = self.last_heard
+        if kind == WELCOME and self.welcome is None:
+            number, player, humans, team_size, mode = _WELCOME.unpack_from(data, offset)
+            self.welcome = Welcome(number, player, humans, team_size, MODES[mode])
+            self.connected.set()
+        elif kind == SNAPSHOT and self.welcome is not None:
+            self.receive_snapshot(data, offset)
+
+    def receive_snapshot(self, data, offset):
+        tick, baseline_tick, input_seq, event_count = _SNAPSHOT.unpack_from(data, offset)
+        offset += _SNAPSHOT.size
+        count = HEADER_FIELDS + 4 * self.welcome.team_size
+        if baseline_tick == NO_BASELINE:
+            baseline = None
+        else:
+            baseline = self.snapshots.get(baseline_tick)
+            if baseline is None:
+                return # Its baseline has been forgotten; a newer snapshot will follow
+        fields, offset = decode_delta(data, offset, baseline, count)
+        self.received += 1
+
+        now = time.perf_counter()
+        sent = self.sent_at.pop(input_seq, None)
+        if sent is not None:
+            self.latencies.append(now - sent)
+            for seq in [s for s in self.sent_at if s < input_seq]:
+                del self.sent_at[seq]
+
+        with self.lock:
+            self.snapshots[tick] = fields
+            self.snapshots.pop(tick - HISTORY, None)
+            if self.tick == NO_BASELINE or tick >= self.tick:
+                self.tick = tick
+                self.fields = fields
+            else:
+                self.out_of_order += 1
+            for _ in range(event_count):
+                seq, event_tick, event, offset = decode_event(data, offset)
+                if seq < self.next_event or seq in self.held:
+                    self.duplicates += 1
+                    continue
+                self.held[seq] = (event_tick, event)
+            self._release()
+
+    def _release(self):
+        """Moves held events that are next in line to the ready list."""
+        late = STALE_SOUND * TICK_RATE
+        while self.next_event in self.held:
+            event_tick, event = self.held.pop(self.next_event)
+            self.next_event += 1
+            if event.kind == SOUND and self.tick - event_tick > late:
+                self.stale += 1
+                continue
+            self.ready.append(event)
+            self.delivered += 1
+
+    # ------------------------------------------------------------------ game side
+    def send_input(self, mask):
+        """Sends this tick's input mask, with the ones before it and the acknowledgements."""
+        self.input_seq += 1
+        self.recent.append(mask)
+        self.sent_at[self.input_seq] = time.perf_counter()
+        body = _INPUT.pack(self.tick, self.next_event - 1, self.input_seq, len(self.recent)) + bytes(self.recent)
+        self._send(_packet(INPUT, body))
+
+    def take(self):
+        """(newest snapshot tick, its fields, events since the last call)."""
+        with self.lock:
+            events, self.ready = self.ready, []
+            return self.tick, self.fields, events
+
+    def close(self):
+        if self._hello_task is not None:
+            self._hello_task.cancel()
+        if self.transport is not None and not self.transport.is_closing():
+            if self.welcome is not None:
+                self.transport.sendto(_packet(BYE, b""))
+            self.transport.close()
+
+    def report(self):
+        seconds = max(self.last_heard - self.first_heard, 1e-3) if self.first_heard is not None else 1.0
+        latency = [s * 1000 for s in self.latencies]
+        return (f"Network: {self.received} snapshots, down {self.bytes_in * 8 / seconds / 1000:.1f} kbit/s, "
+                f"up {self.bytes_out * 8 / seconds / 1000:.1f} kbit/s; input latency p50 "
+                f"{percentile(latency, 0.5):.0f} ms, p95 {percentile(latency, 0.95):.0f} ms; "
+                f"{self.delivered} events, {self.duplicates} repeats ignored, {self.stale} late sounds skipped")
+
+
+class RemoteEntity:
+    """A player or the ball as last reported by the server."""
+
+    __slots__ = ("team", "x", "y", "z", "has_ball")
+
+    def __init__(self, team=None):
+        self.team = team
+        self.x = 0
+        self.y = 0
+        self.z = None
+        self.has_ball = False
+
+
+class RemoteMatch:
+    """A client's copy of the match, with the attributes of a MatchState the
+    frontend reads: players, ball, human, fields, score, time_remaining, mode."""
+
+    def __init__(self, welcome):
+        self.mode = welcome.mode
+        self.team_size = welcome.team_size
+        self.players = [RemoteEntity(TEAM_HOME if i < welcome.team_size else TEAM_AWAY)
+                        for i in range(2 * welcome.team_size)]
+        self.ball = RemoteEntity()
+        self.human = self.players[welcome.player]
+        self.fields = simulation.team_fields(simulation.default_court()) # Servers play the default court
+        self.score = {TEAM_HOME: 0, TEAM_AWAY: 0}
+        self.time_remaining = simulation.MATCH_LENGTH
+        self.over = False
+        self.dead_ball = False
+        self.tick = NO_BASELINE
+
+    def apply(self, tick, fields):
+        if fields is None or tick == self.tick:
+            return
+        self.tick = tick
+        self.score[TEAM_HOME] = fields[HOME_SCORE]
+        self.score[TEAM_AWAY] = fields[AWAY_SCORE]
+        self.time_remaining = fields[TIME_REMAINING]
+        self.over = bool(fields[FLAGS] & FLAG_OVER)
+        self.dead_ball = bool(fields[FLAGS] & FLAG_DEAD_BALL)
+        ball = self.ball
+        ball.x, ball.y, ball.z = fields[BALL_X], fields[BALL_Y], fields[BALL_Z]
+        owner = fields[OWNER] - 1
+        for i, p in enumerate(self.players):
+            p.x = fields[HEADER_FIELDS + 2 * i]
+            p.y = fields[HEADER_FIELDS + 2 * i + 1]
+            p.has_ball = i == owner
+
+    def entity(self, source):
+        if source == SOURCE_BALL:
+            return self.ball
+        if source is None or source < 2 or source - 2 >= len(self.players):
+            return None
+        return self.players[source - 2]
+
+
+class ClientThread:
+    """A MatchClient on its own event loop thread, for the pygame frontend."""
+
+    def __init__(self, host, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.client = MatchClient()
+        self.loop = asyncio.new_event_loop()
+        self.started = time.perf_counter()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="netplay", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.loop.create_datagram_endpoint(
+                lambda: self.client, remote_addr=(self.host, self.port)))
+        except OSError as e:
+            self.error = e
+            return
+        self.loop.run_forever()
+
+    @property
+    def welcome(self):
+        return self.client.welcome
+
+    def timed_out(self):
+        return self.error is not None or (
+            self.client.welcome is None and time.perf_counter() - self.started > CONNECT_TIMEOUT)
+
+    def send_input(self, mask):
+        self.loop.call_soon_threadsafe(self.client.send_input, mask)
+
+    def poll(self, view):
+        """Brings `view` (a RemoteMatch) up to date and returns the new events,
+        their sources resolved to its entities."""
+        tick, fields, events = self.client.take()
+        view.apply(tick, fields)
+        return [event._replace(source=view.entity(event.source)) for event in events]
+
+    def close(self):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.client.close)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(1.0)
+        print(self.client.report())
+
+
+# ==================================================================================
+# LOOPBACK HARNESS
+# ==================================================================================
+class BotClient(MatchClient):
+    """A headless client that holds random directions and sometimes shoots or passes."""
+
+    def __init__(self, seed, impairment=None):
+        super().__init__(impairment)
+        self.rng = random.Random(seed)
+        self.running = True
+        self.heard = [] # Every event taken, in order
+
+    async def play(self):
+        await self.connected.wait()
+        mask = 0
+        period = 1 / TICK_RATE
+        while self.running:
+            if self.rng.random() < 0.05:
+                mask = self.rng.choice((0, simulation.INPUT_LEFT, simulation.INPUT_RIGHT,
+                                        simulation.INPUT_UP, simulation.INPUT_DOWN))
+            presses = 0
+            if self.rng.random() < 0.01:
+                presses |= simulation.INPUT_SHOOT
+            if self.rng.random() < 0.005:
+                presses |= simulation.INPUT_PASS
+            self.send_input(mask | presses)
+            self.heard.extend(self.take()[2])
+            await asyncio.sleep(period)
+
+
+async def loopback(clients=4, impairment=Impairment(), seconds=20, seed=1, team_size=simulation.DEFAULT_TEAM_SIZE):
+    """Plays a `seconds`-long match between a local server and bot clients.
+    Returns True if every client ended in step with the server."""
+    loop = asyncio.get_running_loop()
+    server = MatchServer(clients, seed=seed, team_size=team_size, match_length=seconds,
+                         impairment=impairment._replace(seed=seed))
+    server_transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+    port = server_transport.get_extra_info("sockname")[1]
+
+    bots = []
+    for i in range(clients):
+        bot = BotClient(seed + 1 + i, impairment._replace(seed=seed + 100 + i))
+        await loop.create_datagram_endpoint(lambda bot=bot: bot, remote_addr=("127.0.0.1", port))
+        bots.append(bot)
+    tasks = [asyncio.ensure_future(bot.play()) for bot in bots]
+
+    await server.run()
+    await asyncio.sleep(2 * (impairment.latency + impairment.jitter) + 0.1) # Let the last packets land
+    for bot in bots:
+        bot.running = False
+    await asyncio.gather(*tasks)
+
+    ok = True
+    by_number = {slot.number: slot for slot in list(server.clients.values()) + server.departed}
+    for bot in bots:
+        slot = by_number[bot.welcome.number]
+        in_step = bot.fields == server.fields
+        complete = bot.next_event - 1 == slot.event_seq and bot.delivered + bot.stale == slot.event_seq
+        ok = ok and in_step and complete
+        print(f"Player {bot.welcome.number + 1}: {bot.report()}")
+        print(f"  final state {'matches' if in_step else 'DIFFERS FROM'} the server; "
+              f"{bot.next_event - 1} of {slot.event_seq} events received"
+              + ("" if complete else " - INCOMPLETE"))
+        bot.close()
+    server_transport.close()
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pro Sound Basketball network play")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="host a match; players join with --connect")
+    serve.add_argument("--humans", type=int, default=2, help="players to wait for, 1 to 4 (default 2)")
+    serve.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--team-size", type=int, default=simulation.DEFAULT_TEAM_SIZE, metavar="N")
+    serve.add_argument("--seed", type=int)
+    serve.add_argument("--practice", action="store_true", help="practice mode instead of a timed match")
+
+    harness = commands.add_parser("loopback", help="play bots over localhost with simulated latency and loss")
+    harness.add_argument("--clients", type=int, default=4)
+    harness.add_argument("--latency", type=float, default=40, help="one-way delay in ms (default 40)")
+    harness.add_argument("--jitter", type=float, default=10, help="random extra or less delay in ms (default 10)")
+    harness.add_argument("--loss", type=float, default=0.05, help="fraction of packets dropped each way")
+    harness.add_argument("--seconds", type=int, default=20, help="match length (default 20)")
+    harness.add_argument("--team-size", type=int, default=simulation.DEFAULT_TEAM_SIZE, metavar="N")
+    harness.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    if args.seed is not None and not 0 <= args.seed < simulation.SEED_LIMIT:
+        parser.error(f"--seed must be from 0 to {simulation.SEED_LIMIT - 1}")
+
+    if args.command == "serve":
+        if not 1 <= args.humans <= 4:
+            parser.error("--humans must be 1 to 4")
+        mode = simulation.MODE_PRACTICE if args.practice else simulation.MODE_PLAY
+
+        async def serve_match():
+            server = MatchServer(args.humans, mode, args.seed, args.team_size)
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: server, local_addr=(args.host, args.port))
+            print(f"Serving on {args.host}:{args.port}")
+            try:
+                await server.run()
+            finally:
+                transport.close()
+
+        asyncio.run(serve_match())
+        return 0
+
+    impairment = Impairment(args.latency / 1000, args.jitter / 1000, args.loss)
+    ok = asyncio.run(loopback(args.clients, impairment, args.seconds, args.seed, args.team_size))
+    print("All clients in step with the server." if ok else "DESYNC: a client diverged from the server.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,336 @@
+"""Play-by-play logs and the live box score.
+
+A match created with record_plays=True appends a Play to state.plays for
+every gameplay event; whoever runs the match takes them from there after
+each step(). Plays name players by their position in MatchState.players:
+
+  POSSESSION  player's team has gained the ball (value: the team)
+  SHOT        player shot from (x, y) (value: SHOT_DUNK, SHOT_TWO or SHOT_THREE)
+  MAKE        player's shot went in (value: points)
+  MISS        player's shot came off the rim (value: points it was worth)
+  REBOUND     player gathered a miss
+  STEAL       player took the ball from `other`
+  PASS        player passed to `other`
+  CLOCK       a second of the game clock went by (value: seconds left)
+  END         the final buzzer
+
+PlayLogWriter appends plays to a file on a background thread: write()
+only packs them and queues the bytes, and the thread writes whatever has
+built up every `interval` seconds in one call. The queue is bounded; plays
+that would overflow it are dropped and counted, never waited for.
+
+BoxScore folds plays in one at a time (O(1) each) into points, field
+goals, threes, steals, passes and rebounds per player and per team.
+PlayLogReader streams a log back in fixed-size chunks, so a log of any
+length is read in constant memory:
+
+    python -m pro_sound_basketball.play_log game.psbp [--plays]
+
+Layout (little-endian):
+    header  "PSBPLAY\\0", u8 format, u8 mode, u8 team size, u32 seed,
+            u32 court (CourtMap.checksum(); 0: the default court)
+    plays   u32 tick, u8 kind, u8 player, u8 other, u16 value, i16 x, i16 y
+"""
+import argparse
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+MAGIC = b"PSBPLAY\0"
+FORMAT_VERSION = 2 # 2: court checksum in the header
+MODES = ("PLAY", "PRACTICE") # As simulation.MODE_PLAY and MODE_PRACTICE
+
+_HEADER = struct.Struct("<8sBBBII")
+_PLAY = struct.Struct("<IBBBHhh")
+
+POSSESSION = 0
+SHOT = 1
+MAKE = 2
+MISS = 3
+REBOUND = 4
+STEAL = 5
+PASS = 6
+CLOCK = 7
+END = 8
+KIND_NAMES = ("possession", "shot", "make", "miss", "rebound", "steal", "pass", "clock", "end")
+
+SHOT_DUNK, SHOT_TWO, SHOT_THREE = 0, 1, 2
+SHOT_TYPES = ("dunk", "two", "three")
+
+NOBODY = 255 # No player
+MAX_TEAM_SIZE = NOBODY // 2 # Players are numbered 0 to 2 * team_size - 1 in a byte, below NOBODY
+
+DEFAULT_CAPACITY = 65536   # Plays the writer may hold before it drops
+DEFAULT_INTERVAL = 1.0     # Seconds between writes
+READ_CHUNK = 4096          # Plays per read
+
+Play = namedtuple("Play", ["tick", "kind", "player", "other", "value", "x", "y"])
+Play.__new__.__defaults__ = (NOBODY, NOBODY, 0, 0, 0)
+
+
+def _clamp16(value):
+    return -32768 if value < -32768 else 32767 if value > 32767 else int(value)
+
+
+def encode(play):
+    return _PLAY.pack(play.tick, play.kind, play.player, play.other, play.value,
+                      _clamp16(play.x), _clamp16(play.y))
+
+
+# ==================================================================================
+# WRITING
+# ==================================================================================
+class PlayLogWriter:
+    """Writes a match's plays to `path` from a background thread."""
+
+    def __init__(self, path, seed, mode, team_size, court=0, capacity=DEFAULT_CAPACITY, interval=DEFAULT_INTERVAL):
+        if not 1 <= team_size <= MAX_TEAM_SIZE:
+            raise ValueError(f"play logs hold teams of up to {MAX_TEAM_SIZE} players")
+        self.path = path
+        self.capacity = capacity
+        self.interval = interval
+        self._header = _HEADER.pack(MAGIC, FORMAT_VERSION, MODES.index(mode), team_size, seed, court)
+        self._chunks = deque()
+        self._pending = 0 # Plays in _chunks
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Metrics
+        self.written = 0
+        self.dropped = 0
+        self.writes = 0
+        self.bytes = 0
+        self.write_time = 0.0
+        self.error = None
+
+        self._thread = threading.Thread(target=self._run, name="play-log", daemon=True)
+        self._thread.start()
+
+    def write(self, plays):
+        """Queues `plays` and returns at once; drops them if the queue is full."""
+        if not plays:
+            return
+        data = b"".join(encode(play) for play in plays)
+        with self._cond:
+            if self._closed or self._pending + len(plays) > self.capacity:
+                self.dropped += len(plays)
+                return
+            self._chunks.append(data)
+            self._pending += len(plays)
+
+    def close(self, timeout=2.0):
+        """Writes what is queued and closes the file."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _take(self):
+        with self._cond:
+            if not self._closed:
+                self._cond.wait(self.interval)
+            data = b"".join(self._chunks)
+            count = self._pending
+            self._chunks.clear()
+            self._pending = 0
+            return data, count, self._closed
+
+    def _run(self):
+        try:
+            f = open(self.path, "wb")
+        except OSError as e:
+            self.error = e
+            with self._cond:
+                self._closed = True
+            return
+        with f:
+            f.write(self._header)
+            self.bytes += len(self._header)
+            closed = False
+            while not closed:
+                data, count, closed = self._take()
+                if not data:
+                    continue
+                start = time.perf_counter()
+                f.write(data)
+                f.flush()
+                self.write_time += time.perf_counter() - start
+                self.writes += 1
+                self.written += count
+                self.bytes += len(data)
+
+    def report(self):
+        if self.error is not None:
+            return f"Play log not written: {self.error}"
+        per_write = self.write_time / self.writes * 1000 if self.writes else 0.0
+        return (f"Play log saved to {self.path}: {self.written} plays ({self.bytes / 1024:.1f} KB) "
+                f"in {self.writes} writes, {per_write:.2f} ms each; {self.dropped} dropped")
+
+
+# ==================================================================================
+# READING
+# ==================================================================================
+class PlayLogReader:
+    """Iterates the plays of a log without loading it whole. A record cut
+    short at the end (a log whose writer never finished) is ignored."""
+
+    def __init__(self, path, chunk=READ_CHUNK):
+        self.path = path
+        self.chunk = chunk
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path}: file too short")
+        magic, version, mode, self.team_size, self.seed, self.court = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a play log")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported play log format {version}")
+        self.mode = MODES[mode]
+
+    def __iter__(self):
+        size = _PLAY.size
+        with open(self.path, "rb") as f:
+            f.seek(_HEADER.size)
+            while True:
+                data = f.read(size * self.chunk)
+                whole = len(data) - len(data) % size
+                for fields in _PLAY.iter_unpack(data[:whole]):
+                    yield Play(*fields)
+                if len(data) < size * self.chunk:
+                    return
+
+
+# ==================================================================================
+# BOX SCORE
+# ==================================================================================
+class PlayerLine:
+    __slots__ = ("points", "fga", "fgm", "threes_attempted", "threes_made", "steals", "passes", "rebounds")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def add(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+def percent(made, attempted):
+    return 100.0 * made / attempted if attempted else 0.0
+
+
+class BoxScore:
+    """Running totals over the plays of one match; add() is O(1)."""
+
+    def __init__(self, team_size):
+        self.team_size = team_size
+        self.players = [PlayerLine() for _ in range(2 * team_size)]
+        self.teams = (PlayerLine(), PlayerLine()) # Home, away
+        self.possessions = [0, 0]
+        self.plays = 0
+        self.clock = None # Seconds left, as of the last CLOCK play
+
+    def team_of(self, player):
+        return 0 if player < self.team_size else 1
+
+    def add(self, play):
+        self.plays += 1
+        kind = play.kind
+        if kind == CLOCK:
+            self.clock = play.value
+            return
+        if kind == POSSESSION:
+            self.possessions[play.value] += 1
+            return
+        if play.player == NOBODY:
+            return
+        line = self.players[play.player]
+        team = self.teams[self.team_of(play.player)]
+        if kind == SHOT:
+            line.fga += 1
+            team.fga += 1
+            if play.value == SHOT_THREE:
+                line.threes_attempted += 1
+                team.threes_attempted += 1
+        elif kind == MAKE:
+            line.fgm += 1
+            line.points += play.value
+            team.fgm += 1
+            team.points += play.value
+            if play.value == 3:
+                line.threes_made += 1
+                team.threes_made += 1
+        elif kind == STEAL:
+            line.steals += 1
+            team.steals += 1
+        elif kind == PASS:
+            line.passes += 1
+            team.passes += 1
+        elif kind == REBOUND:
+            line.rebounds += 1
+            team.rebounds += 1
+
+    def extend(self, plays):
+        for play in plays:
+            self.add(play)
+
+    def team_summary(self, team, label):
+        line = self.teams[team]
+        return (f"{label} {line.points} points, {line.fgm} of {line.fga} shots "
+                f"({percent(line.fgm, line.fga):.0f} percent), {line.threes_made} of {line.threes_attempted} threes, "
+                f"{line.steals} steals")
+
+    def speech(self, player):
+        """A short spoken box score from `player`'s point of view."""
+        team = self.team_of(player)
+        line = self.players[player]
+        return (f"{self.team_summary(team, 'Your team')}. {self.team_summary(1 - team, 'Opponents')}. "
+                f"You: {line.points} points, {line.fgm} of {line.fga} shots.")
+
+    def table(self):
+        rows = [f"{'player':<10}{'pts':>5}{'fg':>8}{'fg%':>6}{'3pt':>7}{'3p%':>6}{'stl':>5}{'pass':>5}{'reb':>5}"]
+
+        def row(label, line):
+            return (f"{label:<10}{line.points:>5}{f'{line.fgm}/{line.fga}':>8}{percent(line.fgm, line.fga):>6.0f}"
+                    f"{f'{line.threes_made}/{line.threes_attempted}':>7}"
+                    f"{percent(line.threes_made, line.threes_attempted):>6.0f}"
+                    f"{line.steals:>5}{line.passes:>5}{line.rebounds:>5}")
+
+        for team, name in ((0, "home"), (1, "away")):
+            for i in range(team * self.team_size, (team + 1) * self.team_size):
+                rows.append(row(f"{name} {i % self.team_size + 1}", self.players[i]))
+            rows.append(row(f"{name}", self.teams[team]) + f"   {self.possessions[team]} possessions")
+        return "\n".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a play-by-play log and print its box score.")
+    parser.add_argument("path")
+    parser.add_argument("--plays", action="store_true", help="print every play but the clock")
+    args = parser.parse_args()
+
+    try:
+        reader = PlayLogReader(args.path)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    box = BoxScore(reader.team_size)
+    start = time.perf_counter()
+    for play in reader:
+        box.add(play)
+        if args.plays and play.kind != CLOCK:
+            other = "" if play.other == NOBODY else f" -> {play.other}"
+            player = "" if play.player == NOBODY else f" {play.player}"
+            print(f"{play.tick:>7} {KIND_NAMES[play.kind]:<10}{player}{other} {play.value} ({play.x}, {play.y})")
+    elapsed = time.perf_counter() - start
+    court = f" on court {reader.court:08x}" if reader.court else ""
+    print(f"{reader.mode} {reader.team_size}v{reader.team_size} seed {reader.seed}{court}: {box.plays} plays "
+          f"read in {elapsed * 1000:.0f} ms")
+    print(box.table())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""Per-phase frame profiler.
+
+Each frame is split into phases (event handling, rules, ball, AI, mixer,
+speech, other) and their durations are written into a preallocated ring
+buffer of the most recent frames. The game only holds a FrameProfiler when
+profiling is switched on; every call site is guarded by `is not None`, so
+a normal run pays nothing.
+
+Two ways to attribute time:
+  lap(phase)        - everything since the previous lap goes to `phase`
+  add(phase, secs)  - a nested measurement (e.g. one speak() call) that is
+                      taken out of whatever the next lap covers
+"""
+import json
+import time
+from array import array
+
+PHASES = ("events", "rules", "ball", "ai", "mixer", "speech", "other")
+EVENTS, RULES, BALL, AI, MIXER, SPEECH, OTHER = range(len(PHASES))
+PHASE_LABELS = ("events", "rules", "ball", "AI", "mixer", "speech", "other")
+
+# Ring buffer columns: one per phase, then work time and frame interval
+_WORK = len(PHASES)
+_INTERVAL = len(PHASES) + 1
+_COLUMNS = len(PHASES) + 2
+
+DEFAULT_CAPACITY = 60 * 60 # One minute at 60 FPS
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    def __init__(self, fps, capacity=DEFAULT_CAPACITY):
+        self.budget = 1.0 / fps
+        self.fps = fps
+        self.capacity = capacity
+        self.frames = 0 # Frames recorded in total, including overwritten ones
+        self.missed = 0 # Frames whose work took longer than the budget
+
+        self._buffer = array("d", bytes(8 * capacity * _COLUMNS))
+        self._current = [0.0] * len(PHASES)
+        self._frame_start = None
+        self._interval = 0.0
+        self._last = 0.0
+        self._nested = 0.0
+
+    # ------------------------------------------------------------------ recording
+    def begin_frame(self):
+        now = time.perf_counter()
+        interval = now - self._frame_start if self._frame_start is not None else 0.0
+        self._frame_start = now
+        self._last = now
+        self._nested = 0.0
+        self._interval = interval
+        current = self._current
+        for i in range(len(current)):
+            current[i] = 0.0
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self._current[phase] += now - self._last - self._nested
+        self._last = now
+        self._nested = 0.0
+
+    def add(self, phase, seconds):
+        self._current[phase] += seconds
+        self._nested += seconds
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        self.lap(OTHER)
+        work = self._last - self._frame_start
+        if work > self.budget:
+            self.missed += 1
+
+        row = (self.frames % self.capacity) * _COLUMNS
+        buffer = self._buffer
+        for i, value in enumerate(self._current):
+            buffer[row + i] = value
+        buffer[row + _WORK] = work
+        buffer[row + _INTERVAL] = self._interval
+        self.frames += 1
+
+    # ------------------------------------------------------------------ reporting
+    def _column(self, column):
+        count = min(self.frames, self.capacity)
+        return sorted(self._buffer[r * _COLUMNS + column] for r in range(count))
+
+    def stats(self):
+        """Percentiles in milliseconds for every phase, the work time and the interval."""
+        result = {}
+        names = PHASES + ("work", "interval")
+        for column, name in enumerate(names):
+            values = self._column(column)
+            result[name] = {
+                "p50": percentile(values, 0.50) * 1000,
+                "p95": percentile(values, 0.95) * 1000,
+                "p99": percentile(values, 0.99) * 1000,
+                "max": (values[-1] if values else 0.0) * 1000,
+            }
+        return result
+
+    def summary(self):
+        """One short sentence for the screen reader."""
+        if not self.frames:
+            return "No frames profiled yet."
+        stats = self.stats()
+        phases = sorted(range(len(PHASES)), key=lambda i: stats[PHASES[i]]["p99"], reverse=True)[:2]
+        slowest = ", ".join(f"{PHASE_LABELS[i]} {stats[PHASES[i]]['p99']:.1f} ms" for i in phases)
+        return (f"p99 frame {stats['work']['p99']:.1f} ms, {self.missed} missed. "
+                f"{slowest}")
+
+    def dump(self, path):
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        trace = []
+        for n in range(first, self.frames):
+            row = (n % self.capacity) * _COLUMNS
+            trace.append([round(v * 1000, 4) for v in self._buffer[row:row + _COLUMNS]])
+        with open(path, "w") as f:
+            json.dump({
+                "fps": self.fps,
+                "budget_ms": self.budget * 1000,
+                "frames": self.frames,
+                "missed": self.missed,
+                "stats_ms": self.stats(),
+                "columns": list(PHASES) + ["work", "interval"],
+                "first_frame": first,
+                "trace_ms": trace,
+            }, f)
@@ -0,0 +1,205 @@
+"""Compact input replays.
+
+A replay stores the match seed, mode and team size plus the human's input bitmask for
+every tick, run-length encoded, so an idle stretch costs three bytes. A
+match on a court other than the default one carries its court map,
+compressed, so it plays back on the same court. A trailer records the
+final score and a digest of the event log, which playback recomputes to
+prove the run reproduced exactly.
+
+    python -m pro_sound_basketball.replay game.psbr [--events] [--play-log game.psbp]
+
+Layout (little-endian):
+    header  "PSBR", u8 format, u8 mode, u32 seed, u32 ticks, u8 team size,
+            u32 court length (0: the default court)
+    court   zlib-compressed court_map bytes, `court length` of them
+    body    (u8 mask, u16 run) pairs covering `ticks` ticks
+    trailer u16 home score, u16 away score, 20-byte SHA-1 of the event log
+"""
+import argparse
+import hashlib
+import os
+import struct
+import time
+import zlib
+
+from . import simulation
+from .court_map import CourtMap
+from .play_log import PlayLogWriter
+from .simulation import TEAM_AWAY, TEAM_HOME, Inputs, MatchState
+
+MAGIC = b"PSBR"
+# 2: celebrations run on the match scheduler instead of DELAY events
+# 3: shot, pass, rim, net and the human's dribble are positional
+# 4: team size in the header
+# 5: shots fly analytic arcs; arrival and rebound are scheduled
+# 6: possession calls go to each team separately
+# 7: the court map, for matches not on the default court
+FORMAT_VERSION = 7
+MODES = (simulation.MODE_PLAY, simulation.MODE_PRACTICE)
+
+_HEADER = struct.Struct("<4sBBIIBI")
+_RUN = struct.Struct("<BH")
+_TRAILER = struct.Struct("<HH20s")
+_MAX_RUN = 0xFFFF
+
+
+class ReplayError(Exception):
+    pass
+
+
+class EventDigest:
+    """Running SHA-1 over the (tick, kind, value, x) of every event."""
+
+    def __init__(self):
+        self._hash = hashlib.sha1()
+        self.count = 0
+
+    def update(self, tick, events):
+        for event in events:
+            self._hash.update(repr((tick, event.kind, event.value, event.x)).encode("utf-8"))
+            self.count += 1
+
+    def digest(self):
+        return self._hash.digest()
+
+
+class ReplayRecorder:
+    """Collects one match's inputs. Call record() after every step()."""
+
+    def __init__(self, state):
+        self.seed = state.seed
+        self.mode = state.mode
+        self.team_size = state.team_size
+        self.court = b"" if simulation.on_default_court(state) else zlib.compress(state.court.to_bytes(), 9)
+        self.ticks = 0
+        self.runs = []
+        self.events = EventDigest()
+
+    def record(self, inputs, state, events):
+        mask = inputs.to_mask()
+        if self.runs and self.runs[-1][0] == mask and self.runs[-1][1] < _MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.ticks += 1
+        self.events.update(state.tick, events)
+
+    def to_bytes(self, state):
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, MODES.index(self.mode), self.seed, self.ticks,
+                              self.team_size, len(self.court)), self.court]
+        parts.extend(_RUN.pack(mask, run) for mask, run in self.runs)
+        parts.append(_TRAILER.pack(state.score[TEAM_HOME], state.score[TEAM_AWAY], self.events.digest()))
+        return b"".join(parts)
+
+    def save(self, path, state):
+        data = self.to_bytes(state)
+        tmp = path + ".tmp" # Replaced in one step, so a crash never leaves a torn replay
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+class Replay:
+    """A parsed replay file."""
+
+    def __init__(self, data):
+        if len(data) < _HEADER.size + _TRAILER.size:
+            raise ReplayError("file too short")
+        magic, version, mode, self.seed, self.ticks, self.team_size, court_length = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != FORMAT_VERSION:
+            raise ReplayError(f"unsupported replay format {version}")
+        self.mode = MODES[mode]
+
+        body_start = _HEADER.size + court_length
+        self.court = None # The default court
+        if court_length:
+            try:
+                self.court = CourtMap.from_bytes(zlib.decompress(data[_HEADER.size:body_start]))
+            except (zlib.error, ValueError) as e:
+                raise ReplayError(f"bad court map: {e}") from None
+
+        body_end = len(data) - _TRAILER.size
+        self.runs = [_RUN.unpack_from(data, offset) for offset in range(body_start, body_end, _RUN.size)]
+        if sum(run for _, run in self.runs) != self.ticks:
+            raise ReplayError("input runs do not cover the recorded ticks")
+        home, away, self.digest = _TRAILER.unpack_from(data, body_end)
+        self.score = {TEAM_HOME: home, TEAM_AWAY: away}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def inputs(self):
+        """Yields one Inputs per recorded tick."""
+        for mask, run in self.runs:
+            inputs = Inputs.from_mask(mask)
+            for _ in range(run):
+                yield inputs
+
+    def play(self, on_events=None, on_plays=None):
+        """Re-runs the match headless. Returns (state, EventDigest).
+        on_plays, if given, gets each tick's play-by-play."""
+        state = MatchState(self.mode, seed=self.seed, team_size=self.team_size, court=self.court,
+                           record_plays=on_plays is not None)
+        digest = EventDigest()
+        for inputs in self.inputs():
+            state, events = simulation.step(state, inputs)
+            digest.update(state.tick, events)
+            if on_events and events:
+                on_events(state.tick, events)
+            if state.plays:
+                on_plays(state.plays)
+                state.plays.clear()
+        return state, digest
+
+    def verify(self):
+        state, digest = self.play()
+        return state.score == self.score and digest.digest() == self.digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded match headless.")
+    parser.add_argument("path")
+    parser.add_argument("--events", action="store_true", help="print every event as it is replayed")
+    parser.add_argument("--play-log", metavar="PATH", help="write the match's play-by-play to PATH")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    on_events = None
+    if args.events:
+        def on_events(tick, events):
+            for event in events:
+                print(f"{tick:>6} {event.kind:<10} {event.value if event.value is not None else ''}")
+
+    writer = None
+    if args.play_log:
+        # Unbounded: nothing here is real time, so no play need be dropped
+        try:
+            writer = PlayLogWriter(args.play_log, replay.seed, replay.mode, replay.team_size,
+                                   court=replay.court.checksum() if replay.court else 0, capacity=float("inf"))
+        except ValueError as e:
+            print(e)
+            return 1
+    start = time.perf_counter()
+    state, digest = replay.play(on_events, writer.write if writer else None)
+    elapsed = time.perf_counter() - start
+    if writer:
+        writer.close()
+        print(writer.report())
+
+    match = state.score == replay.score and digest.digest() == replay.digest
+    game_seconds = replay.ticks / simulation.TICK_RATE
+    print(f"{replay.mode} {replay.team_size}v{replay.team_size} seed {replay.seed}: {replay.ticks} ticks ({game_seconds:.0f} s of play) "
+          f"replayed in {elapsed * 1000:.0f} ms, {game_seconds / max(elapsed, 1e-9):.0f}x real time")
+    print(f"Final score: home {state.score[TEAM_HOME]}, away {state.score[TEAM_AWAY]}; "
+          f"{digest.count} events")
+    print("Replay matches the recording." if match else "MISMATCH: replay diverged from the recording.")
+    return 0 if match else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
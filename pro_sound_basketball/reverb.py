@@ -0,0 +1,302 @@
+"""Per-gym acoustics by FFT convolution.
+
+Every gym has a synthetic stereo impulse response built from a handful of
+parameters (Acoustics): a long, dark tail for The Hangar, dense metallic
+early reflections for The Iron Cage, slap echoes for Neon Alley and almost
+nothing on the rooftop. ReverbBank convolves the in-game sounds with a
+gym's response on a background worker when the gym is chosen and keeps the
+results:
+
+  - in memory, as ready-to-play sounds, for the most recently used gyms up
+    to `memory_budget` bytes (least recently used gyms are dropped first)
+  - on disk under `directory`, one .npy per processed sound, keyed by the
+    gym's acoustics, the dry sound's content and REVERB_VERSION, so a
+    changed sound or preset simply misses; oldest files go first once the
+    folder is over `disk_budget`
+
+Until a gym's bank is ready the dry sounds are used. refresh() drops a
+sound that has changed from every bank and processes it again; it is dry
+in the meantime. Requires NumPy; without it every gym sounds dry.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+SAMPLE_RATE = 44100
+# Bump whenever the impulse responses or the processing change
+REVERB_VERSION = 1
+CACHE_DIRECTORY = "reverb_cache"
+DEFAULT_MEMORY_BUDGET = 48 * 1024 * 1024
+DEFAULT_DISK_BUDGET = 64 * 1024 * 1024
+
+# Menu and interface cues are not in the gym
+DRY_SOUNDS = ('menuclick', 'menuenter', 'beep')
+
+Acoustics = namedtuple("Acoustics", [
+    "rt60",      # Seconds for the tail to fall by 60 dB
+    "wet",       # Level of the reverberant signal next to the dry one
+    "predelay",  # Seconds before the tail starts
+    "early",     # (delay in seconds, gain) early reflections
+    "damping",   # Low-pass width in samples; larger is darker
+])
+
+GYM_ACOUSTICS = {
+    # Steel walls close by: a comb of short, bright reflections
+    "The Iron Cage": Acoustics(0.9, 0.35, 0.004,
+                               ((0.007, 0.55), (0.0105, 0.45), (0.014, 0.4), (0.0175, 0.35), (0.021, 0.3)), 2),
+    # Open air: a faint, very short tail
+    "Skyline Heights": Acoustics(0.15, 0.06, 0.0, (), 8),
+    # Two facing walls: flutter echo
+    "Neon Alley": Acoustics(0.6, 0.25, 0.002, ((0.012, 0.45), (0.024, 0.3), (0.036, 0.2), (0.048, 0.12)), 6),
+    # Huge and empty: late, long and dark
+    "The Hangar": Acoustics(2.8, 0.45, 0.03, ((0.045, 0.3), (0.09, 0.2)), 16),
+}
+
+
+# ==================================================================================
+# DSP
+# ==================================================================================
+def impulse_response(acoustics, seed=0, framerate=SAMPLE_RATE):
+    """Stereo (m, 2) float impulse response with unit energy per channel."""
+    rng = np.random.default_rng(seed)
+    predelay = int(acoustics.predelay * framerate)
+    tail = max(int(acoustics.rt60 * framerate), 64)
+    length = predelay + tail
+    for delay, _ in acoustics.early:
+        length = max(length, int(delay * framerate) + int(0.0003 * framerate) + 1)
+
+    ir = np.zeros((length, 2))
+    t = np.arange(tail) / framerate
+    noise = rng.standard_normal((tail, 2)) * np.exp(-6.91 * t / acoustics.rt60)[:, None]
+    if acoustics.damping > 1:
+        width = acoustics.damping
+        total = np.cumsum(np.concatenate([np.zeros((width, 2)), noise]), axis=0)
+        noise = (total[width:] - total[:-width]) / width
+    ir[predelay:] = noise / np.sqrt((noise ** 2).sum(axis=0))
+
+    for i, (delay, gain) in enumerate(acoustics.early):
+        left = int(delay * framerate)
+        right = left + int(0.0003 * framerate) * (1 if i % 2 else -1) # Slightly apart, for width
+        ir[left, 0] += gain
+        ir[max(right, 0), 1] += gain
+    return ir / np.sqrt((ir ** 2).sum(axis=0))
+
+
+def convolve(dry, ir):
+    """FFT convolution of a mono float signal with an (m, 2) response."""
+    n = len(dry) + len(ir) - 1
+    size = 1 << (n - 1).bit_length()
+    spectrum = np.fft.rfft(dry, size)[:, None] * np.fft.rfft(ir, size, axis=0)
+    return np.fft.irfft(spectrum, size, axis=0)[:n]
+
+
+def apply(pcm, acoustics, ir):
+    """Dry int16 PCM, mono or (n, channels), to stereo (n + tail, 2) int16 with the room added."""
+    pcm = np.asarray(pcm)
+    dry = pcm.astype(np.float64)
+    if dry.ndim == 1:
+        dry = dry[:, None]
+    dry = np.repeat(dry, 2, axis=1) if dry.shape[1] == 1 else dry[:, :2]
+
+    out = acoustics.wet * convolve(dry.mean(axis=1), ir)
+    out[:len(dry)] += dry
+    peak = np.abs(out).max()
+    if peak > 32767:
+        out *= 32767 / peak
+    return out.astype(np.int16)
+
+
+def bank_key(gym, name, pcm):
+    digest = hashlib.sha1(np.ascontiguousarray(pcm).tobytes()).hexdigest()
+    blob = repr((REVERB_VERSION, GYM_ACOUSTICS[gym], name, digest))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+# ==================================================================================
+# BANKS
+# ==================================================================================
+class ReverbBank:
+    """Processed sound banks per gym, built in the background.
+
+    `source(name)` returns the dry int16 PCM of every variant of a sound;
+    `make_sound(pcm)` turns a processed (n, 2) int16 array into something
+    playable. Both are called on the worker thread. A bank maps each name to
+    its processed variants, in the same order.
+    """
+
+    def __init__(self, names, source, make_sound, directory=CACHE_DIRECTORY,
+                 memory_budget=DEFAULT_MEMORY_BUDGET, disk_budget=DEFAULT_DISK_BUDGET):
+        self.names = [name for name in names if name not in DRY_SOUNDS]
+        self.source = source
+        self.make_sound = make_sound
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+
+        self._banks = OrderedDict() # gym -> (sounds by name, bytes by name), most recent last
+        self._futures = {}
+        self._generations = {} # name -> times it has been refreshed
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reverb") if np is not None else None
+
+    def prepare(self, gym):
+        """Starts building `gym`'s bank unless it is ready or on its way."""
+        if self._pool is None or gym not in GYM_ACOUSTICS:
+            return
+        with self._lock:
+            if gym in self._banks:
+                self._banks.move_to_end(gym)
+                return
+            future = self._futures.get(gym)
+            if future is not None and not future.done():
+                return
+            self._futures[gym] = self._pool.submit(self._build_logged, gym)
+
+    def get(self, gym):
+        """The processed variants for `gym` by name, or None while they are not ready."""
+        with self._lock:
+            bank = self._banks.get(gym)
+            if bank is None:
+                return None
+            self._banks.move_to_end(gym)
+            return bank[0]
+
+    def refresh(self, name):
+        """Drops `name` from every bank and processes it again from source(),
+        on the worker. Call when the sound has changed, from the thread that plays it."""
+        if self._pool is None or name not in self.names:
+            return
+        with self._lock:
+            self._generations[name] = generation = self._generations.get(name, 0) + 1
+            for sounds, sizes in self._banks.values():
+                sounds.pop(name, None)
+                sizes.pop(name, None)
+            gyms = list(self._banks)
+        for gym in gyms:
+            self._pool.submit(self._refresh_logged, gym, name, generation)
+
+    def _refresh_logged(self, gym, name, generation):
+        try:
+            start = time.perf_counter()
+            variants, size, _ = self._process(gym, name, GYM_ACOUSTICS[gym], {})
+            with self._lock:
+                bank = self._banks.get(gym)
+                if bank is None or self._generations[name] != generation:
+                    return # Evicted, or changed again since
+                bank[0][name] = variants
+                bank[1][name] = size
+            print(f"Reverb: {name} in {gym} redone in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"Reverb for {name} in {gym} failed, keeping it dry: {e}")
+
+    def wait(self, gym, timeout=None):
+        future = self._futures.get(gym)
+        if future is not None:
+            future.result(timeout)
+        return self.get(gym)
+
+    def _build_logged(self, gym):
+        try:
+            self._build(gym)
+        except Exception as e:
+            print(f"Reverb for {gym} failed, keeping it dry: {e}")
+
+    def _process(self, gym, name, acoustics, ir):
+        """(processed variants, bytes, how many came from disk) for one sound.
+        `ir` caches the impulse response across calls."""
+        variants = []
+        size = 0
+        from_disk = 0
+        for pcm in self.source(name):
+            key = bank_key(gym, name, pcm)
+            wet = self._load(key)
+            if wet is not None:
+                from_disk += 1
+            else:
+                if "ir" not in ir:
+                    ir["ir"] = impulse_response(acoustics)
+                wet = apply(pcm, acoustics, ir["ir"])
+                self._store(key, wet)
+            variants.append(self.make_sound(wet))
+            size += wet.nbytes
+        return tuple(variants), size, from_disk
+
+    def _build(self, gym):
+        start = time.perf_counter()
+        acoustics = GYM_ACOUSTICS[gym]
+        ir = {}
+        sounds = {}
+        sizes = {}
+        from_disk = 0
+        processed = 0
+        with self._lock:
+            generations = dict(self._generations)
+        for name in self.names:
+            sounds[name], sizes[name], name_from_disk = self._process(gym, name, acoustics, ir)
+            from_disk += name_from_disk
+            processed += len(sounds[name])
+        size = sum(sizes.values())
+
+        with self._lock:
+            # A sound refreshed while this bank was built may have been processed from the old one
+            stale = {name: self._generations[name] for name in sounds
+                     if self._generations.get(name, 0) != generations.get(name, 0)}
+            for name in stale:
+                del sounds[name], sizes[name]
+            self._banks[gym] = (sounds, sizes)
+            total = sum(sum(s.values()) for _, s in self._banks.values())
+            while total > self.memory_budget and len(self._banks) > 1:
+                _, (_, evicted) = self._banks.popitem(last=False)
+                total -= sum(evicted.values())
+        for name, generation in stale.items(): # Done again from the new source, after this build
+            self._pool.submit(self._refresh_logged, gym, name, generation)
+        self._trim_disk()
+        print(f"Reverb: {gym} ready in {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({from_disk} of {processed} from disk, {size / 1024:.0f} KB)")
+
+    # ------------------------------------------------------------------ disk
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def _load(self, key):
+        try:
+            wet = np.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+        os.utime(self._path(key)) # Recently used; trimmed last
+        return wet
+
+    def _store(self, key, wet):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, wet)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Could not cache reverb: {e}")
+
+    def _trim_disk(self):
+        try:
+            files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".npy")]
+        except OSError:
+            return
+        stats = sorted(((os.path.getmtime(f), os.path.getsize(f), f) for f in files))
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in stats:
+            if total <= self.disk_budget:
+                break
+            os.remove(path)
+            total -= size
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
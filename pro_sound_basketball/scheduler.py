@@ -0,0 +1,70 @@
+"""Deferred actions on a virtual clock.
+
+A Scheduler never sleeps and never reads the wall clock: time only moves
+when advance() is called, once per simulation tick in the game, or by hand
+in a test. Two kinds of work can be scheduled:
+
+  call_later(seconds, callback)  - callback(context) runs once, `seconds` later
+  start(sequence)                - a generator that yields how many seconds to
+                                   wait before it is resumed
+
+advance() hands its `context` argument to callbacks and sends it into
+resumed sequences, so a sequence written as
+
+    def celebration(events):
+        events.append(...)
+        events = yield 0.4    # resumed 0.4 s later with that tick's list
+        events.append(...)
+
+always appends to the event list of the tick it is running in. Work that
+comes due on the same tick runs in the order it was scheduled.
+"""
+import heapq
+import itertools
+
+
+class Scheduler:
+    def __init__(self, rate):
+        self.rate = rate # Ticks per second of virtual time
+        self.now = 0     # Current tick
+        self._queue = [] # (due tick, order, callback or generator)
+        self._order = itertools.count()
+
+    def ticks(self, seconds):
+        """Virtual-clock ticks for a delay in seconds, never less than one."""
+        return max(1, round(seconds * self.rate))
+
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    def call_later(self, seconds, callback):
+        heapq.heappush(self._queue, (self.now + self.ticks(seconds), next(self._order), callback))
+
+    def start(self, sequence):
+        """Runs `sequence` up to its first yield now, then on the virtual clock."""
+        self._resume(sequence, None, first=True)
+
+    def cancel_all(self):
+        for _, _, action in self._queue:
+            if not callable(action):
+                action.close()
+        self._queue.clear()
+
+    def advance(self, context=None, ticks=1):
+        """Moves the clock forward and runs everything that has come due."""
+        self.now += ticks
+        queue = self._queue
+        while queue and queue[0][0] <= self.now:
+            _, _, action = heapq.heappop(queue)
+            if callable(action):
+                action(context)
+            else:
+                self._resume(action, context)
+
+    def _resume(self, sequence, context, first=False):
+        try:
+            seconds = next(sequence) if first else sequence.send(context)
+        except StopIteration:
+            return
+        heapq.heappush(self._queue, (self.now + self.ticks(seconds), next(self._order), sequence))
@@ -0,0 +1,87 @@
+"""Closed-form ball flight.
+
+A shot is released at RELEASE_HEIGHT and flies a parabola to the rim: the
+horizontal velocity is constant and gravity bends the vertical one. Given
+the launch angle, the hang time follows from the distance alone,
+
+    d * tan(angle) - g * T**2 / 2 = RIM_HEIGHT - RELEASE_HEIGHT
+
+so the tick the ball reaches the hoop is known the moment it leaves the
+shooter's hands and the match scheduler can simply wake up then; nothing
+is polled while the ball is in the air. Shots too close for that arc (a
+dunk, say) take MIN_HANG and a flatter, faster push. Arc.at(t) gives the
+exact position at any time, so the result does not depend on the tick
+rate beyond rounding the arrival up to the next tick.
+
+Units are court units (about 1.2 cm: the 2400-unit court is an NBA
+court's 28.7 m) and seconds.
+"""
+import math
+
+GRAVITY = 838.0           # 9.81 m/s^2 in court units
+RELEASE_HEIGHT = 190.0    # Ball leaves the hands at about 2.2 m
+RIM_HEIGHT = 260.0        # 3.05 m
+LAUNCH_ANGLE = math.radians(50)
+MIN_HANG = 0.1            # Seconds; dunks and tip-ins
+
+REBOUND_DISTANCE = 150.0  # How far off the rim a miss lands
+REBOUND_HANG = 0.5        # Seconds from the rim to the rebounder's hands
+REBOUND_SPREAD = math.radians(60) # Either side of straight back at the shooter
+
+
+def hang_time(distance, rise=RIM_HEIGHT - RELEASE_HEIGHT, angle=LAUNCH_ANGLE):
+    """Seconds a shot launched at `angle` takes to cover `distance` and climb `rise`."""
+    drop = distance * math.tan(angle) - rise
+    if drop <= 0:
+        return MIN_HANG
+    return max(MIN_HANG, math.sqrt(2 * drop / GRAVITY))
+
+
+def arrival_ticks(seconds, rate):
+    """Whole ticks until `seconds` have passed (at least one)."""
+    return max(1, math.ceil(seconds * rate - 1e-9))
+
+
+class Arc:
+    """A parabola from (x0, y0, z0) to (x1, y1, z1) taking `hang_time` seconds."""
+
+    __slots__ = ("x0", "y0", "z0", "vx", "vy", "vz", "hang_time")
+
+    def __init__(self, x0, y0, z0, x1, y1, z1, hang_time):
+        self.x0 = x0
+        self.y0 = y0
+        self.z0 = z0
+        self.hang_time = hang_time
+        self.vx = (x1 - x0) / hang_time
+        self.vy = (y1 - y0) / hang_time
+        self.vz = (z1 - z0) / hang_time + GRAVITY * hang_time / 2
+
+    @classmethod
+    def shot(cls, x, y, hoop):
+        """A shot released at (x, y) towards `hoop` on the launch-angle arc."""
+        distance = math.hypot(hoop[0] - x, hoop[1] - y)
+        return cls(x, y, RELEASE_HEIGHT, hoop[0], hoop[1], RIM_HEIGHT, hang_time(distance))
+
+    @classmethod
+    def rebound(cls, hoop, shooter_x, shooter_y, rng):
+        """A miss off the rim, back towards the shooter's side within REBOUND_SPREAD."""
+        back = math.atan2(shooter_y - hoop[1], shooter_x - hoop[0]) + rng.uniform(-REBOUND_SPREAD, REBOUND_SPREAD)
+        return cls(hoop[0], hoop[1], RIM_HEIGHT,
+                   hoop[0] + REBOUND_DISTANCE * math.cos(back), hoop[1] + REBOUND_DISTANCE * math.sin(back),
+                   RELEASE_HEIGHT, REBOUND_HANG)
+
+    @property
+    def launch_angle(self):
+        return math.atan2(self.vz, math.hypot(self.vx, self.vy))
+
+    @property
+    def apex(self):
+        """Highest point above the floor."""
+        t = min(max(self.vz / GRAVITY, 0.0), self.hang_time)
+        return self.z0 + self.vz * t - GRAVITY * t * t / 2
+
+    def at(self, t):
+        """(x, y, z) `t` seconds after release; held at the end once the arc is over."""
+        if t > self.hang_time:
+            t = self.hang_time
+        return self.x0 + self.vx * t, self.y0 + self.vy * t, self.z0 + (self.vz - GRAVITY * t / 2) * t
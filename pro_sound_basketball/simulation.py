@@ -0,0 +1,704 @@
+"""Game rules, independent of pygame.
+
+step(state, inputs) advances a match by one fixed tick (1 / TICK_RATE
+seconds) and returns the sounds and speech the frontend should produce as
+a list of Events. Celebrations and the end of the match are sequences on
+the match's own Scheduler, so they take simulated time without ever
+blocking the frontend. Nothing here touches the display, the mixer or
+the speech backend, so a match can be run headless as fast as the CPU
+allows. Shots fly closed-form arcs (shot_physics): their arrival at the
+hoop is scheduled at release rather than checked every tick. Shot zones,
+the three-point check and the AI's shooting range are looked up in the
+match's court map (court_map). All randomness comes from the match's own seeded RNG, so the same
+seed and inputs always replay the same game.
+"""
+import functools
+import math
+import random
+from collections import namedtuple
+
+from .court_index import CourtIndex
+from .court_map import DEFAULT_CELL, DUNK, NEAR_THREE, THREE, TWO, CourtLayout, CourtMap, points, zone_at
+from .play_log import (
+    CLOCK, END, MAKE, MISS, NOBODY, PASS, POSSESSION, REBOUND, SHOT, SHOT_DUNK, SHOT_THREE, SHOT_TWO, STEAL, Play,
+)
+from .profiler import AI as PHASE_AI, BALL as PHASE_BALL, RULES as PHASE_RULES
+from .scheduler import Scheduler
+from .shot_physics import RELEASE_HEIGHT, REBOUND_HANG, Arc, arrival_ticks
+from .speech import CHATTER, CRITICAL, NORMAL
+
+# ==================================================================================
+# CONFIGURATION & CONSTANTS
+# ==================================================================================
+TICK_RATE = 60
+MATCH_LENGTH = 120 # Seconds
+
+COURT_WIDTH = 2400
+COURT_HEIGHT = 600
+HOOP_LEFT_POS = (-1100, 0)
+HOOP_RIGHT_POS = (1100, 0)
+THREE_POINT_RADIUS = 250
+DUNK_RANGE = 50
+NEAR_THREE_BAND = 50 # The AI takes threes from no deeper than this behind the line
+
+PLAYER_SPEED = 5
+PASS_SPEED = 15
+
+STEAL_RADIUS = 30
+CHASERS = 2        # Off-ball AI players per team who go after the ball; the rest mark or get open
+OPEN_RADIUS = 150  # An attacker with a defender this close moves away to get open
+MARK_DISTANCE = 40 # How close a marking defender stays to their man
+
+DEFAULT_TEAM_SIZE = 2
+SEED_LIMIT = 2 ** 32 # Seeds are 0 up to this, exclusive; replays store them in 32 bits
+
+# Dead-ball pauses, in seconds of simulated time
+DUNK_RING_OUT = 0.4    # Dunk sound before the net
+CELEBRATION = 1.0      # Score announcement before play restarts
+GAME_OVER_PAUSE = 2.0  # Final buzzer before the match is handed back
+
+TEAM_HOME = 0
+TEAM_AWAY = 1
+
+MODE_PLAY = "PLAY"
+MODE_PRACTICE = "PRACTICE"
+
+# Balance constants. Matches use DEFAULT_RULES; tournament.py sweeps them.
+Rules = namedtuple("Rules", [
+    "shot_accuracy",     # Chance a shot that reaches the hoop goes in
+    "dunk_chance",       # Per-tick chance an AI ball handler within DUNK_RANGE shoots
+    "mid_range_chance",  # Per-tick chance an AI ball handler inside NEAR_THREE_BAND of the arc shoots
+    "pass_chance",       # Per-tick chance an AI ball handler looks to pass
+    "steal_chance",      # Per-tick chance a defender within 30 steals
+    "steal_cooldown",    # Ticks after a steal before the next one can happen
+])
+DEFAULT_RULES = Rules(
+    shot_accuracy=0.7,
+    dunk_chance=0.1,
+    mid_range_chance=0.02,
+    pass_chance=0.005,
+    steal_chance=0.01,
+    steal_cooldown=120,
+)
+
+DEFAULT_LAYOUT = CourtLayout(
+    width=COURT_WIDTH,
+    height=COURT_HEIGHT,
+    hoops=(HOOP_LEFT_POS, HOOP_RIGHT_POS),
+    three_point_radius=THREE_POINT_RADIUS,
+    dunk_range=DUNK_RANGE,
+    near_three_band=NEAR_THREE_BAND,
+    make_chance=DEFAULT_RULES.shot_accuracy,
+    cell=DEFAULT_CELL,
+)
+
+# ==================================================================================
+# EVENTS & INPUTS
+# ==================================================================================
+SOUND = "sound"         # value: sound name, x/y: source position (x None for unpanned),
+                        # source: entity the sound follows while it plays, if any
+SPEECH = "speech"       # value: text to announce, priority: speech.CRITICAL/NORMAL/CHATTER
+GAME_OVER = "game_over" # The match is finished and can be left
+
+# audience: the players who should hear an event, or None for everyone
+Event = namedtuple("Event", ["kind", "value", "x", "y", "source", "priority", "audience"])
+Event.__new__.__defaults__ = (None, None, None, None, NORMAL, None)
+
+
+# Input bits, as stored in replays
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_SHOOT = 16
+INPUT_PASS = 32
+
+
+class Inputs:
+    """What a human did during one tick. Shoot and pass are key presses."""
+
+    __slots__ = ("move_x", "move_y", "shoot", "pass_ball")
+
+    def __init__(self, move_x=0, move_y=0, shoot=False, pass_ball=False):
+        self.move_x = move_x
+        self.move_y = move_y
+        self.shoot = shoot
+        self.pass_ball = pass_ball
+
+    def to_mask(self):
+        mask = 0
+        if self.move_x < 0: mask |= INPUT_LEFT
+        if self.move_x > 0: mask |= INPUT_RIGHT
+        if self.move_y < 0: mask |= INPUT_UP
+        if self.move_y > 0: mask |= INPUT_DOWN
+        if self.shoot: mask |= INPUT_SHOOT
+        if self.pass_ball: mask |= INPUT_PASS
+        return mask
+
+    @classmethod
+    def from_mask(cls, mask):
+        inputs = cls()
+        if mask & INPUT_LEFT: inputs.move_x = -1
+        if mask & INPUT_RIGHT: inputs.move_x = 1
+        if mask & INPUT_UP: inputs.move_y = -1
+        if mask & INPUT_DOWN: inputs.move_y = 1
+        inputs.shoot = bool(mask & INPUT_SHOOT)
+        inputs.pass_ball = bool(mask & INPUT_PASS)
+        return inputs
+
+
+# ==================================================================================
+# ENTITIES
+# ==================================================================================
+class Ball:
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.z = RELEASE_HEIGHT # Height above the floor
+        self.owner = None
+        self.target_hoop = None
+        self.in_air = False
+        self.shot_data = None   # (team, points, is_dunk) while a shot is in flight
+        self.shooter = None     # Player who took it
+        self.flight = None      # shot_physics.Arc while in the air
+        self.flight_start = 0   # Scheduler tick the flight began
+
+    def update(self, now):
+        """Follows the owner, or the flight arc as of scheduler tick `now`."""
+        if self.owner:
+            self.x = self.owner.x
+            self.y = self.owner.y
+            self.z = RELEASE_HEIGHT
+            self.in_air = False
+        elif self.in_air and self.flight is not None:
+            self.x, self.y, self.z = self.flight.at((now - self.flight_start) / TICK_RATE)
+
+
+class Player:
+    def __init__(self, team, x, y, is_human=False, slot=0):
+        self.team = team
+        self.slot = slot # Position in the team's lineup
+        self.number = 0  # Position in MatchState.players
+        self.x = x
+        self.y = y
+        self.is_human = is_human
+        self.has_ball = False
+        self.dribble_timer = 0
+        self.teammates = []
+        self.opponents = []
+        self.pass_target = None # Chosen teammate when ai_update returns "pass"
+
+    def update(self, ball, field, events, rng, rules=DEFAULT_RULES, index=None, chasing=True, in_steal_range=False):
+        if self.has_ball:
+            # Auto dribble sound
+            if self.is_moving():
+                self.dribble_timer -= 1
+                if self.dribble_timer <= 0:
+                    events.append(Event(SOUND, 'dribble', self.x, self.y, self))
+                    self.dribble_timer = 20 # Frames between dribbles
+
+        if not self.is_human:
+            return self.ai_update(ball, field, rng, rules, index, chasing, in_steal_range)
+        return None
+
+    def is_moving(self):
+        # For human, checked via input. For AI, checked via velocity (simplified)
+        return True # Simplified for audio cues
+
+    def ai_update(self, ball, field, rng, rules=DEFAULT_RULES, index=None, chasing=True, in_steal_range=False):
+        """Moves the player and returns "shoot", "pass" or "steal" (or None).
+
+        `field` is the court_map.HoopField of the hoop the player attacks.
+        Off the ball, a chasing player runs at the ball; the others, who need
+        the court index, mark the nearest opponent on defense or get away
+        from their defender on offense. `in_steal_range` says whether a
+        player who is not chasing started the tick within STEAL_RADIUS of the
+        ball.
+        """
+        # Simple AI
+        speed = PLAYER_SPEED * 0.8
+
+        hoop_pos = field.hoop
+        if self.has_ball:
+            # Move to hoop
+            dx = hoop_pos[0] - self.x
+            dy = hoop_pos[1] - self.y
+            dist = math.hypot(dx, dy)
+            zone = zone_at(dist, field.layout) # The exact distance is at hand: no lookup needed
+
+            if dist > 0:
+                self.x += (dx/dist) * speed
+                self.y += (dy/dist) * speed
+
+            # Shoot if close enough (random chance)
+            # High chance to dunk if close
+            if zone == DUNK:
+                if rng.random() < rules.dunk_chance:
+                    return "shoot"
+            # Shot chance further out, up to a step behind the arc
+            elif zone == TWO or zone & NEAR_THREE:
+                if rng.random() < rules.mid_range_chance: # ~1 shot per sec if in range at 2%
+                    return "shoot"
+
+            # Pass to a teammate closer to the hoop, the most open one if several are
+            if self.teammates and rng.random() < rules.pass_chance: # Occasional pass
+                closer = [mate for mate in self.teammates
+                          if math.hypot(hoop_pos[0] - mate.x, hoop_pos[1] - mate.y) < dist]
+                if len(closer) == 1:
+                    self.pass_target = closer[0]
+                    return "pass"
+                if closer:
+                    self.pass_target = index.open_teammate(self, other_team(self.team), closer)
+                    return "pass"
+
+        else:
+            if chasing:
+                # Chase the ball
+                target_x, target_y = ball.x, ball.y
+                dx = target_x - self.x
+                dy = target_y - self.y
+                dist = math.hypot(dx, dy)
+
+                if dist > 0:
+                    self.x += (dx/dist) * speed
+                    self.y += (dy/dist) * speed
+                in_steal_range = dist < STEAL_RADIUS
+            else:
+                self.move_off_ball(ball, field, index, speed)
+
+            # Steal attempt
+            if in_steal_range and ball.owner and ball.owner.team != self.team:
+                if rng.random() < rules.steal_chance:
+                    return "steal"
+        return None
+
+    def move_off_ball(self, ball, field, index, speed):
+        if ball.owner is not None and ball.owner.team == self.team:
+            # Get open: head for this slot's spot on the arc, bending away
+            # from a close defender without ever leaving the spot behind
+            spot_x, spot_y = arc_spot(field.hoop, self.slot, len(self.teammates) + 1,
+                                      field.layout.three_point_radius)
+            dx, dy = spot_x - self.x, spot_y - self.y
+            stop = speed
+            marker = index.nearest(self.x, self.y, other_team(self.team))
+            if marker:
+                away_x, away_y = self.x - marker[0].x, self.y - marker[0].y
+                away = math.hypot(away_x, away_y)
+                if 0 < away < OPEN_RADIUS:
+                    to_spot = max(math.hypot(dx, dy), 1e-9)
+                    dx, dy = dx / to_spot + away_x / away, dy / to_spot + away_y / away
+                    stop = 0
+        else:
+            # Mark the nearest attacker other than the ball handler (who has chasers)
+            man = index.nearest(self.x, self.y, other_team(self.team), exclude=ball.owner)
+            if not man:
+                return
+            dx, dy, stop = man[0].x - self.x, man[0].y - self.y, MARK_DISTANCE
+
+        dist = math.hypot(dx, dy)
+        if dist > stop and dist > 0:
+            self.x += (dx/dist) * speed
+            self.y += (dy/dist) * speed
+
+
+# ==================================================================================
+# MATCH STATE
+# ==================================================================================
+class MatchState:
+    """Everything step() reads and writes for one match.
+
+    Without a seed one is drawn at random; it is kept in `seed` so the
+    match can be recorded and replayed. Seeds must be below SEED_LIMIT. `humans` players are controlled by
+    people, in human_order(): the first home player, the first away player,
+    then the second of each; ai_only makes that none, for AI-vs-AI matches. `team_size` players line up
+    on each side (2 for the classic 2-on-2); `teams` lists them by team and
+    `index` is a CourtIndex the AI queries once rosters outgrow CHASERS.
+    `court` is the court_map.CourtMap the rules read zones and hoops from
+    (the default court unless one is given) and `fields` its HoopField per
+    team, for the hoop that team attacks. With record_plays, `plays` collects
+    a play_log.Play for every possession change, shot, make, miss, rebound,
+    steal, pass and second of the clock, for the caller to take after each
+    step(); otherwise it is None and nothing is logged.
+
+    While `dead_ball` is set (during a score celebration) the game clock is
+    stopped and nobody moves; only the scheduler runs.
+    """
+
+    def __init__(self, mode=MODE_PLAY, seed=None, ai_only=False, rules=DEFAULT_RULES,
+                 team_size=DEFAULT_TEAM_SIZE, humans=1, court=None, record_plays=False):
+        if team_size < 2:
+            raise ValueError("teams need at least two players")
+        if seed is not None and not 0 <= seed < SEED_LIMIT:
+            raise ValueError(f"seed must be from 0 to {SEED_LIMIT - 1}")
+        if ai_only:
+            humans = 0
+        if not 0 <= humans <= 2 * team_size:
+            raise ValueError(f"a {team_size}-a-side match has room for at most {2 * team_size} humans")
+        self.mode = mode
+        self.ai_only = ai_only
+        self.rules = rules
+        self.seed = seed if seed is not None else random.randrange(SEED_LIMIT)
+        self.rng = random.Random(self.seed)
+        self.tick = 0
+        self.score = {TEAM_HOME: 0, TEAM_AWAY: 0}
+        self.time_remaining = MATCH_LENGTH
+        self.steal_cooldown = 0
+        self.over = False
+        self.dead_ball = False
+        self.scheduler = Scheduler(TICK_RATE)
+        self.plays = [] if record_plays else None # play_log.Play records not yet taken
+        self.possession = None # Team with the ball, as last logged
+
+        self.team_size = team_size
+        self.players = []
+        self.teams = {TEAM_HOME: [], TEAM_AWAY: []}
+        self.humans = [] # Human-controlled players, in human_order()
+        self.ball = Ball()
+        self.court = court if court is not None else default_court(rules.shot_accuracy)
+        self.fields = team_fields(self.court)
+        self.index = CourtIndex(self.court.layout.width, self.court.layout.height)
+        self.setup_teams(humans)
+
+    @property
+    def human(self):
+        """The first human's player (the first home player when there is none)."""
+        return self.humans[0] if self.humans else self.players[0]
+
+    def setup_teams(self, humans):
+        # Home team first (the first human is index 0), then the away team
+        for team in (TEAM_HOME, TEAM_AWAY):
+            for slot in range(self.team_size):
+                x, y = formation(team, slot)
+                self.teams[team].append(Player(team, x, y, slot=slot))
+        self.players = self.teams[TEAM_HOME] + self.teams[TEAM_AWAY]
+        for number, player in enumerate(self.players):
+            player.number = number
+        for team, slot in human_order(self.team_size)[:humans]:
+            player = self.teams[team][slot]
+            player.is_human = True
+            self.humans.append(player)
+
+        for p in self.players:
+            p.teammates = [mate for mate in self.teams[p.team] if mate is not p]
+            p.opponents = self.teams[other_team(p.team)]
+
+        # Give ball to human
+        self.ball.owner = self.players[0]
+        self.players[0].has_ball = True
+        log_possession(self, self.players[0])
+
+    def reset_positions(self):
+        for team, players in self.teams.items():
+            for slot, p in enumerate(players):
+                p.x, p.y = formation(team, slot)
+
+        self.ball.owner = self.players[0]
+        for p in self.players: p.has_ball = False
+        self.players[0].has_ball = True
+        self.ball.in_air = False
+        self.ball.flight = None
+
+
+def attacking_hoop(team):
+    return HOOP_RIGHT_POS if team == TEAM_HOME else HOOP_LEFT_POS
+
+
+@functools.lru_cache(maxsize=8)
+def default_court(make_chance=DEFAULT_RULES.shot_accuracy):
+    """The CourtMap of DEFAULT_LAYOUT, built once per make chance."""
+    return CourtMap(DEFAULT_LAYOUT._replace(make_chance=make_chance))
+
+
+def on_default_court(state):
+    """Whether `state` is played on default_court(), which replays and play logs need not store."""
+    return state.court is default_court(state.rules.shot_accuracy)
+
+
+def team_fields(court):
+    """{team: the HoopField of the hoop it attacks}; home attacks the second hoop."""
+    return {TEAM_HOME: court.fields[1], TEAM_AWAY: court.fields[0]}
+
+
+def log_play(state, kind, player=None, other=None, value=0, x=0, y=0):
+    """Adds a play to state.plays when the match keeps a play-by-play."""
+    if state.plays is not None:
+        state.plays.append(Play(state.tick, kind, NOBODY if player is None else player.number,
+                                NOBODY if other is None else other.number, value, x, y))
+
+
+def log_possession(state, player):
+    """Logs a POSSESSION play if `player`'s team did not already have the ball."""
+    if state.plays is not None and player.team != state.possession:
+        state.possession = player.team
+        log_play(state, POSSESSION, player, value=player.team, x=player.x, y=player.y)
+
+
+def other_team(team):
+    return TEAM_AWAY if team == TEAM_HOME else TEAM_HOME
+
+
+def human_order(team_size):
+    """(team, slot) of each human player in turn, alternating sides so two
+    humans face each other and four play two-on-two."""
+    return [(team, slot) for slot in range(team_size) for team in (TEAM_HOME, TEAM_AWAY)]
+
+
+def arc_spot(hoop, slot, team_size, radius=THREE_POINT_RADIUS):
+    """Where an attacker in `slot` waits for a pass: on the three-point arc,
+    with the team fanned out across it."""
+    spread = min(math.pi / 6, (2 * math.pi / 3) / max(team_size - 1, 1))
+    angle = (slot - (team_size - 1) / 2) * spread
+    facing = -1 if hoop[0] > 0 else 1 # Out from the hoop towards centre court
+    return (hoop[0] + facing * radius * math.cos(angle),
+            hoop[1] + radius * math.sin(angle))
+
+
+def formation(team, slot):
+    """Starting spot of a team's slot: columns of five, 100 apart across the
+    court around y = 0, the first 200 from centre and each next one 150
+    further back."""
+    column, row = divmod(slot, 5)
+    x = 200 + 150 * column
+    y = 100 * ((row + 1) // 2) * (1 if row % 2 else -1)
+    return (-x if team == TEAM_HOME else x), y
+
+
+# ==================================================================================
+# RULES
+# ==================================================================================
+def handle_shot(state, shooter, events):
+    """Releases the ball towards the shooter's hoop, records the shot type and
+    schedules its arrival."""
+    field = state.fields[shooter.team]
+    hoop = field.hoop
+    zone = field.zone(shooter.x, shooter.y)
+
+    is_dunk = zone == DUNK
+    is_3pt = bool(zone & THREE)
+
+    # Release ball
+    ball = state.ball
+    shooter.has_ball = False
+    ball.owner = None
+    ball.in_air = True
+    ball.target_hoop = hoop
+    ball.shot_data = (shooter.team, points(zone), is_dunk)
+    ball.shooter = shooter
+    ball.flight = Arc.shot(shooter.x, shooter.y, hoop)
+    ball.flight_start = state.scheduler.now
+    ball.x, ball.y, ball.z = shooter.x, shooter.y, RELEASE_HEIGHT
+    state.scheduler.start(shot_flight(state, shooter.x, shooter.y, events))
+
+    events.append(Event(SOUND, 'shoot', shooter.x, shooter.y, ball))
+    log_play(state, SHOT, shooter, value=SHOT_DUNK if is_dunk else SHOT_THREE if is_3pt else SHOT_TWO,
+             x=shooter.x, y=shooter.y)
+    return is_dunk, is_3pt
+
+
+def shot_flight(state, shooter_x, shooter_y, events):
+    """Scheduler sequence for a shot in the air: on the tick its arc reaches the
+    hoop it drops in or comes off the rim, and a miss flies its rebound arc
+    before the rebounder gathers it."""
+    ball = state.ball
+    events = yield arrival_ticks(ball.flight.hang_time, TICK_RATE) / TICK_RATE
+    if state.over:
+        return # The buzzer beat it
+
+    team, points, is_dunk = ball.shot_data
+    hoop = ball.target_hoop
+    ball.x, ball.y, ball.z = ball.flight.at(ball.flight.hang_time)
+    # Simple accuracy check
+    if state.rng.random() > 1 - state.rules.shot_accuracy:
+        ball.flight = None
+        log_play(state, MAKE, ball.shooter, value=points, x=hoop[0], y=hoop[1])
+        score_basket(state, team, points, is_dunk, events)
+        return
+
+    events.append(Event(SOUND, 'rim', hoop[0], hoop[1]))
+    log_play(state, MISS, ball.shooter, value=points, x=hoop[0], y=hoop[1])
+    if state.mode == MODE_PRACTICE:
+        ball.in_air = False
+        ball.flight = None
+        events.append(Event(SPEECH, "Miss."))
+        state.reset_positions()
+        log_possession(state, state.ball.owner)
+        return
+
+    ball.flight = Arc.rebound(hoop, shooter_x, shooter_y, state.rng)
+    ball.flight_start = state.scheduler.now
+    events = yield arrival_ticks(REBOUND_HANG, TICK_RATE) / TICK_RATE
+    if state.over:
+        return
+
+    ball.in_air = False
+    ball.flight = None
+    ball.owner = state.players[1] # Teammate gets rebound for simplicity
+    ball.owner.has_ball = True
+    log_play(state, REBOUND, ball.owner, x=ball.x, y=ball.y)
+    log_possession(state, ball.owner)
+    events.append(Event(SPEECH, "Miss. Teammate rebound."))
+
+
+def pass_ball(state, passer, receiver, events, announcement, priority=NORMAL):
+    passer.has_ball = False
+    state.ball.owner = receiver
+    receiver.has_ball = True
+    log_play(state, PASS, passer, receiver, x=passer.x, y=passer.y)
+    events.append(Event(SOUND, 'shoot', passer.x, passer.y)) # Pass sound (whoosh)
+    events.append(Event(SPEECH, announcement, priority=priority))
+
+
+def score_basket(state, team, points, is_dunk, events):
+    state.score[team] += points
+    state.ball.in_air = False
+    state.dead_ball = True
+    state.scheduler.start(celebrate(state, team, points, is_dunk, events))
+
+
+def celebrate(state, team, points, is_dunk, events):
+    """Scheduler sequence for a made basket. Play resumes when it ends."""
+    hoop = state.fields[team].hoop
+    if is_dunk:
+        events.append(Event(SOUND, 'dunk', hoop[0], hoop[1]))
+        # Let the dunk ring out before the net
+        events = yield DUNK_RING_OUT
+
+    events.append(Event(SOUND, 'net_nba', hoop[0], hoop[1]))
+    events.append(Event(SPEECH, f"Score! {points} points.", priority=CRITICAL))
+    events = yield CELEBRATION
+    state.reset_positions()
+
+    # Switch possession (give to other team) if not practice
+    if state.mode != MODE_PRACTICE:
+        if team == TEAM_HOME:
+            state.ball.owner = state.teams[TEAM_AWAY][0] # Away player
+        else:
+            state.ball.owner = state.players[0] # Home player
+
+        for p in state.players: p.has_ball = False
+        state.ball.owner.has_ball = True
+    log_possession(state, state.ball.owner)
+
+    # Each side hears the call from its own point of view
+    owner = state.ball.owner.team
+    events.append(Event(SPEECH, "Your ball", audience=tuple(state.teams[owner])))
+    events.append(Event(SPEECH, "Opponent ball", audience=tuple(state.teams[other_team(owner)])))
+    state.dead_ball = False
+
+
+def finish(state, events):
+    """Scheduler sequence for the final buzzer."""
+    events.append(Event(SOUND, 'buzzer'))
+    events.append(Event(SPEECH, "Game Over!", priority=CRITICAL))
+    events = yield GAME_OVER_PAUSE
+    events.append(Event(GAME_OVER))
+
+
+def step(state, inputs, profiler=None):
+    """Advances `state` by one tick in place and returns (state, events).
+
+    `inputs` is one Inputs for each of state.humans, in order; a single
+    Inputs will do for a one-human match. An optional
+    profiler.FrameProfiler gets laps for the rules, the ball and the AI
+    players.
+    """
+    events = []
+    state.scheduler.advance(events)
+    if state.over or state.dead_ball:
+        return state, events
+
+    controls = list(zip(state.humans, (inputs,) if isinstance(inputs, Inputs) else inputs))
+    ball = state.ball
+
+    # Human actions
+    for human, control in controls:
+        if control.shoot and human.has_ball:
+            handle_shot(state, human, events)
+        if control.pass_ball and human.has_ball and human.teammates:
+            receiver = human.teammates[0]
+            if len(human.teammates) > 1:
+                state.index.rebuild(state.players)
+                receiver = state.index.open_teammate(human, other_team(human.team))
+            pass_ball(state, human, receiver, events, "Pass to teammate")
+
+    if state.steal_cooldown > 0:
+        state.steal_cooldown -= 1
+
+    # Timer
+    state.tick += 1
+    if state.mode == MODE_PLAY:
+        if state.tick % TICK_RATE == 0:
+            state.time_remaining -= 1
+            log_play(state, CLOCK, value=max(state.time_remaining, 0))
+            if state.time_remaining <= 0:
+                state.over = True
+                log_play(state, END)
+                state.scheduler.start(finish(state, events))
+                return state, events
+
+    for human, control in controls:
+        # Movement
+        if control.move_x != 0 or control.move_y != 0:
+            human.x += control.move_x * PLAYER_SPEED
+            human.y += control.move_y * PLAYER_SPEED
+
+            # Dribble sound logic
+            if human.has_ball:
+                human.dribble_timer -= 1
+                if human.dribble_timer <= 0:
+                    events.append(Event(SOUND, 'dribble', human.x, human.y, human))
+                    human.dribble_timer = 15 # Faster dribble when moving
+
+        # Occasional beep, for this human only, while outside the 3-point line with the ball
+        if human.has_ball and state.fields[human.team].zone(human.x, human.y) & THREE:
+            if state.rng.random() < 0.01:
+                events.append(Event(SOUND, 'beep', audience=(human,)))
+
+    if profiler is not None:
+        profiler.lap(PHASE_RULES)
+
+    # Update Objects (a shot's arrival is already on the scheduler)
+    ball.update(state.scheduler.now)
+
+    if profiler is not None:
+        profiler.lap(PHASE_BALL)
+
+    # Up to CHASERS a side, everyone chases the ball and no index is needed
+    chasers = None
+    near_ball = ()
+    if state.team_size > CHASERS:
+        index = state.index
+        index.rebuild(state.players)
+        chasers = set(index.nearest(ball.x, ball.y, TEAM_HOME, CHASERS, exclude=ball.owner))
+        chasers.update(index.nearest(ball.x, ball.y, TEAM_AWAY, CHASERS, exclude=ball.owner))
+        near_ball = index.within(ball.x, ball.y, STEAL_RADIUS)
+
+    for p in state.players:
+        if state.mode == MODE_PRACTICE and p.team == TEAM_AWAY:
+            continue
+
+        action = p.update(ball, state.fields[p.team], events, state.rng, state.rules, state.index,
+                          chasers is None or p in chasers, p in near_ball)
+        if state.mode != MODE_PLAY:
+            continue
+
+        if action == "shoot":
+            handle_shot(state, p, events)
+
+        elif action == "steal":
+            if state.steal_cooldown <= 0 and ball.owner and ball.owner != p:
+                ball.owner.has_ball = False
+                log_play(state, STEAL, p, ball.owner, x=p.x, y=p.y)
+                ball.owner = p
+                p.has_ball = True
+                log_possession(state, p)
+                state.steal_cooldown = state.rules.steal_cooldown
+                events.append(Event(SPEECH, "Stolen!"))
+
+        elif action == "pass":
+            if p.has_ball and p.pass_target is not None:
+                pass_ball(state, p, p.pass_target, events, "AI Pass", CHATTER)
+
+    if profiler is not None:
+        profiler.lap(PHASE_AI)
+    return state, events
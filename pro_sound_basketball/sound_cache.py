@@ -0,0 +1,205 @@
+"""Persistent on-disk cache for procedurally generated sounds.
+
+Rendered PCM is appended to one flat data file that is memory-mapped for
+reads, with a small JSON index beside it. Entries are content-addressed: the
+key hashes the sound name, the synth routine and its parameters, the sample
+rate and synth.SYNTH_VERSION, so changing any of them simply misses; close()
+drops every entry no current recipe would look up. Hits only refresh an entry's
+last-used time in the saved index once it is LAST_USED_RESOLUTION old, so a
+warm start that renders nothing writes nothing.
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+
+from . import synth
+
+CACHE_DATA_FILE = "sound_cache.pcm"
+CACHE_INDEX_FILE = "sound_cache.json"
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+LAST_USED_RESOLUTION = 24 * 60 * 60 # Seconds; eviction order is only this precise
+
+
+def cache_key(name, routine, params, framerate=synth.SAMPLE_RATE):
+    blob = json.dumps([name, routine, params, framerate, synth.SYNTH_VERSION], sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class SoundCache:
+    """Content-addressed store of mono int16 PCM renders. load() is thread-safe."""
+
+    def __init__(self, directory=".", max_bytes=DEFAULT_MAX_BYTES):
+        self.data_path = os.path.join(directory, CACHE_DATA_FILE)
+        self.index_path = os.path.join(directory, CACHE_INDEX_FILE)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self._open()
+
+    # ------------------------------------------------------------------ storage
+    def _open(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") == CACHE_FORMAT:
+                self._entries = index.get("entries", {})
+        except (OSError, ValueError):
+            self._entries = {}
+
+        try:
+            size = os.path.getsize(self.data_path)
+        except OSError:
+            size = 0
+
+        # Drop anything the data file can no longer back (truncated or deleted)
+        valid = {k: e for k, e in self._entries.items() if e["offset"] + e["length"] <= size}
+        if len(valid) != len(self._entries):
+            self._entries = valid
+            self._dirty = True
+
+        if size:
+            self._file = open(self.data_path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read(self, entry):
+        view = memoryview(self._map)[entry["offset"]:entry["offset"] + entry["length"]]
+        if zlib.crc32(view) != entry["crc"]:
+            return None
+        if synth.np is not None:
+            return synth.np.frombuffer(view, dtype="<i2")
+        return bytes(view)
+
+    def _append(self, key, name, pcm):
+        data = pcm.tobytes() if hasattr(pcm, "tobytes") else bytes(pcm)
+        with open(self.data_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+        self._entries[key] = {
+            "name": name,
+            "offset": offset,
+            "length": len(data),
+            "crc": zlib.crc32(data),
+            "last_used": time.time(),
+        }
+        self._dirty = True
+
+    # ------------------------------------------------------------------ public
+    def get(self, key):
+        """Cached PCM for `key`, or None. Arrays are views into the mmap."""
+        entry = self._entries.get(key)
+        if entry is None or self._map is None or entry["offset"] + entry["length"] > len(self._map):
+            return None
+        pcm = self._read(entry)
+        if pcm is None:
+            del self._entries[key]
+            self._dirty = True
+        else:
+            now = time.time()
+            if now - entry["last_used"] >= LAST_USED_RESOLUTION:
+                self._dirty = True
+            entry["last_used"] = now
+        return pcm
+
+    def load(self, name):
+        """PCM for the synth recipe `name`, rendering and storing it on a miss."""
+        routine, params = synth.RECIPES[name]
+        key = cache_key(name, routine, params)
+
+        start = time.perf_counter()
+        with self._lock:
+            pcm = self.get(key)
+            if pcm is not None:
+                self.hits += 1
+                self.hit_time += time.perf_counter() - start
+                return pcm
+
+        pcm = synth.render(name)
+        with self._lock:
+            self._append(key, name, pcm)
+            self.misses += 1
+            self.miss_time += time.perf_counter() - start
+        return pcm
+
+    def size(self):
+        return sum(e["length"] for e in self._entries.values())
+
+    def close(self):
+        """Drops renders of recipes that have changed, evicts down to the size
+        cap, compacts the data file and saves the index.
+
+        Call once every Sound built from cached PCM exists: arrays returned by
+        get() point into the mapping that is released here. If one still
+        does, the data file is left uncompacted but the index is still saved.
+        """
+        mapped = False
+        if self._map is not None:
+            try:
+                self._map.close()
+                self._map = None
+                self._file.close()
+                self._file = None
+            except BufferError:
+                print("Sound cache still in use; saving its index without compacting")
+                mapped = True
+
+        current = {cache_key(name, *recipe) for name, recipe in synth.RECIPES.items()}
+        stale = [key for key in self._entries if key not in current]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+
+        if not self._dirty:
+            return
+
+        total = self.size()
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["length"]
+            del self._entries[key]
+
+        if not mapped:
+            self._compact() # Evicted data stays in the file until a close that can compact
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "entries": self._entries}, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+
+    def _compact(self):
+        """Rewrites the data file so it only holds live entries."""
+        try:
+            size = os.path.getsize(self.data_path)
+        except OSError:
+            return
+        if size == self.size():
+            return
+
+        tmp_path = self.data_path + ".tmp"
+        with open(self.data_path, "rb") as src, open(tmp_path, "wb") as dst:
+            for entry in sorted(self._entries.values(), key=lambda e: e["offset"]):
+                src.seek(entry["offset"])
+                data = src.read(entry["length"])
+                entry["offset"] = dst.tell()
+                dst.write(data)
+        os.replace(tmp_path, self.data_path)
+
+    def report(self):
+        print(f"Sound cache: {self.hits} hits ({self.hit_time * 1000:.1f} ms), "
+              f"{self.misses} misses ({self.miss_time * 1000:.1f} ms), "
+              f"{self.size() / 1024:.0f} KB of {self.max_bytes / 1024:.0f} KB")
@@ -0,0 +1,243 @@
+"""Single-file sound packs of pre-decoded PCM.
+
+A pack holds every sound the game needs, the custom sounds/*.ogg files and
+the generated fallbacks alike, already converted to the mixer's format
+(int16, 44.1 kHz, stereo) so nothing is decoded or synthesized at startup:
+the loader opens and memory-maps one file and hands out slices of it.
+
+Layout:
+  header   MAGIC, PACK_VERSION and the index length ("<8sII")
+  index    UTF-8 JSON: mixer format, the recipe fingerprint, the size and
+           modification time of every sounds/*.ogg it was built from, and
+           name -> offset, length and CRC-32 of the PCM
+  data     interleaved PCM per sound, each entry ALIGN-byte aligned
+
+A pack is stale, and the game loads sound by sound as before, when the
+mixer format differs, the synth recipes have changed or sounds/ no longer
+holds exactly the files the pack was built from. A pack dropped in without
+a sounds/ folder (a mod pack) is trusted as it is.
+
+Build one with
+
+    python -m pro_sound_basketball.sound_pack [--output sounds.pack] [--sounds sounds]
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import time
+import wave
+import zlib
+
+from . import synth
+
+PACK_FILE = "sounds.pack"
+MAGIC = b"PSBPACK\0"
+PACK_VERSION = 1
+HEADER = struct.Struct("<8sII")
+ALIGN = 16
+MIXER_FORMAT = (synth.SAMPLE_RATE, -16, 2) # As the game initializes the mixer
+
+
+def recipe_fingerprint():
+    blob = json.dumps([synth.RECIPES, synth.SYNTH_VERSION, synth.SAMPLE_RATE], sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def scan_sounds(directory="sounds"):
+    """{file name: [size, mtime_ns]} for every .ogg in `directory`, or None without one."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return None
+    files = {}
+    for entry in entries:
+        if entry.name.endswith(".ogg") and entry.is_file():
+            stat = entry.stat()
+            files[entry.name] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+# ==================================================================================
+# WRITING
+# ==================================================================================
+def write_pack(path, sounds, files, mixer_format=MIXER_FORMAT):
+    """Writes `sounds` (name -> raw PCM bytes in `mixer_format`) to `path`.
+
+    `files` is the scan_sounds() listing the PCM was decoded from.
+    """
+    entries = {}
+    offset = 0
+    for name, pcm in sounds.items():
+        entries[name] = {"offset": offset, "length": len(pcm), "crc": zlib.crc32(pcm)}
+        offset += -(-len(pcm) // ALIGN) * ALIGN
+
+    index = json.dumps({
+        "format": list(mixer_format),
+        "recipes": recipe_fingerprint(),
+        "files": files,
+        "entries": entries,
+    }).encode("utf-8")
+    start = -(-(HEADER.size + len(index)) // ALIGN) * ALIGN
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, PACK_VERSION, len(index)))
+        f.write(index)
+        for name, pcm in sounds.items():
+            f.seek(start + entries[name]["offset"])
+            f.write(pcm)
+        f.truncate(start + offset)
+    os.replace(tmp_path, path)
+    return start + offset
+
+
+# ==================================================================================
+# READING
+# ==================================================================================
+class SoundPack:
+    """A memory-mapped pack. load(name) returns a read-only view of its PCM."""
+
+    def __init__(self, path=PACK_FILE):
+        self.path = path
+        self.open_time = 0.0
+        self.loaded = 0
+
+        start = time.perf_counter()
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_length = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != PACK_VERSION:
+                raise ValueError(f"not a version {PACK_VERSION} sound pack")
+            index = json.loads(bytes(self._map[HEADER.size:HEADER.size + index_length]).decode("utf-8"))
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise ValueError(f"{path}: {e}") from None
+        self.index = index
+        self.entries = index["entries"]
+        self._start = -(-(HEADER.size + index_length) // ALIGN) * ALIGN
+        self.open_time = time.perf_counter() - start
+
+    @classmethod
+    def open_verified(cls, mixer_format, path=PACK_FILE, directory="sounds"):
+        """The pack at `path` if it is usable with the current sounds, else None."""
+        if not os.path.exists(path):
+            return None
+        try:
+            pack = cls(path)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring sound pack: {e}")
+            return None
+        problem = pack.stale(mixer_format, directory)
+        if problem:
+            print(f"Sound pack is stale ({problem}); loading sounds one by one. "
+                  f"Rebuild it with: python -m pro_sound_basketball.sound_pack")
+            pack.close()
+            return None
+        return pack
+
+    def stale(self, mixer_format, directory="sounds"):
+        """Why the pack cannot be used as it is, or None."""
+        if mixer_format is None or tuple(mixer_format[:3]) != tuple(self.index["format"]):
+            return f"built for mixer format {tuple(self.index['format'])}"
+        if self.index["recipes"] != recipe_fingerprint():
+            return "the built-in sounds have changed"
+        files = scan_sounds(directory)
+        if files is not None and files != self.index["files"]:
+            return f"{directory}/ has changed"
+        return None
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def has_file(self, name):
+        """Whether `name` was packed from sounds/{name}.ogg rather than synthesized."""
+        return name in self.entries and f"{name}.ogg" in self.index["files"]
+
+    def load(self, name):
+        """The PCM of `name` as a memoryview into the mapping, or None if it is
+        missing or corrupt."""
+        entry = self.entries.get(name)
+        if entry is None or self._map is None:
+            return None
+        start = self._start + entry["offset"]
+        if start + entry["length"] > len(self._map):
+            return None
+        view = memoryview(self._map)[start:start + entry["length"]]
+        if zlib.crc32(view) != entry["crc"]:
+            view.release()
+            return None
+        self.loaded += 1
+        return view
+
+    def size(self):
+        return sum(e["length"] for e in self.entries.values())
+
+    def close(self):
+        """Unmaps the pack. Every Sound made from it must already exist."""
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                return # A view is still alive; the mapping goes with the process
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def report(self):
+        print(f"Sound pack: {self.loaded} of {len(self.entries)} sounds from {self.path} "
+              f"({self.size() / 1024:.0f} KB, opened in {self.open_time * 1000:.1f} ms)")
+
+
+# ==================================================================================
+# BUILDER
+# ==================================================================================
+def _mono_wav(pcm, framerate=synth.SAMPLE_RATE):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(pcm.tobytes() if hasattr(pcm, "tobytes") else bytes(pcm))
+    buffer.seek(0)
+    return buffer
+
+
+def build(path=PACK_FILE, directory="sounds"):
+    """Decodes sounds/*.ogg and renders every recipe without one, at MIXER_FORMAT."""
+    import pygame
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init(frequency=MIXER_FORMAT[0], size=MIXER_FORMAT[1], channels=MIXER_FORMAT[2])
+    files = scan_sounds(directory) or {}
+    sounds = {}
+    for file_name in sorted(files):
+        sounds[file_name[:-len(".ogg")]] = pygame.mixer.Sound(os.path.join(directory, file_name)).get_raw()
+    for name in synth.RECIPES:
+        if name not in sounds:
+            # pygame converts the mono WAV to the mixer's format
+            sounds[name] = pygame.mixer.Sound(_mono_wav(synth.render(name))).get_raw()
+    size = write_pack(path, sounds, files, pygame.mixer.get_init())
+    pygame.mixer.quit()
+    return sounds, size
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Build a Pro Sound Basketball sound pack")
+    parser.add_argument("--output", default=PACK_FILE, help=f"pack to write (default {PACK_FILE})")
+    parser.add_argument("--sounds", default="sounds", help="folder of custom .ogg files")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    sounds, size = build(args.output, args.sounds)
+    print(f"Wrote {len(sounds)} sounds to {args.output} ({size / 1024:.0f} KB) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Lazy, concurrent sound loading.
+
+The registry hands out SoundHandle objects straight away and decodes or
+synthesizes the real pygame Sounds in the background: menu sounds on their
+own priority worker, everything else on a thread pool. Asking a handle for
+its Sound before it is ready blocks on that one sound only.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+PRIORITY_SOUNDS = ('menuclick', 'menuenter')
+DEFAULT_WORKERS = 4
+
+
+class SoundHandle:
+    """Stands in for a pygame Sound until the real one has loaded."""
+
+    def __init__(self, name, registry):
+        self.name = name
+        self._registry = registry
+        self._future = None
+
+    def ready(self):
+        return self._future is not None and self._future.done()
+
+    def get(self):
+        """The loaded Sound, waiting for it if it is still in flight."""
+        if not self.ready():
+            start = time.perf_counter()
+            sound = self._future.result()
+            self._registry._record_block(self.name, time.perf_counter() - start)
+            return sound
+        return self._future.result()
+
+    def play(self, *args, **kwargs):
+        return self.get().play(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # stop(), get_length(), set_volume() ... go to the real Sound
+        return getattr(self.get(), attr)
+
+
+class AssetTiming:
+    __slots__ = ('name', 'lane', 'queued', 'started', 'finished', 'blocked', 'error')
+
+    def __init__(self, name, lane, queued):
+        self.name = name
+        self.lane = lane
+        self.queued = queued
+        self.started = None
+        self.finished = None
+        self.blocked = 0.0
+        self.error = None
+
+
+class SoundRegistry:
+    """Maps sound names to SoundHandles that load on worker threads.
+
+    `loader(name)` must return a pygame Sound and is called on a worker.
+    `on_complete(registry)` runs once, on a worker, after every sound has loaded.
+    """
+
+    def __init__(self, names, loader, priority=PRIORITY_SOUNDS, workers=DEFAULT_WORKERS, on_complete=None):
+        self.loader = loader
+        self.on_complete = on_complete
+        self.created = time.perf_counter()
+
+        self._handles = {name: SoundHandle(name, self) for name in names}
+        self._timings = {}
+        self._lock = threading.Lock()
+        self._pending = len(self._handles)
+        self._priority_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sound-priority")
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sound-loader")
+
+        ordered = [n for n in priority if n in self._handles]
+        ordered += [n for n in self._handles if n not in priority]
+        for name in ordered:
+            lane = "priority" if name in priority else "background"
+            pool = self._priority_pool if lane == "priority" else self._pool
+            self._timings[name] = AssetTiming(name, lane, time.perf_counter())
+            self._handles[name]._future = pool.submit(self._load, name)
+
+    def _load(self, name):
+        timing = self._timings[name]
+        timing.started = time.perf_counter()
+        try:
+            return self.loader(name)
+        except Exception as e:
+            timing.error = e
+            raise
+        finally:
+            timing.finished = time.perf_counter()
+            with self._lock:
+                self._pending -= 1
+                done = self._pending == 0
+            if done and self.on_complete:
+                self.on_complete(self)
+
+    def _record_block(self, name, seconds):
+        self._timings[name].blocked += seconds
+
+    def replace(self, name, sound):
+        """Swaps a new Sound in behind `name`'s handle; every holder of the handle gets it from now on."""
+        future = Future()
+        future.set_result(sound)
+        self._handles[name]._future = future
+
+    # Dict-style access so the registry drops in where self.sounds was a dict
+    def __getitem__(self, name):
+        return self._handles[name]
+
+    def __contains__(self, name):
+        return name in self._handles
+
+    def __iter__(self):
+        return iter(self._handles)
+
+    def keys(self):
+        return self._handles.keys()
+
+    def wait_all(self):
+        for handle in self._handles.values():
+            handle.get()
+
+    def shutdown(self, wait=False):
+        """Stops the workers. With wait, lets queued loads and on_complete finish."""
+        self._priority_pool.shutdown(wait=wait, cancel_futures=not wait)
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def report(self):
+        """Prints when each asset was queued, loaded and waited on, in ms since creation."""
+        print(f"{'sound':<12}{'lane':<12}{'wait':>8}{'load':>8}{'ready':>8}{'blocked':>9}")
+        for t in sorted(self._timings.values(), key=lambda t: t.finished or float("inf")):
+            if t.finished is None:
+                print(f"{t.name:<12}{t.lane:<12}{'pending':>8}")
+                continue
+            wait = (t.started - t.queued) * 1000
+            load = (t.finished - t.started) * 1000
+            ready = (t.finished - self.created) * 1000
+            status = f"  failed: {t.error}" if t.error else ""
+            print(f"{t.name:<12}{t.lane:<12}{wait:>8.1f}{load:>8.1f}{ready:>8.1f}{t.blocked * 1000:>9.1f}{status}")
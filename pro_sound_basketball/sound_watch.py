@@ -0,0 +1,160 @@
+"""Hot reloading of custom sounds while the game runs.
+
+SoundWatcher polls sounds/ on its own thread, comparing each .ogg's size
+and modification time with the last look. A file that changed, appeared
+or disappeared belongs to an effect: dribble.ogg and the custom variants
+dribble_1.ogg, dribble_2.ogg ... all to dribble. An effect is reloaded
+once none of its files has changed for `debounce` seconds, so an editor
+writing a file in bursts (or a batch export touching several) costs one
+reload, not one per write.
+
+The reload itself, `decode(name)`, runs on the watcher thread too and
+returns whatever the game needs to swap in. Finished reloads wait in a
+queue until the game takes them between frames with take(), which never
+blocks; swapped() then stamps and prints the time each one took.
+"""
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from .sound_pack import scan_sounds
+
+POLL_INTERVAL = 0.1 # Seconds between looks at the directory
+DEBOUNCE = 0.3      # Seconds an effect's files must stay unchanged before it reloads
+
+_VARIANT_FILE = re.compile(r"(.+)_\d+$")
+
+
+class Reload:
+    """One effect's reload, from the first change seen to the swap."""
+
+    __slots__ = ("name", "files", "removed", "first_change", "last_change", "decoded",
+                 "decode_time", "result", "error", "swapped")
+
+    def __init__(self, name, files, removed, first_change, last_change):
+        self.name = name
+        self.files = files               # Changed file names, sorted
+        self.removed = removed           # The effect's own file is gone: back to the generator
+        self.first_change = first_change # perf_counter() when a change was first seen
+        self.last_change = last_change   # ... and last seen
+        self.decoded = None              # perf_counter() when decode() returned
+        self.decode_time = 0.0
+        self.result = None               # What decode() returned
+        self.error = None
+        self.swapped = None              # perf_counter() when the game swapped it in
+
+    def describe(self):
+        source = "generated sound" if self.removed else "sounds/" + ", sounds/".join(self.files)
+        if self.error is not None:
+            return f"Reload of {self.name} failed, keeping the old sound: {self.error}"
+        return (f"Reloaded {self.name} from {source}: decoded in {self.decode_time * 1000:.1f} ms, "
+                f"playing {(self.swapped - self.last_change) * 1000:.0f} ms after the last change")
+
+
+class SoundWatcher:
+    """Watches `directory` for the effects in `names`.
+
+    `varied` names may also have numbered custom variant files. The first
+    listing is taken when the watcher is created, so changes made before
+    start() are picked up on the first poll.
+    """
+
+    def __init__(self, directory, names, decode, varied=(), interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        self.directory = directory
+        self.names = frozenset(names)
+        self.varied = frozenset(varied)
+        self.decode = decode
+        self.interval = interval
+        self.debounce = debounce
+
+        self.reloads = [] # Swapped-in or failed Reloads, oldest first
+        self._files = self._scan() or {}
+        self._settling = {} # name -> (first change, last change, changed file names)
+        self._done = deque() # Decoded Reloads waiting for the game thread
+        self._stop = threading.Event()
+        self._thread = None
+
+    def effect_of(self, filename):
+        """The effect `filename` belongs to, or None if it is not one of ours."""
+        stem, ext = os.path.splitext(filename)
+        if ext != ".ogg":
+            return None
+        if stem in self.names:
+            return stem
+        match = _VARIANT_FILE.match(stem)
+        if match and match.group(1) in self.varied:
+            return match.group(1)
+        return None
+
+    def _scan(self):
+        try:
+            files = scan_sounds(self.directory)
+        except OSError:
+            return None # A file vanished mid-listing; look again next time
+        if files is None:
+            return {}
+        return {name: tuple(stat) for name, stat in files.items() if self.effect_of(name) is not None}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sound-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll(time.perf_counter())
+
+    def poll(self, now):
+        """Notes what changed since the last poll and reloads every effect that has settled."""
+        files = self._scan()
+        if files is not None:
+            for filename in files.keys() | self._files.keys():
+                if files.get(filename) != self._files.get(filename):
+                    name = self.effect_of(filename)
+                    first, _, changed = self._settling.get(name, (now, now, set()))
+                    changed.add(filename)
+                    self._settling[name] = (first, now, changed)
+            self._files = files
+
+        for name in [name for name, (_, last, _) in self._settling.items() if now - last >= self.debounce]:
+            first, last, changed = self._settling.pop(name)
+            removed = f"{name}.ogg" not in self._files
+            self._reload(Reload(name, tuple(sorted(changed)), removed, first, last))
+
+    def _reload(self, reload):
+        start = time.perf_counter()
+        try:
+            reload.result = self.decode(reload.name)
+        except Exception as e:
+            reload.error = e
+        reload.decoded = time.perf_counter()
+        reload.decode_time = reload.decoded - start
+        self._done.append(reload)
+
+    def take(self):
+        """The reloads decoded since the last call; for the game thread, never blocks."""
+        done = []
+        while self._done:
+            done.append(self._done.popleft())
+        return done
+
+    def swapped(self, reload):
+        """Records that `reload` is now playing (or has failed) and says so."""
+        reload.swapped = time.perf_counter()
+        self.reloads.append(reload)
+        print(reload.describe())
+
+    def report(self):
+        if not self.reloads:
+            return
+        print(f"{'reloaded':<12}{'files':>6}{'decode':>9}{'settle':>9}{'total':>9}")
+        for r in self.reloads:
+            status = "  failed" if r.error is not None else "  generated" if r.removed else ""
+            print(f"{r.name:<12}{len(r.files):>6}{r.decode_time * 1000:>9.1f}"
+                  f"{(r.last_change - r.first_change) * 1000:>9.0f}{(r.swapped - r.first_change) * 1000:>9.0f}{status}")
@@ -0,0 +1,162 @@
+"""Positional audio on the court.
+
+A source at (x, y) is heard by a listener at (x, y, facing) through stereo
+gains that combine:
+  - equal-power panning by the source's bearing
+  - distance attenuation scaled to the court (half volume at a quarter of
+    its length, never below MIN_GAIN)
+  - a front/back cue: sources behind the listener are quieter
+  - height: a source above or below ear level (a ball in flight) is that
+    much further away, keeping its bearing
+
+All of that is computed once into a lookup table over listener-relative
+offsets on a CELL-sized grid. A gain lookup is then a rotation by the
+listener's facing (cosine and sine are cached when the listener turns) and
+one table read, so re-panning every playing sound every frame costs next to
+nothing.
+
+Facing is in radians, clockwise, with 0 looking up the court (towards -y),
+which keeps +x on the listener's right as the old x-only panning had it.
+"""
+import math
+from array import array
+
+from .simulation import COURT_HEIGHT, COURT_WIDTH
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+CELL = 16                            # Table resolution in court units
+ROLLOFF_DISTANCE = COURT_WIDTH / 4   # Distance at which a source is at half volume
+MIN_GAIN = 0.1
+BACK_GAIN = 0.6                      # Extra gain for a source directly behind
+EAR_HEIGHT = 145                     # Listener's ears above the floor, about 1.7 m
+
+FACING_UP = 0.0
+
+
+class Listener:
+    __slots__ = ("x", "y", "facing", "cos", "sin")
+
+    def __init__(self, x=0.0, y=0.0, facing=FACING_UP):
+        self.x = x
+        self.y = y
+        self.facing = None
+        self.turn(facing)
+
+    def move(self, x, y):
+        self.x = x
+        self.y = y
+
+    def turn(self, facing):
+        if facing != self.facing:
+            self.facing = facing
+            self.cos = math.cos(facing)
+            self.sin = math.sin(facing)
+
+
+def _gain_pair(right, forward):
+    """(left, right) gains for an offset in the listener's frame."""
+    dist = math.hypot(right, forward)
+    if dist == 0:
+        return math.sqrt(0.5), math.sqrt(0.5)
+    pan = right / dist
+    level = max(MIN_GAIN, 1.0 / (1.0 + dist / ROLLOFF_DISTANCE))
+    if forward < 0:
+        level *= 1.0 - (1.0 - BACK_GAIN) * (-forward / dist)
+    angle = (pan + 1.0) * math.pi / 4
+    return level * math.cos(angle), level * math.sin(angle)
+
+
+class GainTable:
+    """(left, right) gains for listener-relative offsets out to `reach`."""
+
+    def __init__(self, reach=math.hypot(COURT_WIDTH, COURT_HEIGHT), cell=CELL):
+        self.cell = cell
+        self.half = int(math.ceil(reach / cell))
+        self.size = 2 * self.half + 1
+        self.gains = None # Interleaved left/right, row-major by forward offset
+
+    def build(self):
+        if self.gains is not None:
+            return
+        offsets = [(i - self.half) * self.cell for i in range(self.size)]
+        if np is not None:
+            right = np.array(offsets, dtype=np.float64)[None, :]
+            forward = np.array(offsets, dtype=np.float64)[:, None]
+            dist = np.hypot(right, forward)
+            safe = np.where(dist > 0, dist, 1.0)
+            pan = np.where(dist > 0, right / safe, 0.0)
+            level = np.maximum(MIN_GAIN, 1.0 / (1.0 + dist / ROLLOFF_DISTANCE))
+            level = level * np.where(forward < 0, 1.0 - (1.0 - BACK_GAIN) * (-forward / safe), 1.0)
+            angle = (pan + 1.0) * math.pi / 4
+            pairs = np.stack([level * np.cos(angle), level * np.sin(angle)], axis=-1)
+            self.gains = array("f", pairs.astype(np.float32).tobytes())
+        else:
+            gains = array("f")
+            for forward in offsets:
+                for right in offsets:
+                    gains.extend(_gain_pair(right, forward))
+            self.gains = gains
+
+    def lookup(self, right, forward):
+        half, size = self.half, self.size
+        col = int(round(right / self.cell)) + half
+        row = int(round(forward / self.cell)) + half
+        col = 0 if col < 0 else size - 1 if col >= size else col
+        row = 0 if row < 0 else size - 1 if row >= size else row
+        index = 2 * (row * size + col)
+        return self.gains[index], self.gains[index + 1]
+
+
+class SpatialAudio:
+    """Pans sounds for one listener and keeps moving sources panned.
+
+    gains(x, y, z) gives the (left, right) volumes for a sound at (x, y),
+    z above the floor if given. A channel registered with track() is
+    re-panned to follow its source (anything with x and y, such as a Player,
+    or with z too, like the Ball) on every update() until the sound ends.
+    """
+
+    def __init__(self, table=None):
+        self.table = table or GainTable()
+        self.listener = Listener()
+        self.tracked = [] # (channel, sound, source)
+
+    def gains(self, x, y, z=None):
+        if self.table.gains is None:
+            self.table.build()
+        listener = self.listener
+        dx = x - listener.x
+        dy = y - listener.y
+        right = dx * listener.cos + dy * listener.sin
+        forward = dx * listener.sin - dy * listener.cos
+        if z is not None and z != EAR_HEIGHT:
+            # Stretch the offset to the full 3D distance; straight overhead counts as ahead
+            flat = math.hypot(right, forward)
+            if flat > 0:
+                scale = math.hypot(flat, z - EAR_HEIGHT) / flat
+                right *= scale
+                forward *= scale
+            else:
+                forward = abs(z - EAR_HEIGHT)
+        return self.table.lookup(right, forward)
+
+    def track(self, channel, sound, source):
+        self.tracked.append((channel, sound, source))
+
+    def update(self):
+        """Re-pans tracked channels; forgets those whose sound has ended."""
+        if not self.tracked:
+            return
+        still_playing = []
+        for channel, sound, source in self.tracked:
+            if channel.get_sound() is sound:
+                channel.set_volume(*self.gains(source.x, source.y, getattr(source, "z", None)))
+                still_playing.append((channel, sound, source))
+        self.tracked = still_playing
+
+    def clear(self):
+        self.tracked = []
@@ -0,0 +1,255 @@
+"""Asynchronous, prioritized speech.
+
+SpeechQueue looks like a screen-reader output (it has speak(text,
+interrupt)) but only enqueues: a worker thread makes the real backend call,
+so a TTS engine that blocks for tens of milliseconds never holds up the
+frame loop.
+
+Queueing rules:
+  - Priorities are CRITICAL (score, game over), NORMAL and CHATTER (AI
+    passes). The worker always takes the most urgent message first.
+  - A message identical to one still pending is dropped. One spoken less
+    than `window` seconds ago is dropped too (coalesced) if it is chatter
+    or was the last thing said, so a burst of "Stolen!" is said once but
+    a menu item revisited after another one is still read.
+  - An interrupting message supersedes pending messages of the same or
+    lower priority, which it would have cut off anyway.
+  - After a CRITICAL message, anything less urgent is spoken without
+    interrupting for `window` seconds, so chatter cannot cut it off.
+  - The queue holds at most `max_pending` messages; when full, the least
+    urgent, oldest one is dropped.
+
+The backend can be given directly or as a factory, which is then called on
+the worker thread (COM-based backends want to live on the thread that uses
+them). If the factory raises, the queue closes and the next speak() or
+flush() raises SpeechError on the caller's thread, so a game without
+speech stops loudly instead of going silent. FakeBackend records calls and
+can simulate a slow engine, so the queue can be tested without a real one.
+"""
+import threading
+import time
+from collections import deque
+
+from .profiler import percentile
+
+CRITICAL = 0
+NORMAL = 1
+CHATTER = 2
+PRIORITY_NAMES = ("critical", "normal", "chatter")
+
+DEFAULT_WINDOW = 1.0 # Seconds
+DEFAULT_MAX_PENDING = 8
+LATENCY_SAMPLES = 512
+
+
+class FakeBackend:
+    """Stands in for a TTS engine. `delay` seconds are spent in every call."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = [] # (text, interrupt, perf_counter at the call)
+
+    def speak(self, text, interrupt=True):
+        self.calls.append((text, interrupt, time.perf_counter()))
+        if self.delay:
+            time.sleep(self.delay)
+
+    @property
+    def spoken(self):
+        return [text for text, _, _ in self.calls]
+
+
+class SpeechError(RuntimeError):
+    """The speech backend could not be started."""
+
+
+class _Message:
+    __slots__ = ("text", "interrupt", "priority", "queued", "order", "on_spoken")
+
+    def __init__(self, text, interrupt, priority, queued, order, on_spoken=None):
+        self.text = text
+        self.interrupt = interrupt
+        self.priority = priority
+        self.queued = queued
+        self.order = order
+        self.on_spoken = on_spoken
+
+
+class SpeechQueue:
+    def __init__(self, backend=None, factory=None, window=DEFAULT_WINDOW,
+                 max_pending=DEFAULT_MAX_PENDING, clock=time.perf_counter):
+        if (backend is None) == (factory is None):
+            raise ValueError("give exactly one of backend or factory")
+        self.backend = backend
+        self.window = window
+        self.max_pending = max_pending
+        self.clock = clock
+
+        self._factory = factory
+        self._pending = []
+        self._order = 0
+        self._recent = {}          # text -> time it was last spoken
+        self._last_text = None
+        self._critical_until = 0.0 # Less urgent speech may not interrupt before this
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self.error = None # What the factory raised, if it did
+
+        # Metrics
+        self.first_speech = None
+        self.spoken = [0, 0, 0] # Per priority
+        self.deduped = 0
+        self.coalesced = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.latency = deque(maxlen=LATENCY_SAMPLES)   # Enqueue to backend call, seconds
+        self.call_time = deque(maxlen=LATENCY_SAMPLES) # Time spent inside the backend
+
+        self._thread = threading.Thread(target=self._run, name="speech", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------ game thread
+    def _check(self):
+        if self.error is not None:
+            raise SpeechError(f"speech backend failed to start: {self.error!r}") from self.error
+
+    def speak(self, text, interrupt=True, priority=NORMAL, on_spoken=None):
+        """Queues `text` and returns immediately. `on_spoken(time)` is called on
+        the worker, with the clock's time, just before the backend speaks it;
+        never if the message is merged, superseded or dropped."""
+        now = self.clock()
+        with self._cond:
+            self._check()
+            if self._closed:
+                return
+            if any(m.text == text for m in self._pending):
+                self.deduped += 1
+                return
+            last = self._recent.get(text)
+            if (last is not None and now - last < self.window
+                    and (priority == CHATTER or text == self._last_text)):
+                self.coalesced += 1
+                return
+
+            if interrupt:
+                kept = [m for m in self._pending if m.priority < priority]
+                self.superseded += len(self._pending) - len(kept)
+                self._pending = kept
+            if len(self._pending) >= self.max_pending:
+                victim = max(self._pending, key=lambda m: (m.priority, -m.order))
+                if victim.priority < priority:
+                    self.dropped += 1 # Everything queued is more urgent than this
+                    return
+                self._pending.remove(victim)
+                self.dropped += 1
+
+            self._order += 1
+            self._pending.append(_Message(text, interrupt, priority, now, self._order, on_spoken))
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self, timeout=None):
+        """Waits until every queued message has been handed to the backend."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._check()
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+                self._check()
+        return True
+
+    def close(self, flush=True, timeout=1.0):
+        if flush and self.error is None:
+            self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    # ------------------------------------------------------------------ worker thread
+    def _next(self):
+        with self._cond:
+            self._busy = False
+            self._cond.notify_all()
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            message = min(self._pending, key=lambda m: (m.priority, m.order))
+            self._pending.remove(message)
+            self._busy = True
+            return message
+
+    def _run(self):
+        if self._factory is not None:
+            try:
+                self.backend = self._factory()
+            except Exception as e:
+                # Nothing can be spoken: close, and let the game thread raise it
+                with self._cond:
+                    self.error = e
+                    self._closed = True
+                    self._pending.clear()
+                    self._cond.notify_all()
+                return
+        while True:
+            message = self._next()
+            if message is None:
+                return
+            start = self.clock()
+            interrupt = message.interrupt
+            if message.priority == CRITICAL:
+                self._critical_until = start + self.window
+            elif start < self._critical_until:
+                interrupt = False
+
+            self.latency.append(start - message.queued)
+            if self.first_speech is None:
+                self.first_speech = start
+            if message.on_spoken is not None:
+                message.on_spoken(start)
+            try:
+                self.backend.speak(message.text, interrupt=interrupt)
+            except Exception as e:
+                print(f"Speech failed: {e}")
+            end = self.clock()
+            self.call_time.append(end - start)
+            self.spoken[message.priority] += 1
+            with self._cond:
+                self._recent[message.text] = end
+                self._last_text = message.text
+                if len(self._recent) > 64:
+                    cutoff = end - self.window
+                    self._recent = {t: when for t, when in self._recent.items() if when >= cutoff}
+
+    # ------------------------------------------------------------------ reporting
+    def stats(self):
+        latency = sorted(self.latency)
+        call_time = sorted(self.call_time)
+        return {
+            "spoken": dict(zip(PRIORITY_NAMES, self.spoken)),
+            "deduped": self.deduped,
+            "coalesced": self.coalesced,
+            "superseded": self.superseded,
+            "dropped": self.dropped,
+            "latency_ms": {"p50": percentile(latency, 0.50) * 1000,
+                           "p95": percentile(latency, 0.95) * 1000,
+                           "max": (latency[-1] if latency else 0.0) * 1000},
+            "backend_ms": {"p50": percentile(call_time, 0.50) * 1000,
+                           "max": (call_time[-1] if call_time else 0.0) * 1000},
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Speech: {sum(self.spoken)} spoken, {s['deduped'] + s['coalesced']} merged, "
+                f"{s['superseded']} superseded, {s['dropped']} dropped; "
+                f"queue latency p50 {s['latency_ms']['p50']:.1f} ms, p95 {s['latency_ms']['p95']:.1f} ms; "
+                f"backend p50 {s['backend_ms']['p50']:.1f} ms")
@@ -0,0 +1,65 @@
+"""Lazy, timed start-up of the mixer, the window and the screen reader.
+
+Importing the package starts none of them, and the game rules never need
+them. Each starts the first time the game asks for it:
+
+  mixer    when a Game is created, since its sounds start loading at once
+  display  when Game.run() opens the window, which keyboard input needs
+  speech   on the speech thread, which only then imports accessible_output2
+           and probes for a screen reader
+
+TIMES holds the seconds each took, in the order they started, and report()
+says so in one line.
+"""
+import time
+from contextlib import contextmanager
+
+from .sound_pack import MIXER_FORMAT
+
+MIXER_BUFFER = 512 # Samples; small, so sounds start promptly
+WINDOW_SIZE = (800, 600)
+WINDOW_CAPTION = "Pro Sound Basketball"
+
+TIMES = {} # Subsystem -> seconds it took to start
+
+
+@contextmanager
+def timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMES[name] = time.perf_counter() - start
+
+
+def start_mixer():
+    """pygame.mixer, initialized at the game's format if it is not already."""
+    import pygame
+    if not pygame.mixer.get_init():
+        with timed("mixer"):
+            frequency, size, channels = MIXER_FORMAT
+            pygame.mixer.init(frequency=frequency, size=size, channels=channels, buffer=MIXER_BUFFER)
+    return pygame.mixer
+
+
+def open_window():
+    """The game window, opened (with the display) on the first call."""
+    import pygame
+    surface = pygame.display.get_surface()
+    if surface is None:
+        with timed("display"):
+            pygame.display.init()
+            surface = pygame.display.set_mode(WINDOW_SIZE)
+            pygame.display.set_caption(WINDOW_CAPTION)
+    return surface
+
+
+def screen_reader():
+    """A new accessible_output2 Auto output; a SpeechQueue factory."""
+    with timed("speech"):
+        from accessible_output2.outputs.auto import Auto
+        return Auto()
+
+
+def report():
+    return "Startup: " + ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in TIMES.items())
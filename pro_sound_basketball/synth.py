@@ -0,0 +1,219 @@
+"""Sample synthesis for the procedurally generated sound effects.
+
+Every routine returns mono, signed 16-bit PCM at SAMPLE_RATE. With NumPy
+installed the samples are built as whole arrays (an int16 ndarray); without
+it the original per-sample loops run and a bytearray is returned instead.
+"""
+import math
+import random
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+SAMPLE_RATE = 44100
+# Bump whenever a routine or recipe changes what it outputs; cached renders
+# from older versions are then ignored.
+SYNTH_VERSION = 1
+MAX_AMPLITUDE = 32767
+
+BACKEND_NUMPY = "numpy"
+BACKEND_PYTHON = "python"
+DEFAULT_BACKEND = BACKEND_NUMPY if np is not None else BACKEND_PYTHON
+
+
+def _resolve(backend):
+    backend = backend or DEFAULT_BACKEND
+    if backend == BACKEND_NUMPY and np is None:
+        return BACKEND_PYTHON
+    return backend
+
+
+# ==================================================================================
+# VECTORIZED PRIMITIVES (NumPy only)
+# ==================================================================================
+def timeline(duration, framerate=SAMPLE_RATE):
+    """Sample times in seconds for a clip of the given duration."""
+    n_frames = int(framerate * duration)
+    return np.arange(n_frames, dtype=np.float64) / framerate
+
+
+def linear_decay(n_frames):
+    """Envelope falling linearly from 1 towards 0 over n_frames."""
+    return 1.0 - np.arange(n_frames, dtype=np.float64) / max(n_frames, 1)
+
+
+def sine(frequency, t):
+    return np.sin(2 * math.pi * frequency * t)
+
+
+def square(frequency, t):
+    return np.where(sine(frequency, t) > 0, 1.0, -1.0)
+
+
+def sweep(start_freq, end_freq, t, duration):
+    """Sine whose instantaneous frequency moves linearly from start to end."""
+    rate = (end_freq - start_freq) / duration
+    return np.sin(2 * math.pi * (start_freq * t + 0.5 * rate * t * t))
+
+
+def modulate(signal, frequency, t, depth=0.5):
+    """Amplitude modulation: scales the signal by (1 - depth) + depth * sin."""
+    return signal * ((1.0 - depth) + depth * sine(frequency, t))
+
+
+def white_noise(n_frames, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    return rng.random(n_frames) * 2 - 1
+
+
+def to_pcm(signal, volume=1.0):
+    """Scales a [-1, 1] float signal to int16, truncating like int() does."""
+    return (signal * (MAX_AMPLITUDE * volume)).astype(np.int16)
+
+
+# ==================================================================================
+# SOUND ROUTINES
+# ==================================================================================
+def tone(frequency, duration, volume=0.5, backend=None):
+    if _resolve(backend) == BACKEND_NUMPY:
+        return to_pcm(sine(frequency, timeline(duration)), volume)
+
+    framerate = SAMPLE_RATE
+    n_frames = int(framerate * duration)
+    data = bytearray()
+    for i in range(n_frames):
+        t = i / framerate
+        val = int(MAX_AMPLITUDE * volume * math.sin(2 * math.pi * frequency * t))
+        data.extend(struct.pack('<h', val))
+    return data
+
+
+def noise(duration, volume=0.5, decay=False, pitch_shift=1.0, seed=None, backend=None):
+    """White noise burst. pitch_shift below 1 lowers it: fewer random points,
+    joined by straight lines, so the noise gets darker. A seed makes the
+    render repeatable."""
+    if _resolve(backend) == BACKEND_NUMPY:
+        n_frames = int(SAMPLE_RATE * duration)
+        rng = np.random.default_rng(seed) if seed is not None else None
+        if pitch_shift < 1.0:
+            points = white_noise(max(2, int(n_frames * pitch_shift)), rng)
+            signal = np.interp(np.linspace(0, len(points) - 1, n_frames), np.arange(len(points)), points)
+        else:
+            signal = white_noise(n_frames, rng)
+        if decay:
+            signal *= linear_decay(n_frames)
+        return to_pcm(signal, volume)
+
+    framerate = SAMPLE_RATE
+    n_frames = int(framerate * duration)
+    source = random.Random(seed) if seed is not None else random
+    points = None
+    if pitch_shift < 1.0:
+        points = [source.random() * 2 - 1 for _ in range(max(2, int(n_frames * pitch_shift)))]
+    data = bytearray()
+    for i in range(n_frames):
+        progress = i / n_frames
+        current_vol = volume
+        if decay:
+            current_vol *= (1 - progress)
+        if points is None:
+            # Simple white noise
+            sample = source.random() * 2 - 1
+        else:
+            position = i * (len(points) - 1) / max(n_frames - 1, 1)
+            j = min(int(position), len(points) - 2)
+            sample = points[j] + (points[j + 1] - points[j]) * (position - j)
+        val = int(MAX_AMPLITUDE * current_vol * sample)
+        data.extend(struct.pack('<h', val))
+    return data
+
+
+def net_chain(backend=None):
+    # Metallic rattle - noise modulated at 50 Hz
+    duration = 0.6
+    if _resolve(backend) == BACKEND_NUMPY:
+        t = timeline(duration)
+        signal = white_noise(len(t)) * linear_decay(len(t))
+        return to_pcm(modulate(signal, 50, t), 0.4)
+
+    framerate = SAMPLE_RATE
+    n_frames = int(framerate * duration)
+    data = bytearray()
+    for i in range(n_frames):
+        progress = i / n_frames
+        vol = 0.4 * (1 - progress)
+        mod = math.sin(2 * math.pi * 50 * (i / framerate))
+        val = int(MAX_AMPLITUDE * vol * (random.random() * 2 - 1) * (0.5 + 0.5 * mod))
+        data.extend(struct.pack('<h', val))
+    return data
+
+
+def buzzer(backend=None):
+    # Loud 200 Hz square wave
+    duration = 1.0
+    if _resolve(backend) == BACKEND_NUMPY:
+        return to_pcm(square(200, timeline(duration)), 0.5)
+
+    framerate = SAMPLE_RATE
+    n_frames = int(framerate * duration)
+    data = bytearray()
+    for i in range(n_frames):
+        t = i / framerate
+        val = MAX_AMPLITUDE * 0.5 if math.sin(2 * math.pi * 200 * t) > 0 else -MAX_AMPLITUDE * 0.5
+        data.extend(struct.pack('<h', int(val)))
+    return data
+
+
+def menu_enter(backend=None):
+    # Ascending confirmation tone. The old loop evaluated sin(2*pi*f(t)*t)
+    # with f rising 400 -> 800, which is a linear sweep from 400 to 1200 Hz.
+    duration = 0.2
+    if _resolve(backend) == BACKEND_NUMPY:
+        return to_pcm(sweep(400, 1200, timeline(duration), duration), 0.3)
+
+    framerate = SAMPLE_RATE
+    n_frames = int(framerate * duration)
+    data = bytearray()
+    for i in range(n_frames):
+        t = i / framerate
+        freq = 400 + (400 * (i / n_frames))
+        val = int(MAX_AMPLITUDE * 0.3 * math.sin(2 * math.pi * freq * t))
+        data.extend(struct.pack('<h', val))
+    return data
+
+
+# ==================================================================================
+# RECIPES
+# ==================================================================================
+# Every sound the game falls back to when sounds/{name}.ogg is missing,
+# as (routine, keyword arguments).
+ROUTINES = {
+    'tone': tone,
+    'noise': noise,
+    'net_chain': net_chain,
+    'buzzer': buzzer,
+    'menu_enter': menu_enter,
+}
+
+RECIPES = {
+    'dribble': ('noise', {'duration': 0.1, 'volume': 0.6, 'decay': True}),
+    'shoot': ('noise', {'duration': 0.4, 'volume': 0.4, 'decay': True}),
+    'net_chain': ('net_chain', {}),
+    'net_nba': ('noise', {'duration': 0.5, 'volume': 0.3, 'decay': True}),
+    'rim': ('tone', {'frequency': 150, 'duration': 0.1, 'volume': 0.8}),
+    'beep': ('tone', {'frequency': 800, 'duration': 0.1, 'volume': 0.3}),
+    'buzzer': ('buzzer', {}),
+    'dunk': ('noise', {'duration': 0.3, 'volume': 0.9, 'decay': True}),
+    'locator': ('tone', {'frequency': 400, 'duration': 0.05, 'volume': 0.3}),
+    'menuclick': ('tone', {'frequency': 1000, 'duration': 0.05, 'volume': 0.2}),
+    'menuenter': ('menu_enter', {}),
+}
+
+
+def render(name, backend=None):
+    """Synthesizes the fallback sound registered under `name`."""
+    routine, params = RECIPES[name]
+    return ROUTINES[routine](backend=backend, **params)
@@ -0,0 +1,221 @@
+"""Monte Carlo AI-vs-AI tournaments for balance tuning.
+
+Plays full 120-second matches with the batched engine across every CPU core
+and streams each finished chunk into running statistics, so memory stays
+flat however many games are played.
+
+    python -m pro_sound_basketball.tournament --games 100000
+    python -m pro_sound_basketball.tournament --games 20000 --sweep shot_accuracy=0.6,0.7,0.8 \\
+        --sweep steal_chance=0.005,0.01 --csv sweep.csv
+
+Every chunk gets its own seed spawned from --seed, so a run is repeatable
+for a given seed, chunk size and game count. Requires NumPy.
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .batch_sim import SHOT_TYPES, BatchMatch
+from .simulation import DEFAULT_RULES, TEAM_AWAY, TEAM_HOME
+
+DEFAULT_CHUNK = 2000
+Z_95 = 1.96
+
+# Per-game values averaged with confidence intervals
+GAME_METRICS = (
+    "home_win", "away_win", "tie",
+    "home_points", "away_points",
+    "home_ppp", "away_ppp",
+    "steals", "passes",
+)
+
+
+class RunningStat:
+    """Mean and variance merged chunk by chunk (Chan et al. parallel update)."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def of(cls, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(len(values), mean, float(((values - mean) ** 2).sum()))
+
+    def merge(self, other):
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    def interval(self):
+        """Half-width of the 95% confidence interval for the mean."""
+        if self.n < 2:
+            return float("nan")
+        return Z_95 * math.sqrt(self.m2 / (self.n - 1) / self.n)
+
+
+def play_chunk(rules, seed, n_games):
+    """Worker: plays n_games matches and returns their summary statistics."""
+    batch = BatchMatch(n_games, seed=seed, rules=rules)
+    batch.run()
+
+    home = batch.score[:, TEAM_HOME]
+    away = batch.score[:, TEAM_AWAY]
+    values = {
+        "home_win": home > away,
+        "away_win": away > home,
+        "tie": home == away,
+        "home_points": home,
+        "away_points": away,
+        "home_ppp": home / np.maximum(batch.possessions[:, TEAM_HOME], 1),
+        "away_ppp": away / np.maximum(batch.possessions[:, TEAM_AWAY], 1),
+        "steals": batch.steals.sum(axis=1),
+        "passes": batch.passes.sum(axis=1),
+    }
+    totals = {}
+    for i, shot in enumerate(SHOT_TYPES):
+        totals[f"{shot}_attempts"] = int(batch.shots[:, :, i].sum())
+        totals[f"{shot}_makes"] = int(batch.makes[:, :, i].sum())
+    totals["possessions"] = int(batch.possessions.sum())
+    totals["points"] = int(batch.score.sum())
+    return {name: RunningStat.of(v) for name, v in values.items()}, totals
+
+
+class Tournament:
+    """Aggregate results for one set of rules."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.stats = {name: RunningStat() for name in GAME_METRICS}
+        self.totals = {}
+
+    @property
+    def games(self):
+        return self.stats["home_win"].n
+
+    def add(self, chunk):
+        stats, totals = chunk
+        for name, stat in stats.items():
+            self.stats[name].merge(stat)
+        for name, value in totals.items():
+            self.totals[name] = self.totals.get(name, 0) + value
+
+    def summary(self):
+        """Flat dict of means, CI half-widths and shot mix, for printing or CSV."""
+        row = {"games": self.games}
+        for name, stat in self.stats.items():
+            row[name] = stat.mean
+            row[f"{name}_ci"] = stat.interval()
+        attempts = sum(self.totals.get(f"{s}_attempts", 0) for s in SHOT_TYPES)
+        for shot in SHOT_TYPES:
+            shot_attempts = self.totals.get(f"{shot}_attempts", 0)
+            row[f"{shot}_share"] = shot_attempts / attempts if attempts else float("nan")
+            row[f"{shot}_pct"] = self.totals.get(f"{shot}_makes", 0) / shot_attempts if shot_attempts else float("nan")
+        possessions = self.totals.get("possessions", 0)
+        row["points_per_possession"] = self.totals.get("points", 0) / possessions if possessions else float("nan")
+        return row
+
+
+def run(rules_list, games, chunk, workers, seed, progress=True):
+    """Plays `games` matches for each Rules in rules_list. Returns Tournaments."""
+    tournaments = [Tournament(rules) for rules in rules_list]
+    chunks = [min(chunk, games - start) for start in range(0, games, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks) * len(rules_list))
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for t_index, tournament in enumerate(tournaments):
+            for c_index, n_games in enumerate(chunks):
+                chunk_seed = seeds[t_index * len(chunks) + c_index]
+                future = pool.submit(play_chunk, tournament.rules, chunk_seed, n_games)
+                futures[future] = tournament
+
+        total_games = games * len(tournaments)
+        for future in as_completed(futures):
+            futures[future].add(future.result())
+            if progress:
+                played = sum(t.games for t in tournaments)
+                elapsed = time.perf_counter() - started
+                print(f"\r{played:,}/{total_games:,} games, {played / elapsed:,.0f} games/s",
+                      end="", file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    return tournaments
+
+
+def print_summary(tournament):
+    row = tournament.summary()
+    print(f"Games: {row['games']:,}")
+    for name in GAME_METRICS:
+        print(f"  {name:<14}{row[name]:>9.3f} +/- {row[name + '_ci']:.3f}")
+    print(f"  {'ppp (all)':<14}{row['points_per_possession']:>9.3f}")
+    for shot in SHOT_TYPES:
+        print(f"  {shot + ' shots':<14}{row[shot + '_share']:>9.1%} of attempts, {row[shot + '_pct']:.1%} made")
+
+
+def parse_sweep(specs):
+    """['shot_accuracy=0.6,0.7', ...] -> list of Rules covering the grid."""
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in DEFAULT_RULES._fields:
+            raise SystemExit(f"Unknown rule '{name}'. Choose from: {', '.join(DEFAULT_RULES._fields)}")
+        kind = type(getattr(DEFAULT_RULES, name))
+        axes.append((name, [kind(v) for v in values.split(",")]))
+    names = [name for name, _ in axes]
+    return [DEFAULT_RULES._replace(**dict(zip(names, combo)))
+            for combo in itertools.product(*(values for _, values in axes))], names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate AI-vs-AI matches for balance tuning.")
+    parser.add_argument("--games", type=int, default=10000, help="matches per rule set")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="matches per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sweep", action="append", default=[], metavar="RULE=V1,V2,...",
+                        help="grid axis over a simulation.Rules field; repeat for more axes")
+    parser.add_argument("--csv", help="write one row per rule set to this file")
+    args = parser.parse_args()
+
+    rules_list, swept = parse_sweep(args.sweep) if args.sweep else ([DEFAULT_RULES], [])
+    start = time.perf_counter()
+    tournaments = run(rules_list, args.games, args.chunk, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    total = sum(t.games for t in tournaments)
+    print(f"{total:,} games in {elapsed:.1f} s ({total / elapsed:,.0f} games/s on {args.workers} workers)")
+
+    for tournament in tournaments:
+        if swept:
+            print(", ".join(f"{name}={getattr(tournament.rules, name)}" for name in swept))
+        print_summary(tournament)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            rows = [dict(t.rules._asdict(), **t.summary()) for t in tournaments]
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Wrote {len(rows)} rows to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Pre-rendered variant pools, so repeated effects never sound identical.
+
+Each varied effect gets a pool of Sounds built once, in the background,
+after the base sounds have loaded. Variant 0 is the base sound itself; the
+others differ in pitch, level and envelope (a few milliseconds of attack
+and a tighter or looser decay). Synthesized noise effects are re-rendered
+with a lower noise pitch_shift; everything else, including custom sounds,
+is resampled. Every variant comes from a fixed seed, so the same base
+sound always yields the same pool.
+
+Custom sounds can supply the whole pool instead: sounds/dribble_1.ogg,
+sounds/dribble_2.ogg, ... join sounds/dribble.ogg (or the synthesized
+dribble) and no variants are generated for that effect.
+
+Pools are sized to fit `budget` bytes: every effect has its base, then
+variants are added one effect at a time in VARIED_SOUNDS order until the
+budget or the effect's target size is reached. pick() chooses an index
+at random (never the same one twice in a row) or round-robin.
+
+rebuild() makes a new pool around a reloaded base sound, the same size as
+the old one, and swap() puts it in place; the game calls them when a sound
+is hot-reloaded.
+
+Requires NumPy for generated variants; without it only custom files vary.
+"""
+import os
+import random
+import threading
+import zlib
+
+from . import synth
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Effect -> wanted pool size, most frequently heard first
+VARIED_SOUNDS = {
+    'dribble': 8,
+    'shoot': 4,
+    'rim': 4,
+    'net_nba': 4,
+    'net_chain': 4,
+    'dunk': 3,
+}
+DEFAULT_BUDGET = 4 * 1024 * 1024
+VARIANT_SEED = 1
+POOL_TIMEOUT = 30.0 # Seconds pool() waits for the build before settling for the base
+
+PITCH_CENTS = 100       # Resampled variants move up to this far either way
+NOISE_PITCH = (0.5, 1.0) # pitch_shift range for re-rendered noise
+LEVEL_DB = 3.0          # Variants are up to this much quieter
+MAX_ATTACK = 0.004      # Seconds of fade-in
+MAX_TIGHTEN = 0.8       # Extra decay exponent
+
+RANDOM = "random"
+ROUND_ROBIN = "round_robin"
+
+
+def custom_variant_paths(name, directory="sounds", exists=os.path.exists):
+    """sounds/{name}_1.ogg, {name}_2.ogg, ... in order, stopping at the first gap."""
+    paths = []
+    while True:
+        path = os.path.join(directory, f"{name}_{len(paths) + 1}.ogg")
+        if not exists(path):
+            return paths
+        paths.append(path)
+
+
+def render_variant(name, index, base, from_recipe):
+    """Variant `index` of an effect as (n, channels) int16, from the base PCM."""
+    rng = np.random.default_rng([VARIANT_SEED, zlib.crc32(name.encode("utf-8")), index])
+    channels = base.shape[1] if base.ndim > 1 else 1
+    routine, params = synth.RECIPES.get(name, (None, None))
+
+    if from_recipe and routine == 'noise':
+        shift = rng.uniform(*NOISE_PITCH)
+        mono = synth.noise(**dict(params, pitch_shift=shift, seed=int(rng.integers(2 ** 31)))).astype(np.float64)
+        signal = np.repeat(mono[:, None], channels, axis=1)
+    else:
+        signal = base.reshape(len(base), channels).astype(np.float64)
+        ratio = 2 ** (rng.uniform(-1, 1) * PITCH_CENTS / 1200)
+        positions = np.arange(0, len(signal) - 1, ratio)
+        signal = np.stack([np.interp(positions, np.arange(len(signal)), signal[:, c])
+                           for c in range(channels)], axis=1)
+
+    n = len(signal)
+    envelope = np.ones(n)
+    attack = int(rng.uniform(0, MAX_ATTACK) * synth.SAMPLE_RATE)
+    if attack:
+        envelope[:attack] = np.linspace(0.0, 1.0, attack, endpoint=False)
+    envelope *= (1.0 - np.arange(n) / max(n, 1)) ** rng.uniform(0, MAX_TIGHTEN)
+    level = 10 ** (-rng.uniform(0, LEVEL_DB) / 20)
+
+    out = signal * (envelope * level)[:, None]
+    return np.clip(out, -32768, 32767).astype(np.int16)
+
+
+class VariantBank:
+    """Variant pools per effect.
+
+    `base(name)` returns the loaded base Sound, `load(path)` a Sound from a
+    file, `to_pcm(sound)` its (n, channels) int16 samples and
+    `make_sound(pcm)` a Sound from such an array. `exists(path)` says whether
+    a custom file is there to load (a sound pack can stand in for sounds/).
+    """
+
+    def __init__(self, base, load, to_pcm, make_sound, budget=DEFAULT_BUDGET,
+                 sizes=VARIED_SOUNDS, mode=RANDOM, directory="sounds", exists=os.path.exists):
+        self.base = base
+        self.load = load
+        self.to_pcm = to_pcm
+        self.make_sound = make_sound
+        self.budget = budget
+        self.sizes = sizes
+        self.mode = mode
+        self.directory = directory
+        self.exists = exists
+
+        self.pools = {}        # name -> tuple of Sounds
+        self.pool_bytes = {}   # name -> bytes of PCM in the pool
+        self._last = {}        # name -> index picked last
+        self._rng = random.Random()
+        self._ready = threading.Event()
+
+    def build(self):
+        """Loads custom variants and renders the rest. Runs once, off the game thread."""
+        try:
+            self._build()
+        except Exception as e:
+            print(f"Sound variants failed, using single sounds: {e}")
+        finally:
+            self._ready.set()
+
+    def _build(self):
+        pools = {}
+        sizes = {}
+        wanted = {}
+        bases = {}
+        for name, size in self.sizes.items():
+            base = self.base(name)
+            paths = custom_variant_paths(name, self.directory, self.exists)
+            if paths:
+                pools[name] = [base] + [self.load(path) for path in paths]
+                sizes[name] = sum(self.to_pcm(s).nbytes for s in pools[name])
+                continue
+            bases[name] = self.to_pcm(base)
+            pools[name] = [base]
+            sizes[name] = bases[name].nbytes
+            if np is not None:
+                wanted[name] = size - 1
+
+        # Add one variant per effect per round while the budget allows
+        total = sum(sizes.values())
+        custom_base = {name: self.exists(os.path.join(self.directory, f"{name}.ogg")) for name in bases}
+        while any(wanted.values()):
+            for name in list(wanted):
+                if not wanted[name]:
+                    continue
+                if total + bases[name].nbytes > self.budget:
+                    wanted[name] = 0
+                    continue
+                pcm = render_variant(name, len(pools[name]), bases[name], not custom_base[name])
+                pools[name].append(self.make_sound(pcm))
+                sizes[name] += pcm.nbytes
+                total += pcm.nbytes
+                wanted[name] -= 1
+
+        self.pool_bytes = sizes
+        self.pools = {name: tuple(pool) for name, pool in pools.items()}
+
+    def rebuild(self, name, base):
+        """A new (pool, bytes) for `name` around `base`, with as many variants
+        as its pool has now. Runs off the game thread."""
+        paths = custom_variant_paths(name, self.directory, self.exists)
+        if paths:
+            pool = [base] + [self.load(path) for path in paths]
+            return tuple(pool), sum(self.to_pcm(s).nbytes for s in pool)
+        pcm = self.to_pcm(base)
+        pool = [base]
+        size = pcm.nbytes
+        if np is not None:
+            from_recipe = not self.exists(os.path.join(self.directory, f"{name}.ogg"))
+            for index in range(1, len(self.pools.get(name, pool))):
+                variant = render_variant(name, index, pcm, from_recipe)
+                pool.append(self.make_sound(variant))
+                size += variant.nbytes
+        return tuple(pool), size
+
+    def swap(self, name, pool, size):
+        """Puts a rebuild() pool in place. Call from the game thread."""
+        self.pools[name] = pool
+        self.pool_bytes[name] = size
+        self._last.pop(name, None)
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def pool(self, name, timeout=POOL_TIMEOUT):
+        """Every variant of `name` (just the base sound if it is not varied),
+        waiting up to `timeout` seconds for the pools to be built."""
+        self._ready.wait(timeout)
+        return self.pools.get(name) or (self.base(name),)
+
+    def pick(self, name):
+        """Index of the variant to play next."""
+        pool = self.pools.get(name)
+        if pool is None or len(pool) == 1:
+            return 0
+        last = self._last.get(name, -1)
+        if self.mode == ROUND_ROBIN:
+            index = (last + 1) % len(pool)
+        else:
+            index = (last + 1 + self._rng.randrange(len(pool) - 1)) % len(pool)
+        self._last[name] = index
+        return index
+
+    def get(self, name, index=0):
+        pool = self.pools.get(name)
+        if pool is None:
+            return self.base(name)
+        return pool[index]
+
+    def report(self):
+        print(f"{'variants':<10}{'count':>6}{'KB':>8}")
+        for name in self.sizes:
+            pool = self.pools.get(name, ())
+            print(f"{name:<10}{len(pool):>6}{self.pool_bytes.get(name, 0) / 1024:>8.0f}")
+        print(f"{'total':<10}{sum(len(p) for p in self.pools.values()):>6}"
+              f"{sum(self.pool_bytes.values()) / 1024:>8.0f} of {self.budget / 1024:.0f}")
@@ -0,0 +1,180 @@
+"""Mixer voice management.
+
+Every mixer channel belongs to a group, one per sound category:
+
+    category   priority  channels  used for
+    critical   3         6         shots, rim, net, dunk, buzzer, beep, locator
+    ui         2         2         menu clicks
+    dribble    1         4         dribbles (footsteps)
+    ambience   0         2         gym background
+
+All channels are reserved, so pygame never hands one out behind our back.
+A stream (the gym ambience) can claim() a channel of its group for itself.
+play() takes a free channel from the sound's own group, then a free one
+from any lower-priority group, and otherwise steals the least important
+voice it may (lowest priority, then quietest, then oldest) from those
+groups. Sounds that repeat from the same source, such as one player's
+dribble, are rate-limited. Everything that could not be played or was cut
+off is counted per category, together with the peak number of busy
+channels, so the group sizes can be set from real games.
+"""
+import time
+
+CRITICAL = "critical"
+UI = "ui"
+DRIBBLE = "dribble"
+AMBIENCE = "ambience"
+
+# (category, priority, channels), most important first
+DEFAULT_GROUPS = (
+    (CRITICAL, 3, 6),
+    (UI, 2, 2),
+    (DRIBBLE, 1, 4),
+    (AMBIENCE, 0, 2),
+)
+
+SOUND_CATEGORIES = {
+    'menuclick': UI,
+    'menuenter': UI,
+    'dribble': DRIBBLE,
+}
+
+# Shortest time between two plays of one sound from the same source
+MIN_INTERVAL = {
+    CRITICAL: 0.05,
+    UI: 0.0,
+    DRIBBLE: 0.12,
+    AMBIENCE: 0.0,
+}
+
+
+def category_of(sound_name):
+    return SOUND_CATEGORIES.get(sound_name, CRITICAL)
+
+
+class _Voice:
+    __slots__ = ("category", "sound", "priority", "gain", "started")
+
+    def __init__(self, category, sound, priority, gain, started):
+        self.category = category
+        self.sound = sound
+        self.priority = priority
+        self.gain = gain
+        self.started = started
+
+
+class VoiceStats:
+    __slots__ = ("played", "stolen", "dropped", "rate_limited", "peak")
+
+    def __init__(self):
+        self.played = 0
+        self.stolen = 0       # Voices of this category cut off for another sound
+        self.dropped = 0      # Sounds of this category that found no channel
+        self.rate_limited = 0
+        self.peak = 0         # Most channels busy in the group at once
+
+
+class VoiceManager:
+    def __init__(self, channels, groups=DEFAULT_GROUPS, clock=time.perf_counter):
+        """`channels` are mixer channels (or stand-ins), at least as many as the groups use."""
+        self.clock = clock
+        self.priority = {}
+        self.groups = {}
+        self.stats = {}
+        start = 0
+        for category, priority, count in groups:
+            self.priority[category] = priority
+            self.groups[category] = channels[start:start + count]
+            self.stats[category] = VoiceStats()
+            start += count
+        self._order = [category for category, _, _ in groups]
+        self._voices = {} # Channel -> _Voice while it plays something we started
+        self._last_play = {} # (sound name, source id) -> time
+        self._claimed = {} # Channel -> category it was claimed from
+
+    @classmethod
+    def for_mixer(cls, mixer, groups=DEFAULT_GROUPS):
+        """Sizes and reserves pygame's channels for the groups."""
+        total = sum(count for _, _, count in groups)
+        mixer.set_num_channels(total)
+        mixer.set_reserved(total)
+        return cls([mixer.Channel(i) for i in range(total)], groups)
+
+    def play(self, name, sound, left=1.0, right=1.0, source=None):
+        """Plays `sound` and returns its channel, or None if it was not played."""
+        category = category_of(name)
+        stats = self.stats[category]
+        now = self.clock()
+
+        interval = MIN_INTERVAL[category]
+        if interval:
+            key = (name, id(source))
+            last = self._last_play.get(key)
+            if last is not None and now - last < interval:
+                stats.rate_limited += 1
+                return None
+            self._last_play[key] = now
+
+        priority = self.priority[category]
+        channel = self._find_channel(category, priority)
+        if channel is None:
+            stats.dropped += 1
+            return None
+
+        channel.set_volume(left, right)
+        channel.play(sound)
+        self._voices[channel] = _Voice(category, sound, priority, max(left, right), now)
+        stats.played += 1
+        busy = sum(1 for c in self.groups[category] if c.get_busy())
+        if busy > stats.peak:
+            stats.peak = busy
+        return channel
+
+    def _find_channel(self, category, priority):
+        # The sound's own group first, then groups it outranks
+        candidates = self.groups[category] + [
+            channel for other in self._order if self.priority[other] < priority
+            for channel in self.groups[other]
+        ]
+        victim = None
+        victim_key = None
+        for channel in candidates:
+            if not channel.get_busy():
+                return channel
+            voice = self._voices.get(channel)
+            if voice is None or channel.get_sound() is not voice.sound:
+                return channel # Not a sound we started; nothing to account for
+            if voice.priority > priority:
+                continue
+            key = (voice.priority, voice.gain, voice.started)
+            if victim_key is None or key < victim_key:
+                victim, victim_key = channel, key
+        if victim is not None:
+            victim.stop()
+            self.stats[self._voices.pop(victim).category].stolen += 1
+        return victim
+
+    def claim(self, category):
+        """Takes a channel out of a group for a stream of its own; release() gives it back."""
+        channel = self.groups[category].pop()
+        channel.stop()
+        self._voices.pop(channel, None)
+        self._claimed[channel] = category
+        return channel
+
+    def release(self, channel):
+        channel.stop()
+        self.groups[self._claimed.pop(channel)].append(channel)
+
+    def stop_all(self):
+        for channels in self.groups.values():
+            for channel in channels:
+                channel.stop()
+        self._voices.clear()
+
+    def report(self):
+        print(f"{'voices':<10}{'channels':>9}{'played':>8}{'stolen':>8}{'dropped':>9}{'limited':>9}{'peak':>6}")
+        for category in self._order:
+            s = self.stats[category]
+            print(f"{category:<10}{len(self.groups[category]):>9}{s.played:>8}{s.stolen:>8}"
+                  f"{s.dropped:>9}{s.rate_limited:>9}{s.peak:>6}")
@@ -0,0 +1,125 @@
+"""SpeechQueue behaviour against FakeBackend; no TTS engine needed.
+
+    python -m pytest tests
+"""
+import time
+import unittest
+
+from pro_sound_basketball.speech import CHATTER, CRITICAL, NORMAL, FakeBackend, SpeechError, SpeechQueue
+
+
+class ManualClock:
+    """A clock the test moves by hand, for the coalescing window."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.001)
+
+
+class SpeechQueueTest(unittest.TestCase):
+    def make(self, delay=0.0, **kwargs):
+        backend = FakeBackend(delay)
+        queue = SpeechQueue(backend, **kwargs)
+        self.addCleanup(queue.close, flush=False)
+        return backend, queue
+
+    def busy(self, backend, queue):
+        """Keeps the worker inside the slow backend while the test queues more."""
+        queue.speak("Busy", priority=CRITICAL)
+        wait_for(lambda: backend.calls)
+
+    def test_critical_supersedes_pending_and_goes_first(self):
+        backend, queue = self.make(delay=0.05)
+        self.busy(backend, queue)
+        queue.speak("Pass", interrupt=False, priority=CHATTER)
+        queue.speak("Home ball", interrupt=False, priority=NORMAL)
+        queue.speak("Home 2, away 0", interrupt=True, priority=CRITICAL)
+        self.assertTrue(queue.flush(2.0))
+        self.assertEqual(backend.spoken, ["Busy", "Home 2, away 0"])
+        self.assertEqual(queue.superseded, 2)
+
+    def test_most_urgent_is_spoken_first(self):
+        backend, queue = self.make(delay=0.05)
+        self.busy(backend, queue)
+        queue.speak("Pass", interrupt=False, priority=CHATTER)
+        queue.speak("Home ball", interrupt=False, priority=NORMAL)
+        queue.speak("Game over", interrupt=False, priority=CRITICAL)
+        self.assertTrue(queue.flush(2.0))
+        self.assertEqual(backend.spoken, ["Busy", "Game over", "Home ball", "Pass"])
+
+    def test_critical_is_not_cut_off_within_the_window(self):
+        backend, queue = self.make()
+        queue.speak("Game over", priority=CRITICAL)
+        queue.flush(2.0)
+        queue.speak("Stolen!", priority=CHATTER)
+        queue.flush(2.0)
+        self.assertEqual([interrupt for _, interrupt, _ in backend.calls], [True, False])
+
+    def test_chatter_coalesces_within_the_window(self):
+        clock = ManualClock()
+        backend, queue = self.make(clock=clock, window=1.0)
+        for _ in range(3):
+            queue.speak("Stolen!", priority=CHATTER)
+            queue.flush(2.0)
+            clock.now += 0.2
+        self.assertEqual(backend.spoken, ["Stolen!"])
+        self.assertEqual(queue.coalesced, 2)
+
+        clock.now += 1.0 # Past the window: said again
+        queue.speak("Stolen!", priority=CHATTER)
+        queue.flush(2.0)
+        self.assertEqual(backend.spoken, ["Stolen!", "Stolen!"])
+
+    def test_pending_duplicate_is_dropped(self):
+        backend, queue = self.make(delay=0.05)
+        self.busy(backend, queue)
+        queue.speak("Home ball", interrupt=False)
+        queue.speak("Home ball", interrupt=False)
+        queue.flush(2.0)
+        self.assertEqual(backend.spoken, ["Busy", "Home ball"])
+        self.assertEqual(queue.deduped, 1)
+
+    def test_full_queue_drops_least_urgent_oldest(self):
+        backend, queue = self.make(delay=0.05, max_pending=2)
+        self.busy(backend, queue)
+        queue.speak("Pass", interrupt=False, priority=CHATTER)
+        queue.speak("First", interrupt=False, priority=NORMAL)
+        queue.speak("Second", interrupt=False, priority=NORMAL)
+        self.assertEqual(queue.pending(), 2)
+        queue.speak("Third", interrupt=False, priority=CHATTER) # Less urgent than all that is queued
+        queue.flush(2.0)
+        self.assertEqual(backend.spoken, ["Busy", "First", "Second"])
+        self.assertEqual(queue.dropped, 2)
+
+    def test_latency_is_measured(self):
+        backend, queue = self.make(delay=0.01)
+        queue.speak("One")
+        queue.flush(2.0)
+        self.assertEqual(len(queue.latency), 1)
+        self.assertGreaterEqual(queue.call_time[0], 0.01)
+
+    def test_failing_factory_raises_on_the_callers_thread(self):
+        def factory():
+            raise ImportError("no screen reader")
+        queue = SpeechQueue(factory=factory)
+        self.addCleanup(queue.close)
+        wait_for(lambda: queue.error is not None)
+        with self.assertRaises(SpeechError) as caught:
+            queue.speak("Main Menu")
+        self.assertIsInstance(caught.exception.__cause__, ImportError)
+        with self.assertRaises(SpeechError):
+            queue.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,16 @@
 import sys
+import time
 import traceback
 
 try:
+    start = time.perf_counter()
     import pro_sound_basketball
-    print("Import successful")
+    from pro_sound_basketball import replay, simulation
+    elapsed = (time.perf_counter() - start) * 1000
+    heavy = [name for name in ("pygame", "accessible_output2") if name in sys.modules]
+    if heavy:
+        print(f"Importing the game rules also imported {', '.join(heavy)}")
+    else:
+        print(f"Import successful ({elapsed:.1f} ms)")
 except Exception:
     traceback.print_exc()